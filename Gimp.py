@@ -11,6 +11,8 @@ import io
 import pandas as pd
 from openpyxl import load_workbook
 
+from modules.formatters import DATE_FORMATS, format_date, parse_date
+
 OFICINAS = {
     "ALICANTE": {
         "Direccion_Oficina": "Pintor Cabrera 22, esc. B, planta 4 A",
@@ -59,28 +61,6 @@ OFICINAS = {
     }
 }
 
-import locale
-
-def set_spanish_locale() -> None:
-    """
-    Fuerza el locale a español para que %B devuelva «enero, febrero…».
-    Probamos varios identificadores según sistema operativo.
-    """
-    for loc in (
-        "es_ES.UTF-8",   # Linux, macOS
-        "es_ES.utf8",
-        "es_ES",         # Windows ≥10
-        "Spanish_Spain", # Windows antiguos
-        "Spanish"        # Recurso final
-    ):
-        try:
-            locale.setlocale(locale.LC_TIME, loc)
-            break
-        except locale.Error:
-            continue
-
-set_spanish_locale()
-
 # Configuración de la página
 st.set_page_config(
     page_title="Generador de Cartas de Manifestación",
@@ -498,34 +478,10 @@ def parse_date_string(date_string):
     if not date_string:
         return datetime.now()
     
-    # Intentar varios formatos de fecha
-    formats = [
-        "%d/%m/%Y",
-        "%Y-%m-%d", 
-        "%d-%m-%Y",
-        "%d de %B de %Y",
-        "%Y/%m/%d",
-        "%d.%m.%Y",
-        "%Y.%m.%d",
-        "%m/%d/%Y",  # Formato americano
-        "%Y/%d/%m",  # Año/día/mes
-    ]
-    
-    # Para manejar nombres de meses en español
-    import locale
-    try:
-        locale.setlocale(locale.LC_TIME, 'es_ES.UTF-8')
-    except:
-        try:
-            locale.setlocale(locale.LC_TIME, 'Spanish_Spain')
-        except:
-            pass
-    
-    for fmt in formats:
-        try:
-            return datetime.strptime(date_string, fmt)
-        except:
-            continue
+    # Los nombres de los meses se buscan en una tabla, sin setlocale
+    parsed = parse_date(date_string.strip(), DATE_FORMATS + ("%Y/%d/%m",))
+    if parsed:
+        return datetime(parsed.year, parsed.month, parsed.day)
     
     # Si no se puede parsear, devolver fecha actual
     return datetime.now()
@@ -655,31 +611,31 @@ def main():
         st.markdown("### 📅 Fechas")
         # Fecha de hoy
         fecha_hoy = parse_date_string(var_values.get('Fecha_de_hoy', ''))
-        var_values['Fecha_de_hoy'] = st.date_input(
+        var_values['Fecha_de_hoy'] = format_date(st.date_input(
             "Fecha de Hoy", 
             value=fecha_hoy
-        ).strftime("%d de %B de %Y")
+        ), "%d de %B de %Y")
         
         # Fecha del encargo
         fecha_encargo = parse_date_string(var_values.get('Fecha_encargo', ''))
-        var_values['Fecha_encargo'] = st.date_input(
+        var_values['Fecha_encargo'] = format_date(st.date_input(
             "Fecha del Encargo",
             value=fecha_encargo
-        ).strftime("%d de %B de %Y")
+        ), "%d de %B de %Y")
         
         # Fecha fin del ejercicio
         fecha_ff = parse_date_string(var_values.get('FF_Ejecicio', ''))
-        var_values['FF_Ejecicio'] = st.date_input(
+        var_values['FF_Ejecicio'] = format_date(st.date_input(
             "Fecha Fin del Ejercicio",
             value=fecha_ff
-        ).strftime("%d de %B de %Y")
+        ), "%d de %B de %Y")
         
         # Fecha de cierre
         fecha_cierre = parse_date_string(var_values.get('Fecha_cierre', ''))
-        var_values['Fecha_cierre'] = st.date_input(
+        var_values['Fecha_cierre'] = format_date(st.date_input(
             "Fecha de Cierre",
             value=fecha_cierre
-        ).strftime("%d de %B de %Y")
+        ), "%d de %B de %Y")
         
         st.markdown("### 📝 Información General")
         var_values['Lista_Abogados'] = st.text_area(
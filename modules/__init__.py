@@ -1,19 +1,22 @@
 # Modules - Core engine components
 # Componentes del motor central
 
-from .plugin_loader import PluginPack, load_plugin, load_yaml_file
-from .dsl_evaluator import evaluate_condition, get_nested_value
+from .plugin_loader import PluginPack, load_plugin, load_yaml_file, prewarm_plugins, PluginLoadError
+from .dsl_evaluator import evaluate_condition, compile_condition, get_nested_value
 from .rule_engine import RuleEngine, RuleHit, EvaluationTrace
 from .context_builder import ContextBuilder, format_spanish_date, format_currency_eur
 from .renderer_docx import DocxRenderer
-from .generate import generate, GenerationResult, preprocess_input
+from .generate import generate, generate_batch, GenerationResult, preprocess_input
 from .contract_validator import validate_input, ValidationResult
 
 __all__ = [
     'PluginPack',
     'load_plugin',
     'load_yaml_file',
+    'prewarm_plugins',
+    'PluginLoadError',
     'evaluate_condition',
+    'compile_condition',
     'get_nested_value',
     'RuleEngine',
     'RuleHit',
@@ -23,6 +26,7 @@ __all__ = [
     'format_currency_eur',
     'DocxRenderer',
     'generate',
+    'generate_batch',
     'GenerationResult',
     'preprocess_input',
     'validate_input',
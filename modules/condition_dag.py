@@ -0,0 +1,139 @@
+"""
+Condition DAG - Evaluate many conditions sharing identical sub-conditions
+Evaluar muchas condiciones compartiendo subcondiciones identicas
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from .dsl_evaluator import compile_condition, condition_key
+
+
+# A node computes its value from the data and the per-record memo
+Node = Callable[[dict, list], bool]
+
+
+@dataclass
+class DAGStats:
+    """Counters of one evaluation session / Contadores de una sesion de evaluacion"""
+    nodes: int
+    evaluated: int
+    reused: int
+
+
+class ConditionDAG:
+    """
+    Conditions compiled into a DAG with structurally identical nodes merged
+    Condiciones compiladas en un DAG con nodos estructuralmente identicos unidos
+
+    Sub-conditions are deduplicated by condition_key, so a leaf such as
+    "incorreccion equals true" is one node however many rules use it.
+    Within a session each node is evaluated at most once per record.
+    Results are identical to compile_condition, including short-circuiting.
+    """
+
+    def __init__(self):
+        self._ids: Dict[Hashable, int] = {}
+        self._nodes: List[Node] = []
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def add(self, condition: Optional[dict]) -> int:
+        """
+        Add a condition and return its node id / Anadir una condicion y devolver su nodo
+
+        Raises:
+            DSLEvaluationError: If condition is invalid or too deeply nested
+        """
+        # Validate the whole condition first, with the compiler's rules
+        compile_condition(condition)
+        return self._add(condition)
+
+    def session(self, data: dict) -> "DAGSession":
+        """Start evaluating nodes for one record / Evaluar nodos para un registro"""
+        return DAGSession(self._nodes, data)
+
+    def _add(self, condition: Optional[dict]) -> int:
+        key = condition_key(condition)
+        node_id = self._ids.get(key)
+        if node_id is not None:
+            return node_id
+
+        operator = condition.get("operator") if condition else None
+        if operator in ("and", "or") and condition.get("conditions"):
+            children = tuple(self._nodes[self._add(c)] for c in condition["conditions"])
+            compute = _all_of(children) if operator == "and" else _any_of(children)
+        elif operator == "not" and condition.get("condition"):
+            child = self._nodes[self._add(condition["condition"])]
+
+            def compute(data: dict, memo: list) -> bool:
+                return not child(data, memo)
+        else:
+            predicate = compile_condition(condition)
+
+            def compute(data: dict, memo: list) -> bool:
+                return predicate(data)
+
+        node_id = len(self._nodes)
+        self._nodes.append(_memoized(node_id, compute))
+        self._ids[key] = node_id
+        return node_id
+
+
+class DAGSession:
+    """
+    Per-record memo over the nodes of a ConditionDAG
+    Memo por registro sobre los nodos de un ConditionDAG
+    """
+
+    __slots__ = ("_nodes", "_memo", "data")
+
+    def __init__(self, nodes: List[Node], data: dict):
+        self._nodes = nodes
+        # One slot per node, plus a trailing counter of memo hits
+        self._memo: List[Any] = [None] * len(nodes) + [0]
+        self.data = data
+
+    def value(self, node_id: int) -> bool:
+        """Result of a node, computed at most once / Resultado de un nodo"""
+        return self._nodes[node_id](self.data, self._memo)
+
+    @property
+    def stats(self) -> DAGStats:
+        nodes = len(self._nodes)
+        return DAGStats(
+            nodes=nodes,
+            evaluated=nodes - self._memo[:nodes].count(None),
+            reused=self._memo[-1]
+        )
+
+
+def _all_of(children: tuple) -> Node:
+    def compute(data: dict, memo: list) -> bool:
+        for child in children:
+            if not child(data, memo):
+                return False
+        return True
+    return compute
+
+
+def _any_of(children: tuple) -> Node:
+    def compute(data: dict, memo: list) -> bool:
+        for child in children:
+            if child(data, memo):
+                return True
+        return False
+    return compute
+
+
+def _memoized(node_id: int, compute: Node) -> Node:
+    """Wrap a node so its result is stored in the memo / Guardar resultado en el memo"""
+    def node(data: dict, memo: list) -> bool:
+        result = memo[node_id]
+        if result is None:
+            result = memo[node_id] = compute(data, memo)
+        else:
+            memo[-1] += 1
+        return result
+    return node
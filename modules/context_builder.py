@@ -3,28 +3,32 @@ Context Builder - Template context construction with derived fields and formatti
 Constructor de contexto de plantilla con campos derivados y formateo
 """
 
+from collections import ChainMap
+from dataclasses import dataclass, field
 from datetime import date, datetime
-from decimal import Decimal
-from typing import Any, Dict, List, Optional, Callable
+from functools import partial
+from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Optional, Callable, Set, Tuple
 import re
 
+from .dsl_evaluator import field_root
+from .formatters import (
+    DATE_LANGUAGES, DEFAULT_NUMBER_FORMATS, ListFormatter, NumberFormatter, compile_list_format,
+    compile_number_format, format_long_date, parse_date,
+)
+from .formula_engine import FormulaError, compile_formula, formula_names, parse_formula
+from .layered_context import ABSENT, LayeredContext, LazyLayer
 from .plugin_loader import PluginPack
 
 
-# Spanish month names
-SPANISH_MONTHS = [
-    "enero", "febrero", "marzo", "abril", "mayo", "junio",
-    "julio", "agosto", "septiembre", "octubre", "noviembre", "diciembre"
-]
-
-
-def format_spanish_date(d: Any) -> str:
+def format_spanish_date(d: Any, language: str = "es", months: Optional[List[str]] = None) -> str:
     """
     Format date as Spanish: 31 de diciembre de 2025
     Formatear fecha en espanol: 31 de diciembre de 2025
 
     Args:
         d: date object or string
+        language: "es", or "ca", "gl", "eu" for the co-official languages
+        months: Twelve month names overriding the built-in table
 
     Returns:
         Formatted date string
@@ -44,7 +48,7 @@ def format_spanish_date(d: Any) -> str:
     if not isinstance(d, date):
         return str(d)
 
-    return f"{d.day} de {SPANISH_MONTHS[d.month - 1]} de {d.year}"
+    return format_long_date(d, language, months)
 
 
 def format_currency_eur(value: Any) -> str:
@@ -64,9 +68,9 @@ def format_currency_eur(value: Any) -> str:
     try:
         if isinstance(value, str):
             value = float(value.replace(",", ".").replace(" ", ""))
-        num_str = f"{int(value):,}".replace(",", "X").replace(".", ",").replace("X", ".")
-        return f"{num_str} EUR"
-    except (ValueError, TypeError):
+        # Whole euros are truncated, not rounded
+        return _CURRENCY_EUR(int(value))
+    except (ValueError, TypeError, OverflowError):
         return str(value)
 
 
@@ -81,15 +85,72 @@ def format_percentage(value: Any) -> str:
     Returns:
         Formatted percentage string
     """
-    if value is None:
-        return ""
+    return _PERCENTAGE(value)
 
-    try:
-        if isinstance(value, str):
-            value = float(value.replace(",", "."))
-        return f"{value:.2f} %".replace(".", ",")
-    except (ValueError, TypeError):
-        return str(value)
+
+_CURRENCY_EUR = compile_number_format({**DEFAULT_NUMBER_FORMATS["currency"], "decimal_places": 0})
+_PERCENTAGE = compile_number_format(DEFAULT_NUMBER_FORMATS["percentage"])
+
+
+def number_formatters(plugin: PluginPack) -> Dict[str, NumberFormatter]:
+    """
+    Compile the number_formats of formatting.yaml, cached on the plugin
+    Compilar los number_formats de formatting.yaml, con cache en el plugin
+
+    Formats missing from the plugin use DEFAULT_NUMBER_FORMATS.
+
+    Args:
+        plugin: PluginPack instance
+
+    Returns:
+        Dictionary mapping format names (currency, percentage, ...) to formatters
+
+    Raises:
+        ValueError: If a number format is invalid
+    """
+    def build() -> Dict[str, NumberFormatter]:
+        specs = {**DEFAULT_NUMBER_FORMATS, **(plugin.formatting.get("number_formats") or {})}
+        return {name: compile_number_format(spec) for name, spec in specs.items()}
+
+    return plugin.get_artifact("number_formatters", build)
+
+
+# Directors list of plugins without a tables.yaml output_format for it
+_DIRECTORS_LIST = compile_list_format({"item_format": "{indent} D. {nombre} - {cargo}"}, {"indent": " " * 34})
+
+
+def list_formatters(plugin: PluginPack) -> Dict[str, ListFormatter]:
+    """
+    Compile the output_format entries of tables.yaml, cached on the plugin
+    Compilar las entradas output_format de tables.yaml, con cache en el plugin
+
+    Each entry formats the list field named by its source_field; the
+    formatting values of the table of that field (indent, prefix, ...)
+    are available to item_format as constants.
+
+    Args:
+        plugin: PluginPack instance
+
+    Returns:
+        Dictionary mapping list field names to formatters
+
+    Raises:
+        ValueError: If an output format is invalid
+    """
+    def build() -> Dict[str, ListFormatter]:
+        tables = plugin.tables
+        constants = {
+            table_def.get("source_field"): table_def.get("formatting") or {}
+            for table_def in (tables.get("tables") or {}).values()
+        }
+        formatters = {"lista_alto_directores": _DIRECTORS_LIST}
+        for spec in (tables.get("output_format") or {}).values():
+            source = spec.get("source_field")
+            if source:
+                formatters[source] = compile_list_format(spec, constants.get(source))
+        return formatters
+
+    return plugin.get_artifact("list_formatters", build)
 
 
 def parse_date_string(date_string: Any) -> Optional[date]:
@@ -103,39 +164,113 @@ def parse_date_string(date_string: Any) -> Optional[date]:
     Returns:
         date object or None
     """
-    if not date_string:
-        return None
+    return parse_date(date_string)
 
-    # If already a date object, return it directly
-    if isinstance(date_string, date) and not isinstance(date_string, datetime):
-        return date_string
 
-    # If datetime object, extract the date
-    if isinstance(date_string, datetime):
-        return date_string.date()
+def compile_derived_formulas(plugin: PluginPack) -> Dict[str, Callable[..., Any]]:
+    """
+    Compile the formulas of derived.yaml, cached on the plugin
+    Compilar las formulas de derived.yaml, con cache en el plugin
 
-    # Must be a string from this point
-    if not isinstance(date_string, str):
-        return None
+    Args:
+        plugin: PluginPack instance
 
-    formats = [
-        "%d/%m/%Y",
-        "%Y-%m-%d",
-        "%d-%m-%Y",
-        "%d de %B de %Y",
-        "%Y/%m/%d",
-        "%d.%m.%Y",
-        "%Y.%m.%d",
-        "%m/%d/%Y",
-    ]
+    Returns:
+        Dictionary mapping derived field names to compiled formulas
 
-    for fmt in formats:
-        try:
-            return datetime.strptime(date_string, fmt).date()
-        except ValueError:
-            continue
+    Raises:
+        FormulaError: If a formula is invalid or calls an unknown function
+    """
+    def build() -> Dict[str, Callable[..., Any]]:
+        derived = plugin.derived.get("derived_fields", {})
+        return {
+            name: compile_formula(spec.get("formula", ""), FORMULA_FUNCTIONS)
+            for name, spec in derived.items()
+        }
 
-    return None
+    return plugin.get_artifact("derived_formulas", build)
+
+
+@dataclass
+class DerivedGraph:
+    """
+    Derived fields in dependency order / Campos derivados en orden de dependencias
+
+    order lists the derived fields so that each comes after the derived
+    fields it reads. dependents maps a key (input or derived field) to the
+    derived fields that read it directly.
+    """
+    order: List[str]
+    dependencies: Dict[str, Tuple[str, ...]]
+    dependents: Dict[str, Set[str]] = field(default_factory=dict)
+
+    def affected(self, changed_keys: Iterable[str]) -> List[str]:
+        """
+        Derived fields to recompute after the keys changed, in order
+        Campos derivados a recalcular tras el cambio, en orden
+        """
+        pending = [field_root(key) for key in changed_keys]
+        affected: Set[str] = set()
+        while pending:
+            for name in self.dependents.get(pending.pop(), ()):
+                if name not in affected:
+                    affected.add(name)
+                    pending.append(name)
+        return [name for name in self.order if name in affected]
+
+
+def build_derived_graph(plugin: PluginPack) -> DerivedGraph:
+    """
+    Order the derived fields by their dependencies, cached on the plugin
+    Ordenar los campos derivados por sus dependencias, con cache en el plugin
+
+    A field depends on its declared dependencies and on the fields its
+    formula reads.
+
+    Args:
+        plugin: PluginPack instance
+
+    Returns:
+        DerivedGraph of derived.yaml
+
+    Raises:
+        FormulaError: If a formula is invalid or the fields depend on each
+            other in a cycle
+    """
+    def build() -> DerivedGraph:
+        derived = plugin.derived.get("derived_fields", {})
+        dependencies: Dict[str, Tuple[str, ...]] = {}
+        dependents: Dict[str, Set[str]] = {}
+        for name, spec in derived.items():
+            reads = list(spec.get("dependencies", []))
+            reads += sorted(formula_names(parse_formula(spec.get("formula", ""))) - set(reads))
+            dependencies[name] = tuple(reads)
+            for key in reads:
+                dependents.setdefault(field_root(key), set()).add(name)
+
+        # Depth-first post-order keeps YAML order where there is no dependency
+        order: List[str] = []
+        state: Dict[str, str] = {}
+
+        def visit(name: str, path: List[str]) -> None:
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                cycle = path[path.index(name):] + [name]
+                raise FormulaError(f"Cycle in derived fields: {' -> '.join(cycle)}")
+            state[name] = "visiting"
+            for key in dependencies[name]:
+                root = field_root(key)
+                if root in dependencies:
+                    visit(root, path + [name])
+            state[name] = "done"
+            order.append(name)
+
+        for name in derived:
+            visit(name, [])
+        return DerivedGraph(order=order, dependencies=dependencies, dependents=dependents)
+
+    return plugin.get_artifact("derived_graph", build)
 
 
 class ContextBuilder:
@@ -146,143 +281,133 @@ class ContextBuilder:
 
     def __init__(self, plugin: PluginPack):
         self.plugin = plugin
-        self._formula_functions: Dict[str, Callable] = {
-            "extract_year": self._extract_year,
-            "format_directors_list": self._format_directors_list,
-            "bool_to_sino": self._bool_to_sino,
-            "sum": self._sum_list,
-        }
 
-    def build_context(self, data: dict) -> dict:
+    def build_context(self, data: Mapping[str, Any]) -> LayeredContext:
         """
         Build complete template context
         Construir contexto completo de la plantilla
 
+        The input data is not copied: derived fields, formatted values and
+        text blocks are layers over it (see LayeredContext). Values are
+        formatted on first access and None reads as "".
+
         Args:
             data: Input data dictionary
 
         Returns:
-            Complete context dictionary for template rendering
+            Complete context for template rendering
         """
-        context = dict(data)
-
-        # 1. Calculate derived fields
-        context = self._calculate_derived_fields(context)
+        # 1. Calculate derived fields (in dependency order)
+        derived = self._derived_layer(data)
 
-        # 2. Apply formatting
-        context = self._apply_formatting(context)
+        # 2. Formatting and formatted lists, computed on first access
+        formatted = self._formatted_layer(ChainMap(derived, data))
 
-        # 3. Add text blocks library
-        context["texts"] = self.plugin.texts.get("text_blocks", {})
+        # 3. Text blocks library
+        texts = {"texts": self.plugin.texts.get("text_blocks", {})}
 
-        # 4. Sanitize values (clean None, etc.)
-        context = self._sanitize_values(context)
+        # 4. Writes go to a new top layer; None reads as ""
+        return LayeredContext({}, texts, formatted, derived, data)
 
-        # 5. Add formatted lists
-        context = self._format_lists(context)
-
-        return context
+    def _derived_layer(self, data: Mapping[str, Any]) -> LazyLayer:
+        """
+        Derived fields as a layer computed on first access
+        Campos derivados como capa calculada en el primer acceso
+
+        A field is in the layer when its dependencies are set, as in
+        _calculate_derived_fields. The check is deferred with the formula,
+        so no derived value is computed before one is read. List
+        aggregates share the columns they extract, for the lifetime of
+        this layer.
+        """
+        graph = build_derived_graph(self.plugin)
+        formulas = compile_derived_formulas(self.plugin)
+        derived_fields = self.plugin.derived.get("derived_fields", {})
+
+        thunks: Dict[str, Callable[[], Any]] = {}
+        layer = LazyLayer(thunks, optional=True)
+        scope = ChainMap(layer, data)
+        columns: dict = {}
+        for field_name in graph.order:
+            deps = derived_fields[field_name].get("dependencies", [])
+            thunks[field_name] = partial(_derived_value, deps, formulas[field_name], scope, columns)
+        return layer
 
     def _calculate_derived_fields(self, context: dict) -> dict:
         """Calculate derived fields / Calcular campos derivados"""
-        derived = self.plugin.derived.get("derived_fields", {})
+        graph = build_derived_graph(self.plugin)
+        formulas = compile_derived_formulas(self.plugin)
+        columns: dict = {}
 
-        for field_name, spec in derived.items():
-            formula = spec.get("formula", "")
-            deps = spec.get("dependencies", [])
-
-            # Check all dependencies exist
-            if all(context.get(d) is not None for d in deps):
-                try:
-                    context[field_name] = self._evaluate_formula(formula, context)
-                except Exception:
-                    context[field_name] = None
+        for field_name in graph.order:
+            self._calculate_derived_field(field_name, formulas, context, columns)
 
         return context
 
-    def _evaluate_formula(self, formula: str, context: dict) -> Any:
-        """
-        Evaluate a formula safely
-        Evaluar una formula de forma segura
-
-        Supported formulas:
-        - extract_year(field)
-        - format_directors_list(field)
-        - bool_to_sino(field)
-        - sum(list_field.property)
-        - Simple arithmetic with fields
+    def update_derived_fields(self, context: dict, data: dict, changed_keys: Iterable[str]) -> List[str]:
         """
-        # Match function call pattern: func_name(arg1, arg2, ...)
-        func_match = re.match(r'(\w+)\(([^)]+)\)', formula)
-        if func_match:
-            func_name = func_match.group(1)
-            args_str = func_match.group(2)
-            args = [arg.strip() for arg in args_str.split(",")]
-
-            if func_name in self._formula_functions:
-                # Get actual values for arguments
-                arg_values = []
-                for arg in args:
-                    if arg in context:
-                        arg_values.append(context[arg])
-                    else:
-                        arg_values.append(arg)
-
-                return self._formula_functions[func_name](*arg_values)
-
-        # Simple arithmetic: field1 - 1, field1 + field2, etc.
-        # Handle subtraction
-        if " - " in formula:
-            parts = formula.split(" - ")
-            if len(parts) == 2:
-                left = self._get_value(parts[0].strip(), context)
-                right = self._get_value(parts[1].strip(), context)
-                try:
-                    return int(left) - int(right)
-                except (ValueError, TypeError):
-                    return None
-
-        # Handle addition
-        if " + " in formula:
-            parts = formula.split(" + ")
-            if len(parts) == 2:
-                left = self._get_value(parts[0].strip(), context)
-                right = self._get_value(parts[1].strip(), context)
-                try:
-                    return int(left) + int(right)
-                except (ValueError, TypeError):
-                    return None
-
-        # Handle multiplication/division for percentages
-        if " * " in formula or " / " in formula:
-            # Basic eval with only numbers - unsafe but controlled
-            try:
-                # Replace field names with values
-                expr = formula
-                for key, val in context.items():
-                    if key in expr and isinstance(val, (int, float, Decimal)):
-                        expr = expr.replace(key, str(val))
-                # Only allow safe characters
-                if re.match(r'^[\d\s\.\+\-\*\/\(\)]+$', expr):
-                    return eval(expr)
-            except Exception:
-                return None
+        Recompute only the derived fields affected by an edit
+        Recalcular solo los campos derivados afectados por un cambio
 
-        return None
+        The result is the same as recalculating every derived field from
+        the new data, for live previews that keep the previous context.
+
+        Args:
+            context: Derived-field context of the previous data (as returned
+                by calculate_derived_fields), updated in place
+            data: New input data
+            changed_keys: Input keys that changed since the previous data
 
-    def _get_value(self, key: str, context: dict) -> Any:
-        """Get value from context or return as literal"""
-        if key in context:
-            return context[key]
-        try:
-            return int(key)
-        except ValueError:
+        Returns:
+            Names of the derived fields recomputed, in order
+        """
+        changed_keys = list(changed_keys)
+        graph = build_derived_graph(self.plugin)
+        formulas = compile_derived_formulas(self.plugin)
+
+        for key in changed_keys:
+            if key in data:
+                context[key] = data[key]
+            else:
+                context.pop(key, None)
+
+        affected = graph.affected(changed_keys)
+        # Fresh columns: lists of the previous data may have been edited in place
+        columns: dict = {}
+        for field_name in affected:
+            # Start from the input value, as a full recalculation would
+            if field_name in data:
+                context[field_name] = data[field_name]
+            else:
+                context.pop(field_name, None)
+            self._calculate_derived_field(field_name, formulas, context, columns)
+        return affected
+
+    def calculate_derived_fields(self, data: dict) -> dict:
+        """
+        Input data plus derived fields, before formatting
+        Datos de entrada mas campos derivados, antes del formateo
+        """
+        return self._calculate_derived_fields(dict(data))
+
+    def _calculate_derived_field(
+        self,
+        field_name: str,
+        formulas: Dict[str, Callable[..., Any]],
+        context: MutableMapping[str, Any],
+        columns: Optional[dict] = None
+    ) -> None:
+        deps = self.plugin.derived["derived_fields"][field_name].get("dependencies", [])
+
+        # Check all dependencies exist
+        if all(context.get(d) is not None for d in deps):
             try:
-                return float(key)
-            except ValueError:
-                return key
+                context[field_name] = formulas[field_name](context, columns)
+            except Exception:
+                context[field_name] = None
 
-    def _extract_year(self, date_value: Any) -> Optional[int]:
+    @staticmethod
+    def _extract_year(date_value: Any) -> Optional[int]:
         """Extract year from date / Extraer anio de fecha"""
         if isinstance(date_value, date):
             return date_value.year
@@ -298,30 +423,13 @@ class ContextBuilder:
                 return int(match.group())
         return None
 
-    def _format_directors_list(self, directors: Any) -> str:
+    @staticmethod
+    def _format_directors_list(directors: Any) -> str:
         """Format directors list with indentation / Formatear lista de directores con indentacion"""
-        if not directors:
-            return ""
+        return _DIRECTORS_LIST(directors)
 
-        if isinstance(directors, str):
-            return directors
-
-        if isinstance(directors, list):
-            indent = "                                  "
-            lines = []
-            for director in directors:
-                if isinstance(director, dict):
-                    nombre = director.get("nombre", "")
-                    cargo = director.get("cargo", "")
-                    if nombre and cargo:
-                        lines.append(f"{indent} D. {nombre} - {cargo}")
-                elif isinstance(director, str):
-                    lines.append(director)
-            return "\n".join(lines)
-
-        return str(directors)
-
-    def _bool_to_sino(self, value: Any) -> str:
+    @staticmethod
+    def _bool_to_sino(value: Any) -> str:
         """Convert boolean to si/no / Convertir booleano a si/no"""
         if isinstance(value, bool):
             return "si" if value else "no"
@@ -331,74 +439,119 @@ class ContextBuilder:
             return "no"
         return "no"
 
-    def _sum_list(self, list_field_path: str) -> Any:
-        """Sum values from a list field / Sumar valores de un campo de lista"""
-        # This would need the actual context to work
-        # For now, return 0 as placeholder
-        return 0
+    def _formatted_layer(self, context: Mapping[str, Any]) -> LazyLayer:
+        """
+        Formatting rules as a layer computed on first access
+        Reglas de formateo como capa calculada en el primer acceso
 
-    def _apply_formatting(self, context: dict) -> dict:
-        """Apply formatting rules / Aplicar reglas de formateo"""
-        formatting = self.plugin.formatting
-        field_formats = formatting.get("fields", {})
+        The keys follow from formatting.yaml alone. Whether the value is
+        set (and so whether the key is in the layer) is checked on first
+        access, so reading an unrelated key computes nothing.
+        """
+        field_formats = self.plugin.formatting.get("fields", {})
+        numbers = number_formatters(self.plugin)
+        thunks: Dict[str, Callable[[], Any]] = {}
+        layer = LazyLayer(thunks, optional=True)
 
         for field, fmt_spec in field_formats.items():
-            if field in context and context[field] is not None:
-                fmt_type = fmt_spec.get("type")
-                value = context[field]
-
-                if fmt_type == "date":
-                    # Format date to Spanish and replace the original value
-                    if isinstance(value, (date, datetime)):
-                        formatted_date = format_spanish_date(value)
-                        context[field] = formatted_date
-                        context[f"{field}_formatted"] = formatted_date
-                    elif isinstance(value, str) and "de" not in value:
-                        formatted_date = format_spanish_date(value)
-                        context[field] = formatted_date
-                        context[f"{field}_formatted"] = formatted_date
-                    else:
-                        context[f"{field}_formatted"] = value
-
-                elif fmt_type == "currency":
-                    context[f"{field}_formatted"] = format_currency_eur(value)
-
-                elif fmt_type == "percentage":
-                    context[f"{field}_formatted"] = format_percentage(value)
+            fmt_type = fmt_spec.get("type")
 
-        return context
+            if fmt_type == "date":
+                # Format date to Spanish and replace the original value
+                thunks[field] = partial(self._format_date_field, context, field, fmt_spec)
+                thunks[f"{field}_formatted"] = partial(_formatted_date, layer, context, field)
 
-    def _sanitize_values(self, context: dict) -> dict:
-        """Sanitize values: replace None with empty strings / Sanear valores"""
-        for key, value in context.items():
-            if value is None:
-                context[key] = ""
-        return context
+            elif fmt_type in numbers:
+                # currency, percentage, integer or any other number_formats entry
+                thunks[f"{field}_formatted"] = partial(_formatted_value, numbers[fmt_type], context, field)
 
-    def _format_lists(self, context: dict) -> dict:
-        """Format list fields for template / Formatear listas para la plantilla"""
-        # Format lista_alto_directores if it's a list of dicts
-        if "lista_alto_directores" in context:
-            directors = context["lista_alto_directores"]
-            if isinstance(directors, list):
-                context["lista_alto_directores"] = self._format_directors_list(directors)
+        # List fields with an output format (lista_alto_directores, ...)
+        for field, formatter in list_formatters(self.plugin).items():
+            thunks[field] = partial(_formatted_list, formatter, context, field)
 
-        return context
+        return layer
 
-    def get_conditional_values(self, data: dict) -> Dict[str, str]:
+    def _format_date_field(self, context: Mapping[str, Any], field: str, fmt_spec: dict) -> Any:
+        """
+        Date in the language of its formatting.yaml entry, ABSENT if not a date
+        Fecha en el idioma de su entrada de formatting.yaml
+        """
+        value = context.get(field)
+        if not (isinstance(value, (date, datetime)) or (isinstance(value, str) and "de" not in value)):
+            return ABSENT
+        language = DATE_LANGUAGES.get(fmt_spec.get("format", "spanish"), "es")
+        return format_spanish_date(value, language, self._month_names(language))
+
+    def _month_names(self, language: str) -> Optional[List[str]]:
+        """
+        Month names from formatting.yaml (spanish_months, month_names.<lang>)
+        Nombres de los meses de formatting.yaml
+        """
+        formatting = self.plugin.formatting
+        if language == "es":
+            months = formatting.get("spanish_months")
+        else:
+            months = formatting.get("month_names", {}).get(language)
+        return months if months and len(months) == 12 else None
+
+    def get_conditional_values(self, data: Mapping[str, Any]) -> LazyLayer:
         """
         Convert boolean fields to 'si'/'no' for template compatibility
         Convertir campos booleanos a 'si'/'no' para compatibilidad de plantilla
+
+        Each value is converted on first access.
         """
-        result = {}
         bool_fields = [
             'comision', 'junta', 'comite', 'incorreccion', 'limitacion_alcance',
             'dudas', 'rent', 'A_coste', 'experto', 'unidad_decision',
             'activo_impuesto', 'operacion_fiscal', 'compromiso', 'gestion'
         ]
+        return LazyLayer({
+            field_name: partial(_bool_field, data, field_name)
+            for field_name in bool_fields
+        })
+
+
+def _bool_field(data: Mapping[str, Any], field_name: str) -> str:
+    return ContextBuilder._bool_to_sino(data.get(field_name))
+
+
+def _derived_value(deps: List[str], formula: Callable[..., Any], scope: Mapping, columns: dict) -> Any:
+    """Derived field, ABSENT unless every dependency is set"""
+    if any(scope.get(d) is None for d in deps):
+        return ABSENT
+    return _evaluate_derived(formula, scope, columns)
+
+
+def _formatted_date(layer: LazyLayer, context: Mapping[str, Any], field: str) -> Any:
+    """<field>_formatted of a date field: the formatted date, else the value"""
+    value = context.get(field)
+    if value is None:
+        return ABSENT
+    return layer[field] if field in layer else value
+
+
+def _formatted_value(formatter: Callable[[Any], str], context: Mapping[str, Any], field: str) -> Any:
+    value = context.get(field)
+    return ABSENT if value is None else formatter(value)
+
+
+def _formatted_list(formatter: Callable[[Any], str], context: Mapping[str, Any], field: str) -> Any:
+    items = context.get(field)
+    return formatter(items) if isinstance(items, list) else ABSENT
+
+
+def _evaluate_derived(formula: Callable[..., Any], context: Mapping, columns: Optional[dict] = None) -> Any:
+    try:
+        return formula(context, columns)
+    except Exception:
+        return None
 
-        for field_name in bool_fields:
-            value = data.get(field_name)
-            result[field_name] = self._bool_to_sino(value)
 
-        return result
+# Functions callable from derived.yaml formulas, besides the list
+# aggregates of the formula engine (sum, count, min, max, avg)
+FORMULA_FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    "extract_year": ContextBuilder._extract_year,
+    "format_directors_list": ContextBuilder._format_directors_list,
+    "bool_to_sino": ContextBuilder._bool_to_sino,
+}
@@ -5,19 +5,16 @@ Validador de datos multicapa
 
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
-from datetime import date, datetime
+from datetime import date
 import re
 
+from .formatters import NUMERIC_DATE_FORMATS, parse_date
 from .plugin_loader import PluginPack
-from .dsl_evaluator import evaluate_condition
+from .rule_engine import field_visibility_memo
 
 
-# Spanish month names for date parsing
-SPANISH_MONTHS = {
-    "enero": 1, "febrero": 2, "marzo": 3, "abril": 4,
-    "mayo": 5, "junio": 6, "julio": 7, "agosto": 8,
-    "septiembre": 9, "octubre": 10, "noviembre": 11, "diciembre": 12
-}
+# Date formats accepted in date fields (%B is a Spanish month name)
+VALID_DATE_FORMATS = ("%d de %B de %Y",) + NUMERIC_DATE_FORMATS
 
 
 @dataclass
@@ -53,8 +50,14 @@ class ContractValidator:
     def __init__(self, plugin: PluginPack):
         self.plugin = plugin
         self.fields = plugin.fields.get("fields", {})
-
-    def validate(self, data: dict, check_required: bool = True) -> ValidationResult:
+        self.visibility_memo = field_visibility_memo(plugin)
+
+    def validate(
+        self,
+        data: dict,
+        check_required: bool = True,
+        visibility: Optional[Dict[str, bool]] = None
+    ) -> ValidationResult:
         """
         Validate input data against field definitions
         Validar datos de entrada contra definiciones de campos
@@ -62,16 +65,18 @@ class ContractValidator:
         Args:
             data: Input data dictionary
             check_required: Whether to check required fields
+            visibility: Precomputed field visibility (e.g. from IncrementalEvaluator)
 
         Returns:
             ValidationResult with errors and warnings
         """
         result = ValidationResult(is_valid=True)
+        if visibility is None:
+            visibility = self.visibility_memo.visibility(data)
 
         for field_name, field_spec in self.fields.items():
             # Skip validation for hidden fields
-            condition = field_spec.get("condition")
-            if condition and not evaluate_condition(condition, data):
+            if not visibility.get(field_name, True):
                 continue
 
             value = data.get(field_name)
@@ -223,43 +228,7 @@ class ContractValidator:
 
     def _is_valid_date_string(self, value: str) -> bool:
         """Check if string is a valid date / Verificar si string es fecha valida"""
-        # First try Spanish date format: "31 de diciembre de 2025"
-        if self._parse_spanish_date(value):
-            return True
-
-        # Then try standard formats
-        formats = [
-            "%d/%m/%Y",
-            "%Y-%m-%d",
-            "%d-%m-%Y",
-            "%Y/%m/%d",
-            "%d.%m.%Y",
-        ]
-
-        for fmt in formats:
-            try:
-                datetime.strptime(value, fmt)
-                return True
-            except ValueError:
-                continue
-
-        return False
-
-    def _parse_spanish_date(self, value: str) -> Optional[date]:
-        """Parse Spanish date format: '31 de diciembre de 2025'"""
-        pattern = r"(\d{1,2})\s+de\s+(\w+)\s+de\s+(\d{4})"
-        match = re.match(pattern, value.lower().strip())
-        if match:
-            day = int(match.group(1))
-            month_name = match.group(2)
-            year = int(match.group(3))
-            month = SPANISH_MONTHS.get(month_name)
-            if month:
-                try:
-                    return date(year, month, day)
-                except ValueError:
-                    pass
-        return None
+        return parse_date(value.strip(), VALID_DATE_FORMATS) is not None
 
 
 def validate_input(plugin: PluginPack, data: dict, check_required: bool = True) -> ValidationResult:
@@ -0,0 +1,193 @@
+"""
+Word Tables - List fields rendered as Word tables from tables.yaml
+Campos de lista renderizados como tablas de Word desde tables.yaml
+
+A table is built as raw WordprocessingML: one prototype row is built per
+table definition and every data row is a deep copy of it with its texts
+filled in. The rows are appended to the w:tbl in one call, instead of
+python-docx's table.add_row(), which rebuilds the row from the grid
+every time.
+"""
+
+from copy import deepcopy
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+from .plugin_loader import PluginPack
+
+
+# Width of a table in fiftieths of a percent (w:type="pct")
+_FULL_WIDTH_PCT = 5000
+
+_BORDERS = ("top", "left", "bottom", "right", "insideH", "insideV")
+
+
+def list_table_definitions(plugin: PluginPack) -> Dict[str, dict]:
+    """
+    Table definitions of tables.yaml by source field, cached on the plugin
+    Definiciones de tablas de tables.yaml por campo origen, con cache
+
+    Tables with render: "text" keep the list as text and are left out.
+
+    Args:
+        plugin: PluginPack instance
+
+    Returns:
+        Dictionary mapping list field names to their table definition
+    """
+    def build() -> Dict[str, dict]:
+        definitions = {}
+        for table_def in (plugin.tables.get("tables") or {}).values():
+            source = table_def.get("source_field")
+            if source and table_def.get("columns") and table_def.get("render", "table") == "table":
+                definitions[source] = table_def
+        return definitions
+
+    return plugin.get_artifact("list_tables", build)
+
+
+def table_rows(table_def: dict, items: Any) -> List[Tuple[str, ...]]:
+    """
+    Cell texts of a list field, one tuple per non-empty item
+    Textos de celda de un campo de lista, una tupla por elemento
+
+    Dict items give one cell per column; other items fill the first column.
+    """
+    if not isinstance(items, list):
+        return []
+    names = [column["name"] for column in table_def["columns"]]
+    rows = []
+    for item in items:
+        if isinstance(item, dict):
+            row = tuple(_cell_text(item.get(name)) for name in names)
+        else:
+            row = (_cell_text(item),) + ("",) * (len(names) - 1)
+        if any(row):
+            rows.append(row)
+    return rows
+
+
+def build_table(table_def: dict, rows: Sequence[Sequence[str]], width_twips: Optional[int] = None) -> Any:
+    """
+    Build a w:tbl element with a header row and one row per entry
+    Construir un elemento w:tbl con cabecera y una fila por entrada
+
+    Args:
+        table_def: Table definition of tables.yaml
+        rows: Cell texts, one sequence per row (see table_rows)
+        width_twips: Text width of the page, for the column grid
+
+    Returns:
+        lxml element to insert in the document body
+    """
+    shares = _column_shares(table_def["columns"])
+    tbl = OxmlElement("w:tbl")
+    tbl.append(_table_properties())
+
+    grid = OxmlElement("w:tblGrid")
+    for share in shares:
+        col = OxmlElement("w:gridCol")
+        col.set(qn("w:w"), str(int((width_twips or 9000) * share)))
+        grid.append(col)
+    tbl.append(grid)
+
+    header = _prototype_row(shares, bold=True)
+    header.insert(0, _header_row_properties())
+    _fill_row(header, [column.get("label", column["name"]) for column in table_def["columns"]])
+    tbl.append(header)
+
+    prototype = _prototype_row(shares)
+    new_rows = []
+    for texts in rows:
+        row = deepcopy(prototype)
+        _fill_row(row, texts)
+        new_rows.append(row)
+    tbl.extend(new_rows)
+    return tbl
+
+
+def _cell_text(value: Any) -> str:
+    return "" if value is None else str(value)
+
+
+def _column_shares(columns: List[dict]) -> List[float]:
+    """Fraction of the table width of each column / Fraccion del ancho"""
+    shares = []
+    for column in columns:
+        width = str(column.get("width", "")).strip().rstrip("%")
+        try:
+            shares.append(float(width))
+        except ValueError:
+            shares.append(0.0)
+    declared = sum(shares)
+    missing = [i for i, share in enumerate(shares) if share <= 0]
+    if missing:
+        rest = max(100.0 - declared, 0.0) or 100.0
+        for i in missing:
+            shares[i] = rest / len(missing)
+    total = sum(shares)
+    return [share / total for share in shares]
+
+
+def _table_properties() -> Any:
+    tbl_pr = OxmlElement("w:tblPr")
+    width = OxmlElement("w:tblW")
+    width.set(qn("w:w"), str(_FULL_WIDTH_PCT))
+    width.set(qn("w:type"), "pct")
+    tbl_pr.append(width)
+
+    borders = OxmlElement("w:tblBorders")
+    for side in _BORDERS:
+        border = OxmlElement(f"w:{side}")
+        border.set(qn("w:val"), "single")
+        border.set(qn("w:sz"), "4")
+        border.set(qn("w:space"), "0")
+        border.set(qn("w:color"), "auto")
+        borders.append(border)
+    tbl_pr.append(borders)
+
+    layout = OxmlElement("w:tblLayout")
+    layout.set(qn("w:type"), "fixed")
+    tbl_pr.append(layout)
+    return tbl_pr
+
+
+def _header_row_properties() -> Any:
+    """Repeat the header row on every page / Repetir la cabecera"""
+    tr_pr = OxmlElement("w:trPr")
+    tr_pr.append(OxmlElement("w:tblHeader"))
+    return tr_pr
+
+
+def _prototype_row(shares: List[float], bold: bool = False) -> Any:
+    """w:tr with one empty w:t per column / Fila prototipo"""
+    tr = OxmlElement("w:tr")
+    for share in shares:
+        tc = OxmlElement("w:tc")
+        tc_pr = OxmlElement("w:tcPr")
+        width = OxmlElement("w:tcW")
+        width.set(qn("w:w"), str(int(_FULL_WIDTH_PCT * share)))
+        width.set(qn("w:type"), "pct")
+        tc_pr.append(width)
+        tc.append(tc_pr)
+
+        p = OxmlElement("w:p")
+        r = OxmlElement("w:r")
+        if bold:
+            r_pr = OxmlElement("w:rPr")
+            r_pr.append(OxmlElement("w:b"))
+            r.append(r_pr)
+        t = OxmlElement("w:t")
+        t.set("{http://www.w3.org/XML/1998/namespace}space", "preserve")
+        r.append(t)
+        p.append(r)
+        tc.append(p)
+        tr.append(tc)
+    return tr
+
+
+def _fill_row(row: Any, texts: Sequence[str]) -> None:
+    for t, text in zip(row.iter(qn("w:t")), texts):
+        t.text = text
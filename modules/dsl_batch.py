@@ -0,0 +1,389 @@
+"""
+DSL Batch - Vectorized condition evaluation over columnar batches
+Evaluacion vectorizada de condiciones DSL sobre lotes en columnas
+"""
+
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from .dsl_evaluator import BOOLEAN_WORDS, compile_condition, compile_path, normalize_value
+
+
+class ColumnBatch:
+    """
+    Column-oriented table with cached per-column views
+    Tabla orientada a columnas con vistas por columna en cache
+
+    Each column is looked up by field path. A column named with the full
+    dotted path ("servicio.enabled") is used as is; otherwise nested values
+    are extracted from the column of the longest matching prefix, so
+    results match evaluate_condition on the nested records. Normalized,
+    numeric and emptiness views are computed once per column and shared by
+    every condition evaluated against the batch.
+    """
+
+    def __init__(self, columns: Any, size: Optional[int] = None):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("NumPy is required for batch evaluation. Install with: pip install numpy")
+
+        # pandas DataFrame / DataFrame de pandas
+        if hasattr(columns, "columns") and hasattr(columns, "to_numpy"):
+            columns = {str(name): columns[name].to_numpy() for name in columns.columns}
+
+        self._columns: Dict[str, Any] = {name: _as_array(values) for name, values in columns.items()}
+        if size is None:
+            size = len(next(iter(self._columns.values()))) if self._columns else 0
+        self.size = size
+        self._views: Dict[tuple, Any] = {}
+
+    def __len__(self) -> int:
+        return self.size
+
+    def raw(self, path: str) -> "np.ndarray":
+        """Values at a field path / Valores en una ruta de campo"""
+        return self._view("raw", path, self._build_raw)
+
+    def normalized(self, path: str) -> "np.ndarray":
+        """Values with boolean words mapped to bools / Valores con booleanos normalizados"""
+        return self._view("normalized", path, self._build_normalized)
+
+    def numeric(self, path: str) -> "np.ndarray":
+        """Float view, NaN where float() fails / Vista numerica, NaN si float() falla"""
+        return self._view("numeric", path, self._build_numeric)
+
+    def none_mask(self, path: str) -> "np.ndarray":
+        """True where the value is None / True donde el valor es None"""
+        return self._view("none", path, self._build_none_mask)
+
+    def empty_mask(self, path: str) -> "np.ndarray":
+        """True where is_empty holds / True donde se cumple is_empty"""
+        return self._view("empty", path, self._build_empty_mask)
+
+    def word_masks(self, path: str) -> Tuple["np.ndarray", "np.ndarray"]:
+        """For string columns: where values normalize to True / False"""
+        return self._view("words", path, self._build_word_masks)
+
+    def _view(self, kind: str, path: str, builder: Callable[[str], Any]) -> "np.ndarray":
+        key = (kind, path)
+        view = self._views.get(key)
+        if view is None:
+            view = self._views[key] = builder(path)
+        return view
+
+    def _build_raw(self, path: str) -> "np.ndarray":
+        if path in self._columns:
+            return self._columns[path]
+
+        keys = path.split(".")
+        for i in range(len(keys) - 1, 0, -1):
+            prefix = ".".join(keys[:i])
+            if prefix in self._columns:
+                get = compile_path(".".join(keys[i:]))
+                column = self._columns[prefix]
+                return np.fromiter(
+                    (get(v) if isinstance(v, (dict, list)) else None for v in column),
+                    dtype=object, count=len(column)
+                )
+
+        return np.full(self.size, None, dtype=object)
+
+    def _build_normalized(self, path: str) -> "np.ndarray":
+        column = self.raw(path)
+        kind = column.dtype.kind
+        if kind in "biuf":
+            return column
+
+        if kind == "U":
+            true_mask, false_mask = self.word_masks(path)
+            if not (true_mask.any() or false_mask.any()):
+                return column
+            result = column.astype(object)
+            result[true_mask] = True
+            result[false_mask] = False
+            return result
+
+        return _normalize_object(column)
+
+    def _build_word_masks(self, path: str) -> Tuple["np.ndarray", "np.ndarray"]:
+        # Classify each distinct string once, then gather back to rows
+        uniques, inverse = np.unique(self.raw(path), return_inverse=True)
+        words = [BOOLEAN_WORDS.get(str(u).lower()) for u in uniques]
+        true_table = np.array([w is True for w in words], dtype=bool)
+        false_table = np.array([w is False for w in words], dtype=bool)
+        return true_table[inverse], false_table[inverse]
+
+    def _build_numeric(self, path: str) -> "np.ndarray":
+        column = self.normalized(path)
+        if column.dtype.kind in "biuf":
+            return column.astype(float)
+        return _map_object(_to_float, column).astype(float)
+
+    def _build_none_mask(self, path: str) -> "np.ndarray":
+        column = self.raw(path)
+        if column.dtype.kind != "O":
+            return np.zeros(len(column), dtype=bool)
+        return np.asarray(column == None, dtype=bool)  # noqa: E711 - elementwise
+
+    def _build_empty_mask(self, path: str) -> "np.ndarray":
+        column = self.normalized(path)
+        kind = column.dtype.kind
+        if kind in "biuf":
+            return np.zeros(len(column), dtype=bool)
+        if kind == "U":
+            return np.char.str_len(column) == 0
+        return _map_object(_is_empty, column).astype(bool)
+
+
+def evaluate_condition_batch(condition: Optional[dict], columns: Any) -> "np.ndarray":
+    """
+    Evaluate a condition over a column-oriented batch of records
+    Evaluar una condicion sobre un lote de registros en columnas
+
+    Supports every operator of the DSL with the same semantics as
+    evaluate_condition, row for row.
+
+    Args:
+        condition: Condition dictionary with operator, field, value, etc.
+        columns: Dict of column arrays/lists, a pandas DataFrame or a ColumnBatch
+
+    Returns:
+        Boolean NumPy array with one entry per record
+
+    Raises:
+        DSLEvaluationError: If condition is invalid or too deeply nested
+        ImportError: If NumPy is not installed
+    """
+    batch = columns if isinstance(columns, ColumnBatch) else ColumnBatch(columns)
+    # Validate once with the same rules as the scalar evaluator
+    compile_condition(condition)
+    return _evaluate(condition, batch)
+
+
+def _evaluate(condition: Optional[dict], batch: ColumnBatch) -> "np.ndarray":
+    """Evaluate a validated condition node / Evaluar un nodo validado"""
+    size = batch.size
+    if not condition or not condition.get("operator"):
+        return np.ones(size, dtype=bool)
+
+    operator = condition["operator"]
+
+    # Logical operators / Operadores logicos
+    if operator in ("and", "or"):
+        conditions = condition.get("conditions", [])
+        result = np.full(size, operator == "and", dtype=bool)
+        combine = np.logical_and if operator == "and" else np.logical_or
+        for c in conditions:
+            combine(result, _evaluate(c, batch), out=result)
+        return result
+
+    if operator == "not":
+        inner_condition = condition.get("condition")
+        if not inner_condition:
+            return np.ones(size, dtype=bool)
+        return ~_evaluate(inner_condition, batch)
+
+    # Comparison operators / Operadores de comparacion
+    field = condition.get("field")
+    if not field:
+        # Every field value is None / Todos los valores son None
+        batch = ColumnBatch({}, size=size)
+        field = "\0none"
+    value = normalize_value(condition.get("value"))
+    strings = batch.raw(field).dtype.kind == "U"
+
+    if operator in ("equals", "not_equals"):
+        if strings:
+            result = _equals_strings(batch, field, value)
+        else:
+            result = _equals(batch.normalized(field), value)
+        return result if operator == "equals" else ~result
+
+    if operator in ("gt", "gte", "lt", "lte"):
+        try:
+            limit = float(value)
+        except (ValueError, TypeError):
+            return np.zeros(size, dtype=bool)
+        compare = {"gt": np.greater, "gte": np.greater_equal, "lt": np.less, "lte": np.less_equal}[operator]
+        with np.errstate(invalid="ignore"):
+            return compare(batch.numeric(field), limit)
+
+    if operator in ("in", "not_in"):
+        values = condition.get("values", [])
+        if strings and isinstance(values, (list, tuple)) and all(_is_scalar(v) for v in values):
+            result = _membership_strings(batch, field, values)
+        else:
+            result = _membership(batch.normalized(field), values)
+        return result if operator == "in" else ~result
+
+    if operator == "exists":
+        return ~batch.none_mask(field)
+
+    if operator == "not_exists":
+        return batch.none_mask(field).copy()
+
+    if operator == "is_empty":
+        return batch.empty_mask(field).copy()
+
+    if operator == "not_empty":
+        return ~batch.empty_mask(field)
+
+    if operator in ("contains", "not_contains"):
+        if strings:
+            # Boolean words are bools after normalization: never contain text
+            found = np.char.find(batch.raw(field), str(value)) >= 0
+            true_mask, false_mask = batch.word_masks(field)
+            words = true_mask | false_mask
+            return found & ~words if operator == "contains" else ~found | words
+        column = batch.normalized(field)
+        if column.dtype.kind in "biuf":
+            return np.full(size, operator == "not_contains", dtype=bool)
+        text = str(value)
+        if operator == "contains":
+            return _map_object(lambda v: _contains(v, value, text, False), column).astype(bool)
+        return _map_object(lambda v: _contains(v, value, text, True), column).astype(bool)
+
+    return np.zeros(size, dtype=bool)
+
+
+def _as_array(values: Any) -> "np.ndarray":
+    """Convert a column to an array without guessing types / Convertir columna a array"""
+    if isinstance(values, np.ndarray):
+        if values.dtype.kind in "biufUO":
+            return values
+        return values.astype(object)
+    values = list(values)
+    return np.fromiter(values, dtype=object, count=len(values))
+
+
+def _normalize_object(column: "np.ndarray") -> "np.ndarray":
+    """Normalize an object column by its distinct boolean words / Normalizar columna"""
+    try:
+        distinct = set(column.tolist())
+    except TypeError:
+        # Unhashable values (lists, dicts): normalize element by element
+        return _map_object(normalize_value, column)
+
+    words = {v: normalize_value(v) for v in distinct if isinstance(v, str) and v.lower() in BOOLEAN_WORDS}
+    if not words:
+        return column
+
+    result = column.copy()
+    for word, normalized in words.items():
+        result[np.asarray(column == word, dtype=bool)] = normalized
+    return result
+
+
+def _map_object(func: Callable[[Any], Any], column: "np.ndarray") -> "np.ndarray":
+    """Apply a function element-wise, returning an object array"""
+    if len(column) == 0:
+        return np.empty(0, dtype=object)
+    return np.frompyfunc(func, 1, 1)(column)
+
+
+def _is_scalar(value: Any) -> bool:
+    return value is None or isinstance(value, (bool, int, float, str))
+
+
+def _equals(column: "np.ndarray", value: Any) -> "np.ndarray":
+    """Element-wise equality with a constant / Igualdad elemento a elemento"""
+    kind = column.dtype.kind
+    if kind in "biuf":
+        if value is None or isinstance(value, str) or not _is_scalar(value):
+            return np.zeros(len(column), dtype=bool)
+        return column == value
+    if kind == "U":
+        if isinstance(value, str):
+            return column == value
+        return np.zeros(len(column), dtype=bool)
+    if _is_scalar(value):
+        return np.asarray(column == value, dtype=bool)
+    return _map_object(lambda v: bool(v == value), column).astype(bool)
+
+
+def _equals_strings(batch: ColumnBatch, field: str, value: Any) -> "np.ndarray":
+    """Equality on a string column without building objects / Igualdad en columna de texto"""
+    column = batch.raw(field)
+    if isinstance(value, str):
+        # A normalized constant string is never a boolean word
+        return column == value
+    result = np.zeros(len(column), dtype=bool)
+    if value is None or not _is_scalar(value):
+        return result
+    true_mask, false_mask = batch.word_masks(field)
+    if True == value:
+        result |= true_mask
+    if False == value:
+        result |= false_mask
+    return result
+
+
+def _membership_strings(batch: ColumnBatch, field: str, values: Any) -> "np.ndarray":
+    """Membership on a string column / Pertenencia en columna de texto"""
+    column = batch.raw(field)
+    true_mask, false_mask = batch.word_masks(field)
+    strings = [v for v in values if isinstance(v, str)]
+    others = [v for v in values if not isinstance(v, str)]
+
+    result = np.isin(column, strings) & ~(true_mask | false_mask) if strings else np.zeros(len(column), dtype=bool)
+    if True in others:
+        result |= true_mask
+    if False in others:
+        result |= false_mask
+    return result
+
+
+def _membership(column: "np.ndarray", values: Any) -> "np.ndarray":
+    """Element-wise membership test / Pertenencia elemento a elemento"""
+    if isinstance(values, (list, tuple)) and all(_is_scalar(v) for v in values):
+        kind = column.dtype.kind
+        if kind in "biuf":
+            numbers = [v for v in values if isinstance(v, (bool, int, float))]
+            return np.isin(column, numbers) if numbers else np.zeros(len(column), dtype=bool)
+        if kind == "U":
+            strings = [v for v in values if isinstance(v, str)]
+            return np.isin(column, strings) if strings else np.zeros(len(column), dtype=bool)
+        members = frozenset(values)
+    else:
+        members = values
+
+    def member(v: Any) -> bool:
+        try:
+            return v in members
+        except TypeError:
+            return v in values
+    return _map_object(member, column).astype(bool)
+
+
+def _to_float(value: Any) -> float:
+    """float() or NaN, like the scalar gt/lt operators / float() o NaN"""
+    if value is None:
+        return float("nan")
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return float("nan")
+
+
+def _is_empty(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, (str, list, dict)):
+        return len(value) == 0
+    return False
+
+
+def _contains(value: Any, constant: Any, text: str, negate: bool) -> bool:
+    if value is None:
+        return negate
+    if isinstance(value, str):
+        found = text in value
+    elif isinstance(value, (list, tuple)):
+        found = constant in value
+    else:
+        return negate
+    return not found if negate else found
@@ -3,7 +3,8 @@ DSL Evaluator - Safe conditional expression evaluator
 Evaluador seguro de expresiones condicionales DSL
 """
 
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Optional
 
 # Allowed operators (whitelist) / Operadores permitidos (lista blanca)
 ALLOWED_OPERATORS = frozenset({
@@ -17,6 +18,13 @@ ALLOWED_OPERATORS = frozenset({
 # Maximum nesting depth to prevent stack overflow
 MAX_NESTING_DEPTH = 5
 
+# String values normalized to booleans / Cadenas normalizadas a booleanos
+BOOLEAN_WORDS = {"true": True, "si": True, "sí": True, "yes": True, "false": False, "no": False}
+
+# Compiled conditions keyed by structural key / Condiciones compiladas por clave estructural
+_COMPILED_CONDITIONS: Dict[Hashable, Callable[[dict], bool]] = {}
+_MAX_COMPILED_CONDITIONS = 4096
+
 
 class DSLEvaluationError(Exception):
     """Exception raised for DSL evaluation errors"""
@@ -73,21 +81,11 @@ def evaluate_condition(condition: dict, data: dict, depth: int = 0) -> bool:
 
     # Comparison operators / Operadores de comparacion
     field = condition.get("field")
-    value = condition.get("value")
+    value = normalize_value(condition.get("value"))
     field_value = get_nested_value(data, field) if field else None
 
     # Normalize boolean values
-    if isinstance(value, str):
-        if value.lower() in ('true', 'si', 'yes'):
-            value = True
-        elif value.lower() in ('false', 'no'):
-            value = False
-
-    if isinstance(field_value, str):
-        if field_value.lower() in ('true', 'si', 'yes'):
-            field_value = True
-        elif field_value.lower() in ('false', 'no'):
-            field_value = False
+    field_value = normalize_value(field_value)
 
     if operator == "equals":
         return field_value == value
@@ -168,6 +166,370 @@ def evaluate_condition(condition: dict, data: dict, depth: int = 0) -> bool:
     return False
 
 
+def compile_condition(condition: Optional[dict]) -> Callable[[dict], bool]:
+    """
+    Compile a condition into a reusable predicate (no eval/exec)
+    Compilar una condicion en un predicado reutilizable (sin eval/exec)
+
+    The condition is validated once, constants are normalized and converted
+    up front and field paths are pre-split. Results are identical to
+    evaluate_condition, except that invalid operators and excessive nesting
+    are reported at compile time rather than when first reached.
+    Compiled predicates are memoized by the structure of the condition.
+
+    Args:
+        condition: Condition dictionary with operator, field, value, etc.
+
+    Returns:
+        Callable taking a data dictionary and returning the condition result
+
+    Raises:
+        DSLEvaluationError: If condition is invalid or too deeply nested
+    """
+    key = condition_key(condition)
+    predicate = _COMPILED_CONDITIONS.get(key)
+    if predicate is None:
+        predicate = _compile(condition, 0)
+        if len(_COMPILED_CONDITIONS) >= _MAX_COMPILED_CONDITIONS:
+            _COMPILED_CONDITIONS.clear()
+        _COMPILED_CONDITIONS[key] = predicate
+    return predicate
+
+
+def condition_key(condition: Any) -> Hashable:
+    """
+    Structural key of a condition, equal for equal conditions
+    Clave estructural de una condicion, igual para condiciones iguales
+
+    Scalars keep their type so that, for example, 1 and True stay distinct.
+    """
+    if isinstance(condition, dict):
+        return ("dict", tuple(sorted((str(k), condition_key(v)) for k, v in condition.items())))
+    if isinstance(condition, (list, tuple)):
+        return ("list", tuple(condition_key(v) for v in condition))
+    try:
+        hash(condition)
+    except TypeError:
+        return (type(condition).__name__, repr(condition))
+    return (type(condition).__name__, condition)
+
+
+def condition_fields(condition: Optional[dict]) -> FrozenSet[str]:
+    """
+    Field paths a condition reads, found without evaluating it
+    Rutas de campo que lee una condicion, sin evaluarla
+
+    Args:
+        condition: Condition dictionary with operator, field, value, etc.
+
+    Returns:
+        Frozen set of field paths (dotted paths are kept as written)
+    """
+    if not isinstance(condition, dict) or not condition.get("operator"):
+        return frozenset()
+
+    operator = condition["operator"]
+    if operator in ("and", "or"):
+        fields = set()
+        for c in condition.get("conditions", []) or []:
+            fields |= condition_fields(c)
+        return frozenset(fields)
+
+    if operator == "not":
+        return condition_fields(condition.get("condition"))
+
+    field = condition.get("field")
+    return frozenset([field]) if field else frozenset()
+
+
+def field_root(path: str) -> str:
+    """Top-level data key of a field path / Clave de primer nivel de una ruta"""
+    return path.split(".", 1)[0]
+
+
+def normalize_value(value: Any) -> Any:
+    """Normalize boolean-like strings as the DSL does / Normalizar cadenas tipo booleano"""
+    if isinstance(value, str):
+        return BOOLEAN_WORDS.get(value.lower(), value)
+    return value
+
+
+def _always_true(data: dict) -> bool:
+    return True
+
+
+def _always_false(data: dict) -> bool:
+    return False
+
+
+def _compile(condition: Optional[dict], depth: int) -> Callable[[dict], bool]:
+    """Compile a condition node / Compilar un nodo de condicion"""
+    if not condition:
+        return _always_true
+
+    if depth > MAX_NESTING_DEPTH:
+        raise DSLEvaluationError(f"Condition nesting too deep (max {MAX_NESTING_DEPTH})")
+
+    operator = condition.get("operator")
+    if not operator:
+        return _always_true
+
+    if operator not in ALLOWED_OPERATORS:
+        raise DSLEvaluationError(f"Operator not allowed: {operator}")
+
+    # Logical operators / Operadores logicos
+    if operator == "and":
+        conditions = condition.get("conditions", [])
+        if not conditions:
+            return _always_true
+        parts = tuple(_compile(c, depth + 1) for c in conditions)
+
+        def all_of(data: dict) -> bool:
+            for part in parts:
+                if not part(data):
+                    return False
+            return True
+        return all_of
+
+    if operator == "or":
+        conditions = condition.get("conditions", [])
+        if not conditions:
+            return _always_false
+        parts = tuple(_compile(c, depth + 1) for c in conditions)
+
+        def any_of(data: dict) -> bool:
+            for part in parts:
+                if part(data):
+                    return True
+            return False
+        return any_of
+
+    if operator == "not":
+        inner_condition = condition.get("condition")
+        if not inner_condition:
+            return _always_true
+        inner = _compile(inner_condition, depth + 1)
+        return lambda data: not inner(data)
+
+    # Comparison operators / Operadores de comparacion
+    field = condition.get("field")
+    value = normalize_value(condition.get("value"))
+    read = compile_reader(field) if field else (lambda data: None)
+
+    if operator == "equals":
+        return lambda data: read(data) == value
+
+    if operator == "not_equals":
+        return lambda data: read(data) != value
+
+    if operator in ("gt", "gte", "lt", "lte"):
+        try:
+            limit = float(value)
+        except (ValueError, TypeError):
+            return _always_false
+        compare = _NUMERIC_COMPARISONS[operator]
+
+        def numeric(data: dict) -> bool:
+            field_value = read(data)
+            if field_value is None:
+                return False
+            try:
+                return compare(float(field_value), limit)
+            except (ValueError, TypeError):
+                return False
+        return numeric
+
+    if operator in ("in", "not_in"):
+        values = condition.get("values", [])
+        members = values
+        if isinstance(values, (list, tuple)) and all(
+            v is None or isinstance(v, (str, int, float)) for v in values
+        ):
+            members = frozenset(values)
+        negate = operator == "not_in"
+
+        def membership(data: dict) -> bool:
+            field_value = read(data)
+            try:
+                found = field_value in members
+            except TypeError:
+                found = field_value in values
+            return not found if negate else found
+        return membership
+
+    if operator == "exists":
+        return lambda data: read(data) is not None
+
+    if operator == "not_exists":
+        return lambda data: read(data) is None
+
+    if operator == "is_empty":
+        def is_empty(data: dict) -> bool:
+            field_value = read(data)
+            if field_value is None:
+                return True
+            if isinstance(field_value, (str, list, dict)):
+                return len(field_value) == 0
+            return False
+        return is_empty
+
+    if operator == "not_empty":
+        def not_empty(data: dict) -> bool:
+            field_value = read(data)
+            if field_value is None:
+                return False
+            if isinstance(field_value, (str, list, dict)):
+                return len(field_value) > 0
+            return True
+        return not_empty
+
+    if operator in ("contains", "not_contains"):
+        text = str(value)
+        negate = operator == "not_contains"
+
+        def contains(data: dict) -> bool:
+            field_value = read(data)
+            if field_value is None:
+                return negate
+            if isinstance(field_value, str):
+                found = text in field_value
+            elif isinstance(field_value, (list, tuple)):
+                found = value in field_value
+            else:
+                return negate
+            return not found if negate else found
+        return contains
+
+    return _always_false
+
+
+_NUMERIC_COMPARISONS = {
+    "gt": lambda a, b: a > b,
+    "gte": lambda a, b: a >= b,
+    "lt": lambda a, b: a < b,
+    "lte": lambda a, b: a <= b,
+}
+
+
+def compile_reader(path: str) -> Callable[[Any], Any]:
+    """
+    Read and normalize the value at a path / Leer y normalizar el valor de una ruta
+
+    Returns the field value exactly as comparison operators see it:
+    strings naming a boolean (BOOLEAN_WORDS, any case) become bools and every
+    other value is returned unchanged. Top-level keys of plain dicts are
+    read directly, so already typed records (see normalize_record) cost
+    one dict lookup and a type check.
+    """
+    get = compile_path(path)
+    words = BOOLEAN_WORDS
+
+    if "." in path:
+        def read_nested(data: Any) -> Any:
+            value = get(data)
+            if isinstance(value, str):
+                return words.get(value.lower(), value)
+            return value
+        return read_nested
+
+    def read(data: Any) -> Any:
+        # Inlined fast path of compile_path for plain dicts
+        value = data.get(path) if data.__class__ is dict else get(data)
+        if isinstance(value, str):
+            return words.get(value.lower(), value)
+        return value
+    return read
+
+
+@lru_cache(maxsize=1024)
+def compile_path(path: str) -> Callable[[Any], Any]:
+    """
+    Compile a dot-notation path into a cached accessor
+    Compilar una ruta con notacion de punto en un accesor en cache
+
+    Behaves like get_nested_value. Dot-free paths on plain dicts are a single
+    dict.get; list segments have their integer index computed once.
+
+    Args:
+        path: Dot-separated path string
+
+    Returns:
+        Callable taking the data and returning the value or None
+    """
+    if not path:
+        return lambda data: None
+
+    steps = tuple((key, _segment_index(key)) for key in path.split("."))
+
+    def get(data: Any) -> Any:
+        if not data:
+            return None
+        value = data
+        for key, index in steps:
+            if isinstance(value, dict):
+                value = value.get(key)
+            elif isinstance(value, list):
+                if index is None:
+                    return None
+                value = value[index] if 0 <= index < len(value) else None
+            else:
+                return None
+
+            if value is None:
+                return None
+
+        return value
+
+    if len(steps) > 1:
+        return get
+
+    def get_key(data: Any) -> Any:
+        if data.__class__ is dict:
+            return data.get(path)
+        return get(data)
+    return get_key
+
+
+@lru_cache(maxsize=1024)
+def compile_setter(path: str) -> Callable[[dict, Any], None]:
+    """
+    Compile a dot-notation path into a cached setter
+    Compilar una ruta con notacion de punto en un setter en cache
+
+    Behaves like set_nested_value, creating missing intermediate dicts.
+
+    Args:
+        path: Dot-separated path string
+
+    Returns:
+        Callable taking (data, value)
+    """
+    keys = tuple(path.split("."))
+    parents, last = keys[:-1], keys[-1]
+
+    if not parents:
+        def set_key(data: dict, value: Any) -> None:
+            data[last] = value
+        return set_key
+
+    def set_path(data: dict, value: Any) -> None:
+        current = data
+        for key in parents:
+            if key not in current:
+                current[key] = {}
+            current = current[key]
+        current[last] = value
+    return set_path
+
+
+def _segment_index(key: str) -> Optional[int]:
+    """List index of a path segment, None if not an integer"""
+    try:
+        return int(key)
+    except ValueError:
+        return None
+
+
 def get_nested_value(data: dict, path: str) -> Any:
     """
     Support dot-notation path access: 'servicio.enabled'
@@ -182,26 +544,7 @@ def get_nested_value(data: dict, path: str) -> Any:
     """
     if not path or not data:
         return None
-
-    keys = path.split(".")
-    value = data
-
-    for key in keys:
-        if isinstance(value, dict):
-            value = value.get(key)
-        elif isinstance(value, list):
-            try:
-                index = int(key)
-                value = value[index] if 0 <= index < len(value) else None
-            except ValueError:
-                return None
-        else:
-            return None
-
-        if value is None:
-            return None
-
-    return value
+    return compile_path(path)(data)
 
 
 def set_nested_value(data: dict, path: str, value: Any) -> None:
@@ -216,16 +559,7 @@ def set_nested_value(data: dict, path: str, value: Any) -> None:
     """
     if not path:
         return
-
-    keys = path.split(".")
-    current = data
-
-    for key in keys[:-1]:
-        if key not in current:
-            current[key] = {}
-        current = current[key]
-
-    current[keys[-1]] = value
+    compile_setter(path)(data, value)
 
 
 def evaluate_simple_condition(condition_str: str, data: dict) -> bool:
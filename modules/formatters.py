@@ -0,0 +1,593 @@
+"""
+Formatters - Shared date parsing and value formatting
+Analisis de fechas y formateo de valores compartidos
+"""
+
+import re
+import string
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# Spanish month names / Nombres de los meses en espanol
+SPANISH_MONTHS = (
+    "enero", "febrero", "marzo", "abril", "mayo", "junio",
+    "julio", "agosto", "septiembre", "octubre", "noviembre", "diciembre"
+)
+
+# Month names by language: Spanish, Catalan, Galician, Basque
+MONTH_NAMES: Dict[str, Tuple[str, ...]] = {
+    "es": SPANISH_MONTHS,
+    "ca": ("gener", "febrer", "març", "abril", "maig", "juny",
+           "juliol", "agost", "setembre", "octubre", "novembre", "desembre"),
+    "gl": ("xaneiro", "febreiro", "marzo", "abril", "maio", "xuño",
+           "xullo", "agosto", "setembro", "outubro", "novembro", "decembro"),
+    "eu": ("urtarrila", "otsaila", "martxoa", "apirila", "maiatza", "ekaina",
+           "uztaila", "abuztua", "iraila", "urria", "azaroa", "abendua"),
+}
+
+# formatting.yaml date formats and their language
+DATE_LANGUAGES = {"spanish": "es", "catalan": "ca", "galician": "gl", "basque": "eu"}
+
+# Long date pattern per language (%-d is the day without zero padding)
+LONG_DATE_PATTERNS = {
+    "es": "%-d de %B de %Y",
+    "ca": "%-d de %B de %Y",
+    "gl": "%-d de %B de %Y",
+    "eu": "%Y(e)ko %Bren %-d(a)",
+}
+
+# Formats tried in order by parse_date; %B is a month name of MONTH_NAMES
+DATE_FORMATS: Tuple[str, ...] = (
+    "%d/%m/%Y",
+    "%Y-%m-%d",
+    "%d-%m-%Y",
+    "%d de %B de %Y",
+    "%d d'%B de %Y",
+    "%Y/%m/%d",
+    "%d.%m.%Y",
+    "%Y.%m.%d",
+    "%m/%d/%Y",
+)
+
+# Numeric formats accepted for input normalization
+NUMERIC_DATE_FORMATS: Tuple[str, ...] = (
+    "%d/%m/%Y",
+    "%Y-%m-%d",
+    "%d-%m-%Y",
+    "%Y/%m/%d",
+    "%d.%m.%Y",
+)
+
+# formatting.yaml number_formats used when a plugin does not define them
+DEFAULT_NUMBER_FORMATS: Dict[str, Dict[str, Any]] = {
+    "currency": {"decimal_separator": ",", "thousands_separator": ".", "decimal_places": 2, "pattern": "{value} EUR"},
+    "percentage": {"decimal_separator": ",", "decimal_places": 2, "pattern": "{value} %"},
+    "integer": {"thousands_separator": "."},
+}
+
+# Same patterns as datetime.strptime for each directive
+_DIRECTIVES = {
+    "d": r"(?P<d>3[01]|[12]\d|0[1-9]|[1-9]| [1-9])",
+    "m": r"(?P<m>1[0-2]|0[1-9]|[1-9])",
+    "Y": r"(?P<Y>\d\d\d\d)",
+    "B": r"(?P<B>[^\W\d_]+)",
+}
+
+# No month name is shared by two languages with different numbers
+_MONTH_NUMBERS = {
+    name: number
+    for names in MONTH_NAMES.values()
+    for number, name in enumerate(names, start=1)
+}
+
+# Date parser: string -> date or None
+DateMatcher = Callable[[str], Optional[date]]
+
+
+def parse_date(value: Any, formats: Tuple[str, ...] = DATE_FORMATS) -> Optional[date]:
+    """
+    Parse a date from a string or date/datetime object
+    Parsear una fecha desde un string o un objeto date/datetime
+
+    Formats are tried in order with precompiled regular expressions, with
+    the same matching rules as datetime.strptime. Month names are looked up
+    in MONTH_NAMES, so parsing never depends on the process locale.
+    Results for strings are kept in a bounded LRU cache.
+
+    Args:
+        value: Date string, date or datetime
+        formats: strptime-style formats to try (%d, %m, %Y, %B)
+
+    Returns:
+        date object or None
+    """
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if not isinstance(value, str):
+        return None
+    return _parse_cached(value, formats)
+
+
+def parse_date_column(values: Iterable[Any], formats: Tuple[str, ...] = DATE_FORMATS) -> List[Optional[date]]:
+    """
+    Parse a column of dates, detecting the format once
+    Parsear una columna de fechas, detectando el formato una sola vez
+
+    The format of the first parsable string is tried first for every
+    value; values in another format fall back to parse_date, so the result
+    equals parse_date on each value.
+
+    Args:
+        values: Date strings, dates or None
+        formats: strptime-style formats to try
+
+    Returns:
+        List of date objects or None, one per value
+    """
+    matchers = _compile_formats(formats)
+    detected: Optional[DateMatcher] = None
+    result: List[Optional[date]] = []
+    for value in values:
+        if detected is not None and value.__class__ is str:
+            parsed = detected(value)
+            if parsed is not None:
+                result.append(parsed)
+                continue
+        parsed = parse_date(value, formats)
+        if parsed is not None and detected is None and value.__class__ is str:
+            detected = next(m for m in matchers if m(value) is not None)
+        result.append(parsed)
+    return result
+
+
+def format_date(
+    value: date,
+    fmt: str = "%d de %B de %Y",
+    language: str = "es",
+    months: Optional[Sequence[str]] = None
+) -> str:
+    """
+    Locale-free strftime for %d, %-d, %m, %Y and %B
+    strftime sin locale para %d, %-d, %m, %Y y %B
+
+    Args:
+        value: date or datetime
+        fmt: Format string
+        language: Language of the month names (see MONTH_NAMES)
+        months: Twelve month names overriding the language table
+
+    Returns:
+        Formatted date string
+    """
+    names = months or MONTH_NAMES[language]
+    return "".join(
+        piece if kind is None else _DATE_FIELDS[kind](value, names)
+        for kind, piece in _compile_output_format(fmt)
+    )
+
+
+def format_long_date(value: date, language: str = "es", months: Optional[Sequence[str]] = None) -> str:
+    """
+    Long date in a language: 31 de diciembre de 2025
+    Fecha larga en un idioma: 31 de diciembre de 2025
+
+    Args:
+        value: date or datetime
+        language: "es", "ca", "gl" or "eu"
+        months: Twelve month names overriding the language table
+            (e.g. formatting.yaml spanish_months)
+    """
+    text = format_date(value, LONG_DATE_PATTERNS[language], language, months)
+    if language == "ca":
+        # Catalan elides "de" before a vowel: 1 d'abril de 2025
+        month = (months or MONTH_NAMES["ca"])[value.month - 1]
+        if month[:1].lower() in "aeiouàèéíòóú":
+            text = text.replace(f"de {month}", f"d'{month}", 1)
+    return text
+
+
+class NumberFormatter:
+    """
+    Number format of formatting.yaml compiled once into a callable
+    Formato numerico de formatting.yaml compilado una vez
+
+    Values are formatted with "_" grouping and "." as decimal mark, which
+    are then replaced by the configured separators: one format() call and
+    at most two replace() per value. format_value is the compiled closure;
+    calling the formatter is equivalent.
+
+    Values are rounded as format() and round() do (half to even on the
+    exact binary value). A value that rounds to zero never shows a minus
+    sign, and NaN and infinity are returned as str(value).
+
+    Spec keys: decimal_separator (default ","), thousands_separator
+    (default none), decimal_places (default 0), pattern (default
+    "{value}"). Other keys (locale, symbol) are ignored.
+    """
+
+    def __init__(self, spec: Dict[str, Any]):
+        if not isinstance(spec, dict):
+            raise ValueError(f"Number format must be a mapping: {spec!r}")
+        places = int(spec.get("decimal_places", 0))
+        decimal = str(spec.get("decimal_separator", ","))
+        thousands = str(spec.get("thousands_separator") or "")
+        pattern = str(spec.get("pattern", "{value}"))
+        if places < 0:
+            raise ValueError(f"decimal_places must not be negative: {places}")
+        if pattern.count("{value}") != 1:
+            raise ValueError(f"Number pattern must contain '{{value}}' once: {pattern}")
+
+        self.number_spec = f"{'_' if thousands else ''}.{places}f"
+        self.prefix, self.suffix = pattern.split("{value}")
+        self.separators = _compile_separators(
+            decimal if places and decimal != "." else None,
+            thousands if thousands and thousands != "_" else None,
+        )
+        self.places = places
+        self.decimal = decimal if places else ""
+        self.thousands = thousands
+        self.format_value = self._compile(decimal if places else ".", thousands or "_")
+
+    def __call__(self, value: Any) -> str:
+        """
+        Format one value; None gives "" and non-numeric values str(value)
+        Formatear un valor
+        """
+        return self.format_value(value)
+
+    def column(self, values: Iterable[Any]) -> List[str]:
+        """
+        Format a whole column (list, tuple or numpy array)
+        Formatear una columna entera
+
+        With NumPy, numeric columns are rounded with array arithmetic and
+        their digits, separators and affixes written into one byte buffer,
+        which is decoded and split once. Other columns (None, strings,
+        Decimal) are formatted value by value. The result equals
+        format_value on each value.
+        """
+        if NUMPY_AVAILABLE:
+            if not isinstance(values, np.ndarray):
+                values = list(values)
+            array = np.asarray(values)
+            if array.ndim == 1 and array.dtype.kind in "iuf":
+                result = self._format_array(array)
+                if result is not None:
+                    return result
+            if values is array:
+                values = array.tolist()
+        return list(map(self.format_value, values))
+
+    def _format_array(self, array: "np.ndarray") -> Optional[List[str]]:
+        """Vectorized column; None when the array needs the per-value path"""
+        if not len(array):
+            return []
+        scale = 10 ** self.places
+        numbers = array.astype(np.float64)
+        scaled = np.abs(numbers) * scale
+        # Below 2**40 the error of the scaled product stays under 1e-3
+        if not np.isfinite(scaled).all() or scaled.max() >= 2.0 ** 40:
+            return None
+
+        rounded = np.rint(scaled)
+        units, fraction = np.divmod(rounded.astype(np.int64), scale)
+        sign = (numbers < 0) & (rounded != 0)
+
+        encoded = [part.encode() for part in (self.prefix, self.suffix, self.decimal, self.thousands)]
+        if any(b"\n" in part or b"\0" in part for part in encoded):
+            return None
+        prefix, suffix, decimal, thousands = encoded
+
+        # Three-digit groups, lowest first
+        groups = []
+        quotient = units
+        while not groups or quotient.any():
+            quotient, group = np.divmod(quotient, 1000)
+            groups.append(group)
+
+        # One byte column per value, transposed once at the end so that
+        # every write below is contiguous. Filler bytes (0) are dropped
+        # after decoding.
+        width = (len(prefix) + 1 + 3 * len(groups) + len(thousands) * (len(groups) - 1)
+                 + (len(decimal) + self.places if self.places else 0) + len(suffix) + 1)
+        buffer = np.empty((width, len(numbers)), dtype=np.uint8)
+        position = 0
+
+        def constant(part: bytes) -> None:
+            nonlocal position
+            buffer[position:position + len(part)] = np.frombuffer(part, dtype=np.uint8)[:, None]
+            position += len(part)
+
+        constant(prefix)
+        buffer[position] = np.where(sign, 45, 0)
+        position += 1
+        for power in range(len(groups) - 1, -1, -1):
+            # Rows whose first group this is take the table without leading zeros
+            index = groups[power] + 1000 * (units < 1000 ** (power + 1))
+            table = _GROUP_DIGITS if power else _LAST_GROUP_DIGITS
+            buffer[position:position + 3] = np.take(table, index, axis=1)
+            position += 3
+            if thousands and power:
+                shown = units >= 1000 ** power
+                buffer[position:position + len(thousands)] = np.where(
+                    shown, np.frombuffer(thousands, dtype=np.uint8)[:, None], 0)
+                position += len(thousands)
+        if self.places:
+            constant(decimal)
+            for offset in range(self.places - 1, -1, -1):
+                fraction, digit = np.divmod(fraction, 10)
+                buffer[position + offset] = digit + 48
+            position += self.places
+        constant(suffix + b"\n")
+
+        result = buffer.T.tobytes().decode().replace("\0", "").split("\n")
+        result.pop()
+
+        # Near a half the scaled product may round the wrong way
+        for index in np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-3).tolist():
+            result[index] = self.format_value(array[index].item())
+        return result
+
+    def _compile(self, decimal: str, thousands: str) -> Callable[[Any], str]:
+        number_spec, prefix, suffix, separators = self.number_spec, self.prefix, self.suffix, self.separators
+        # Decimal has no "_" grouping: format with "," and swap it for "_"
+        decimal_spec = number_spec.replace("_", ",")
+        # Inline replaces are the hot path; translate only for a "_" decimal mark
+        inline = "_" not in decimal
+
+        def format_value(value: Any) -> str:
+            if value.__class__ is float or value.__class__ is int:
+                text = format(value, number_spec)
+            elif value is None:
+                return ""
+            else:
+                number = _coerce_number(value)
+                if number is None:
+                    return str(value)
+                if isinstance(number, Decimal):
+                    text = format(number, decimal_spec).replace(",", "_")
+                else:
+                    text = format(number, number_spec)
+            if text[-1] > "9":
+                # nan, inf, NaN, Infinity
+                return str(value)
+            if text[0] == "-" and not text.strip("-0._"):
+                text = text[1:]
+            if inline:
+                return prefix + text.replace(".", decimal).replace("_", thousands) + suffix
+            return prefix + separators(text) + suffix
+        return format_value
+
+
+if NUMPY_AVAILABLE:
+    # ASCII digits of the groups 0-999 by column: zero padded (0-999), then
+    # with leading zeros as filler bytes (1000-1999). The last group of a
+    # number writes zero as "0".
+    _GROUP_DIGITS = np.array(
+        [list(f"{n:03d}".encode()) for n in range(1000)]
+        + [list(f"{n or '':>3}".encode().replace(b" ", b"\0")) for n in range(1000)],
+        dtype=np.uint8
+    ).T.copy()
+    _LAST_GROUP_DIGITS = _GROUP_DIGITS.copy()
+    _LAST_GROUP_DIGITS[:, 1000] = [0, 0, ord("0")]
+
+
+def _compile_separators(decimal: Optional[str], thousands: Optional[str]) -> Callable[[str], str]:
+    """Replace the "." decimal mark and "_" grouping of format() output"""
+    if decimal is not None and "_" in decimal:
+        # Replacing "." first would expose the "_" to the second replace
+        table = {ord("."): decimal, ord("_"): thousands or "_"}
+        return lambda text: text.translate(table)
+    if decimal is not None and thousands is not None:
+        return lambda text: text.replace(".", decimal).replace("_", thousands)
+    if decimal is not None:
+        return lambda text: text.replace(".", decimal)
+    if thousands is not None:
+        return lambda text: text.replace("_", thousands)
+    return lambda text: text
+
+
+def compile_number_format(spec: Optional[Dict[str, Any]]) -> NumberFormatter:
+    """
+    Compile a number_formats entry of formatting.yaml
+    Compilar una entrada number_formats de formatting.yaml
+
+    Raises:
+        ValueError: If decimal_places or pattern are invalid
+    """
+    return NumberFormatter(spec or {})
+
+
+class ListFormatter:
+    """
+    List output format of tables.yaml compiled once into a callable
+    Formato de salida de lista de tables.yaml compilado una vez
+
+    item_format names item keys and constants between braces, e.g.
+    "{indent} D. {nombre} - {cargo}". A dict item is written only when
+    every item key it names is set; string items are written as they are
+    and other items are skipped. Items and separators are appended to a
+    list of segments, joined once by the caller.
+    """
+
+    def __init__(self, item_format: str, separator: str = "\n", constants: Optional[Dict[str, Any]] = None):
+        constants = constants or {}
+        try:
+            parsed = list(string.Formatter().parse(item_format))
+        except ValueError as e:
+            raise ValueError(f"Invalid item_format {item_format!r}: {e}")
+
+        # Constants are folded in; item keys become positional fields
+        template = []
+        keys: List[str] = []
+        for literal, key, spec, conversion in parsed:
+            template.append(literal.replace("{", "{{").replace("}", "}}"))
+            if key is None:
+                continue
+            if spec or conversion:
+                raise ValueError(f"item_format fields take no format spec: {{{key}}}")
+            if not key:
+                raise ValueError(f"item_format fields must be named: {item_format!r}")
+            if key in constants:
+                template.append(str(constants[key]).replace("{", "{{").replace("}", "}}"))
+            else:
+                template.append(f"{{{len(keys)}}}")
+                keys.append(key)
+        self.template = "".join(template)
+        self.keys = tuple(keys)
+        self.separator = separator
+
+    def __call__(self, items: Any) -> str:
+        """
+        Format a list; strings are returned as they are and None as ""
+        Formatear una lista
+        """
+        if not items:
+            return ""
+        if isinstance(items, str):
+            return items
+        if not isinstance(items, list):
+            return str(items)
+        segments: List[str] = []
+        self.write(items, segments)
+        return "".join(segments)
+
+    def write(self, items: Iterable[Any], segments: List[str]) -> None:
+        """Append the formatted items and separators to segments"""
+        append, render, keys, separator = segments.append, self.template.format, self.keys, self.separator
+        first = True
+        for item in items:
+            if isinstance(item, dict):
+                values = [item.get(key) for key in keys]
+                if not all(values):
+                    continue
+                line = render(*values)
+            elif isinstance(item, str):
+                line = item
+            else:
+                continue
+            if not first:
+                append(separator)
+            append(line)
+            first = False
+
+
+def compile_list_format(spec: Optional[Dict[str, Any]], constants: Optional[Dict[str, Any]] = None) -> ListFormatter:
+    """
+    Compile an output_format entry of tables.yaml
+    Compilar una entrada output_format de tables.yaml
+
+    Args:
+        spec: Entry with item_format and separator (default newline)
+        constants: Values of the item_format fields that are not item keys
+            (e.g. the indent of the table formatting)
+
+    Raises:
+        ValueError: If item_format is missing or invalid
+    """
+    spec = spec or {}
+    if not isinstance(spec.get("item_format"), str):
+        raise ValueError(f"List format must have an item_format: {spec!r}")
+    return ListFormatter(spec["item_format"], str(spec.get("separator", "\n")), constants)
+
+
+def _coerce_number(value: Any) -> Any:
+    """Number from a value; strings accept "," as decimal mark"""
+    if isinstance(value, (int, float, Decimal)):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value.replace(",", ".").replace(" ", ""))
+        except ValueError:
+            return None
+    return None
+
+
+_DATE_FIELDS: Dict[str, Callable[[date, Sequence[str]], str]] = {
+    "d": lambda value, names: f"{value.day:02d}",
+    "-d": lambda value, names: str(value.day),
+    "m": lambda value, names: f"{value.month:02d}",
+    "Y": lambda value, names: str(value.year),
+    "B": lambda value, names: names[value.month - 1],
+}
+
+
+@lru_cache(maxsize=64)
+def _compile_output_format(fmt: str) -> Tuple[Tuple[Optional[str], str], ...]:
+    """Split a format into literal text and directives, once per format"""
+    pieces = []
+    for literal, directive in re.findall(r"([^%]*)(%-?[A-Za-z%]|$)", fmt):
+        if literal:
+            pieces.append((None, literal))
+        if directive == "%%":
+            pieces.append((None, "%"))
+        elif directive:
+            kind = directive[1:]
+            if kind not in _DATE_FIELDS:
+                raise ValueError(f"Unsupported date directive: {directive}")
+            pieces.append((kind, directive))
+    return tuple(pieces)
+
+
+@lru_cache(maxsize=4096)
+def _parse_cached(value: str, formats: Tuple[str, ...]) -> Optional[date]:
+    for matcher in _compile_formats(formats):
+        parsed = matcher(value)
+        if parsed is not None:
+            return parsed
+    return None
+
+
+@lru_cache(maxsize=32)
+def _compile_formats(formats: Tuple[str, ...]) -> Tuple[DateMatcher, ...]:
+    return tuple(_compile_format(fmt) for fmt in formats)
+
+
+def _compile_format(fmt: str) -> DateMatcher:
+    """Matcher for one strptime-style format / Matcher para un formato"""
+    parts = []
+    directive = False
+    for char in fmt:
+        if directive:
+            if char not in _DIRECTIVES:
+                raise ValueError(f"Unsupported date directive: %{char}")
+            parts.append(_DIRECTIVES[char])
+            directive = False
+        elif char == "%":
+            directive = True
+        elif char.isspace():
+            parts.append(r"\s+")
+        else:
+            parts.append(re.escape(char))
+    match = re.compile("".join(parts), re.IGNORECASE).fullmatch
+
+    def parse(value: str) -> Optional[date]:
+        found = match(value)
+        if found is None:
+            return None
+        groups = found.groupdict()
+        if "B" in groups:
+            month = _MONTH_NUMBERS.get(groups["B"].lower())
+            if month is None:
+                return None
+        else:
+            month = int(groups["m"])
+        try:
+            return date(int(groups["Y"]), month, int(groups["d"]))
+        except ValueError:
+            # Out of range for the month, as strptime reports it
+            return None
+    return parse
@@ -0,0 +1,372 @@
+"""
+Formula Engine - Safe compiler for derived field formulas
+Compilador seguro de formulas de campos derivados
+
+Grammar / Gramatica:
+    expr    := term (("+" | "-") term)*
+    term    := unary (("*" | "/") unary)*
+    unary   := "-" unary | primary
+    primary := NUMBER | STRING | true | false | null
+             | NAME "(" [expr ("," expr)*] ")" | NAME | "(" expr ")"
+
+Names are field names, with dots for nested paths. Formulas are parsed
+once into a small AST and compiled to closures; nothing is passed to eval.
+
+sum, count, min, max and avg aggregate a list field: "sum(lineas.importe)"
+adds the importe of every item of the list lineas. Compiled formulas take
+an optional dict of extracted columns, shared by the formulas of one
+context build so that each list is walked once.
+"""
+
+import re
+from decimal import Decimal
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from .dsl_evaluator import compile_path
+
+
+class FormulaError(Exception):
+    """Exception raised for invalid formulas"""
+    pass
+
+
+# AST nodes are tuples: ("num", value), ("str", value), ("const", value),
+# ("name", path), ("call", name, args), ("neg", operand), (op, left, right)
+Node = Tuple[Any, ...]
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<number>\d+\.\d*|\.\d+|\d+)
+      | (?P<string>'[^']*'|"[^"]*")
+      | (?P<name>[A-Za-z_][\w.]*)
+      | (?P<op>[-+*/(),])
+    )""", re.VERBOSE)
+
+_CONSTANTS = {"true": True, "false": False, "null": None, "none": None}
+
+
+def parse_formula(formula: str) -> Node:
+    """
+    Parse a formula into its AST / Parsear una formula en su AST
+
+    Raises:
+        FormulaError: If the formula is not valid
+    """
+    if not isinstance(formula, str) or not formula.strip():
+        raise FormulaError("Empty formula")
+    parser = _Parser(_tokenize(formula), formula)
+    node = parser.expr()
+    if parser.peek() is not None:
+        raise FormulaError(f"Unexpected '{parser.peek()[1]}' in formula: {formula}")
+    return node
+
+
+def compile_formula(formula: str, functions: Mapping[str, Callable[..., Any]]) -> Callable[..., Any]:
+    """
+    Compile a formula into a function of the context
+    Compilar una formula en una funcion del contexto
+
+    Arithmetic on values that are missing or not numeric gives None, as
+    does division by zero. Numeric strings are converted.
+
+    The compiled function is called as formula(context) or
+    formula(context, columns), where columns is a dict owned by the caller
+    in which list aggregates keep the columns they extract (see aggregate).
+
+    Args:
+        formula: Formula text, e.g. "extract_year(FF_Ejecicio) - 1"
+        functions: Functions callable from the formula, by name
+
+    Returns:
+        Callable taking the context (and columns) and returning the value
+
+    Raises:
+        FormulaError: If the formula is invalid or calls an unknown function
+    """
+    return _compile(parse_formula(formula), functions)
+
+
+def formula_names(node: Node) -> FrozenSet[str]:
+    """Field names read by a parsed formula / Campos leidos por una formula"""
+    kind = node[0]
+    if kind == "name":
+        return frozenset({node[1]})
+    if kind == "call":
+        return frozenset().union(*(formula_names(arg) for arg in node[2]))
+    if kind == "neg":
+        return formula_names(node[1])
+    if kind in _ARITHMETIC:
+        return formula_names(node[1]) | formula_names(node[2])
+    return frozenset()
+
+
+def formula_calls(node: Node) -> FrozenSet[str]:
+    """Function names called by a parsed formula / Funciones llamadas"""
+    kind = node[0]
+    if kind == "call":
+        return frozenset({node[1]}).union(*(formula_calls(arg) for arg in node[2]))
+    if kind == "neg":
+        return formula_calls(node[1])
+    if kind in _ARITHMETIC:
+        return formula_calls(node[1]) | formula_calls(node[2])
+    return frozenset()
+
+
+def _tokenize(formula: str) -> List[Tuple[str, str]]:
+    tokens = []
+    position = 0
+    end = len(formula.rstrip())
+    while position < end:
+        match = _TOKEN.match(formula, position)
+        if not match:
+            raise FormulaError(f"Invalid character at position {position} in formula: {formula}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser over the token list"""
+
+    def __init__(self, tokens: List[Tuple[str, str]], formula: str):
+        self.tokens = tokens
+        self.position = 0
+        self.formula = formula
+
+    def peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def take(self) -> Tuple[str, str]:
+        token = self.peek()
+        if token is None:
+            raise FormulaError(f"Unexpected end of formula: {self.formula}")
+        self.position += 1
+        return token
+
+    def expect(self, op: str) -> None:
+        token = self.take()
+        if token != ("op", op):
+            raise FormulaError(f"Expected '{op}' but found '{token[1]}' in formula: {self.formula}")
+
+    def expr(self) -> Node:
+        node = self.term()
+        while self.peek() in (("op", "+"), ("op", "-")):
+            node = (self.take()[1], node, self.term())
+        return node
+
+    def term(self) -> Node:
+        node = self.unary()
+        while self.peek() in (("op", "*"), ("op", "/")):
+            node = (self.take()[1], node, self.unary())
+        return node
+
+    def unary(self) -> Node:
+        if self.peek() == ("op", "-"):
+            self.take()
+            return ("neg", self.unary())
+        return self.primary()
+
+    def primary(self) -> Node:
+        kind, text = self.take()
+        if kind == "number":
+            return ("num", float(text) if "." in text else int(text))
+        if kind == "string":
+            return ("str", text[1:-1])
+        if kind == "name":
+            if self.peek() == ("op", "("):
+                return self.call(text)
+            if text.lower() in _CONSTANTS:
+                return ("const", _CONSTANTS[text.lower()])
+            return ("name", text)
+        if text == "(":
+            node = self.expr()
+            self.expect(")")
+            return node
+        raise FormulaError(f"Unexpected '{text}' in formula: {self.formula}")
+
+    def call(self, name: str) -> Node:
+        self.expect("(")
+        args: List[Node] = []
+        if self.peek() != ("op", ")"):
+            args.append(self.expr())
+            while self.peek() == ("op", ","):
+                self.take()
+                args.append(self.expr())
+        self.expect(")")
+        return ("call", name, tuple(args))
+
+
+def _compile(node: Node, functions: Mapping[str, Callable[..., Any]]) -> Callable[..., Any]:
+    kind = node[0]
+
+    if kind in ("num", "str", "const"):
+        value = node[1]
+        return lambda context, columns=None: value
+
+    if kind == "name":
+        path = node[1]
+        if "." not in path:
+            return lambda context, columns=None: context.get(path)
+        # The root is looked up with get(), so any mapping can be the context
+        root, rest = path.split(".", 1)
+        nested = compile_path(rest)
+        return lambda context, columns=None: context[path] if path in context else nested(context.get(root))
+
+    if kind == "call":
+        func = functions.get(node[1])
+        if func is None and node[1] in AGGREGATES:
+            return _compile_aggregate(node, functions)
+        if func is None:
+            raise FormulaError(f"Unknown function: {node[1]}")
+        args = tuple(_compile(arg, functions) for arg in node[2])
+        if len(args) == 1:
+            arg = args[0]
+            return lambda context, columns=None: func(arg(context, columns))
+        return lambda context, columns=None: func(*(a(context, columns) for a in args))
+
+    if kind == "neg":
+        operand = _compile(node[1], functions)
+
+        def negate(context: dict, columns: Optional[dict] = None) -> Any:
+            value = _number(operand(context, columns))
+            return None if value is None else -value
+        return negate
+
+    operation = _ARITHMETIC[kind]
+    left, right = _compile(node[1], functions), _compile(node[2], functions)
+
+    def arithmetic(context: dict, columns: Optional[dict] = None) -> Any:
+        a, b = _number(left(context, columns)), _number(right(context, columns))
+        if a is None or b is None:
+            return None
+        try:
+            return operation(a, b)
+        except (ArithmeticError, TypeError):
+            return None
+    return arithmetic
+
+
+def _compile_aggregate(node: Node, functions: Mapping[str, Callable[..., Any]]) -> Callable[..., Any]:
+    """Aggregate call: the argument is a list or a list.property path"""
+    name, args = node[1], node[2]
+    if len(args) != 1:
+        raise FormulaError(f"{name}() takes one list argument")
+
+    if args[0][0] != "name":
+        value = _compile(args[0], functions)
+        return lambda context, columns=None: aggregate(name, value(context, columns), "", columns)
+
+    path = args[0][1]
+    segments = path.split(".")
+
+    def aggregate_path(context: dict, columns: Optional[dict] = None) -> Any:
+        if path in context:
+            return aggregate(name, context[path], "", columns)
+        # The list is the first value on the path that is not a dict
+        value = context.get(segments[0])
+        index = 1
+        while index < len(segments) and isinstance(value, dict):
+            value = value.get(segments[index])
+            index += 1
+        return aggregate(name, value, ".".join(segments[index:]), columns)
+    return aggregate_path
+
+
+def aggregate(name: str, items: Any, item_path: str = "", columns: Optional[dict] = None) -> Any:
+    """
+    Aggregate a list field / Agregar un campo de lista
+
+    Values are read from each item with item_path (dot notation; empty for
+    a list of plain values). count counts the values that are set; sum,
+    min, max and avg use the numeric ones, numeric strings included. An
+    empty or missing list gives 0 for sum and count and None otherwise.
+
+    With columns, the values extracted from a list are kept there by list
+    identity, so other aggregates of the same list reuse them. The caller
+    owns the dict and drops it with the data it was built from; lists must
+    not change while it is in use.
+
+    Args:
+        name: "sum", "count", "min", "max" or "avg"
+        items: List (or tuple, or NumPy array) of dicts or values
+        item_path: Path of the value within each item
+        columns: Dict of extracted columns to reuse, or None
+
+    Returns:
+        Aggregated value
+    """
+    if NUMPY_AVAILABLE and isinstance(items, np.ndarray) and not item_path:
+        return _aggregate_array(name, items)
+    if not isinstance(items, (list, tuple)):
+        items = [] if items is None or item_path else [items]
+    if columns is None:
+        return AGGREGATES[name](_column(items, item_path))
+
+    key = (id(items), item_path)
+    entry = columns.get(key)
+    # The entry holds the list, so its id cannot be reused meanwhile
+    if entry is None or entry[0] is not items:
+        entry = columns[key] = (items, _column(items, item_path))
+    return AGGREGATES[name](entry[1])
+
+
+def _column(items: Any, item_path: str) -> Tuple[List[Any], List[Any]]:
+    """Values set and numeric values of a list, in one pass"""
+    values = items if not item_path else list(map(compile_path(item_path), items))
+    present = [value for value in values if value is not None]
+    numbers = [number for number in map(_number, present) if number is not None]
+    return present, numbers
+
+
+def _aggregate_array(name: str, array: Any) -> Any:
+    if name == "count":
+        return int(array.size)
+    if not array.size:
+        return 0 if name == "sum" else None
+    reduce = {"sum": np.sum, "min": np.min, "max": np.max, "avg": np.mean}[name]
+    return reduce(array).item()
+
+
+def _avg(numbers: List[Any]) -> Any:
+    return sum(numbers) / len(numbers) if numbers else None
+
+
+# Aggregate functions over (values set, numeric values) of a list
+AGGREGATES: Dict[str, Callable[[Tuple[List[Any], List[Any]]], Any]] = {
+    "sum": lambda column: sum(column[1]),
+    "count": lambda column: len(column[0]),
+    "min": lambda column: min(column[1]) if column[1] else None,
+    "max": lambda column: max(column[1]) if column[1] else None,
+    "avg": lambda column: _avg(column[1]),
+}
+
+
+_ARITHMETIC: Dict[str, Callable[[Any, Any], Any]] = {
+    "+": lambda a, b: a + b,
+    "-": lambda a, b: a - b,
+    "*": lambda a, b: a * b,
+    "/": lambda a, b: a / b,
+}
+
+
+def _number(value: Any) -> Any:
+    """Numeric value of an operand, None if it has none"""
+    if isinstance(value, (int, float, Decimal)):
+        return value
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            return int(text)
+        except ValueError:
+            try:
+                return float(text)
+            except ValueError:
+                return None
+    return None
@@ -13,7 +13,10 @@ import time
 from .plugin_loader import load_plugin, PluginPack
 from .contract_validator import validate_input, ValidationResult
 from .renderer_docx import DocxRenderer
-from .rule_engine import EvaluationTrace
+from .rule_engine import EvaluationTrace, CompactTrace
+from .input_normalizer import normalize_record, normalize_records, parse_date_value
+from .layered_context import ContextStats
+from .trace_store import TraceStore
 
 
 @dataclass
@@ -26,6 +29,9 @@ class GenerationResult:
     evaluation_traces: List[EvaluationTrace] = field(default_factory=list)
     error: Optional[str] = None
     duration_ms: int = 0
+    plugin_fingerprint: Optional[str] = None
+    compact_trace: Optional[CompactTrace] = None
+    context_stats: Optional[ContextStats] = None
 
 
 def generate(
@@ -34,7 +40,9 @@ def generate(
     output_dir: Path = Path("output"),
     template_path: Optional[Path] = None,
     should_validate: bool = True,
-    filename_prefix: Optional[str] = None
+    filename_prefix: Optional[str] = None,
+    trace_level: str = "full",
+    trace_store: Optional[TraceStore] = None
 ) -> GenerationResult:
     """
     Unified entry point for document generation
@@ -47,19 +55,46 @@ def generate(
         template_path: Optional custom template path
         should_validate: Whether to validate input before generation
         filename_prefix: Optional prefix for output filename
+        trace_level: "full" (evaluation_traces), "compact" (compact_trace) or "off"
+        trace_store: Optional TraceStore where the result is logged
 
     Returns:
         GenerationResult with success status and details
     """
+    result = _generate(plugin_id, data, output_dir, template_path, should_validate, filename_prefix, trace_level)
+    if trace_store is not None:
+        trace_store.record(result, data, plugin_id)
+    return result
+
+
+def _generate(
+    plugin_id: str,
+    data: dict,
+    output_dir: Path,
+    template_path: Optional[Path],
+    should_validate: bool,
+    filename_prefix: Optional[str],
+    trace_level: str,
+    preprocessed: bool = False
+) -> GenerationResult:
+    """
+    Generation without trace logging / Generacion sin registro de trazas
+
+    preprocessed skips preprocess_input, for records already normalized
+    as a batch.
+    """
     start_time = time.time()
     trace_id = str(uuid.uuid4())
+    fingerprint = None
 
     try:
         # 1. Load plugin
         plugin = load_plugin(plugin_id)
+        fingerprint = plugin.fingerprint
 
         # 2. Preprocess input
-        data = preprocess_input(data, plugin)
+        if not preprocessed:
+            data = preprocess_input(data, plugin)
 
         # 3. Validate (optional)
         if should_validate:
@@ -73,7 +108,8 @@ def generate(
                     validation_errors=error_messages,
                     evaluation_traces=[],
                     error="Validation failed / Validacion fallida",
-                    duration_ms=int((time.time() - start_time) * 1000)
+                    duration_ms=int((time.time() - start_time) * 1000),
+                    plugin_fingerprint=fingerprint
                 )
 
         # 4. Render document
@@ -91,16 +127,20 @@ def generate(
         output_path = output_dir / filename
 
         # Render
-        output_path, traces = renderer.render(data, output_path, template_path)
+        output_path, traces = renderer.render(data, output_path, template_path, trace_level)
+        compact_trace = traces if isinstance(traces, CompactTrace) else None
 
         return GenerationResult(
             success=True,
             output_path=output_path,
             trace_id=trace_id,
             validation_errors=[],
-            evaluation_traces=traces,
+            evaluation_traces=traces if compact_trace is None else [],
             error=None,
-            duration_ms=int((time.time() - start_time) * 1000)
+            duration_ms=int((time.time() - start_time) * 1000),
+            plugin_fingerprint=fingerprint,
+            compact_trace=compact_trace,
+            context_stats=renderer.last_context_stats
         )
 
     except FileNotFoundError as e:
@@ -111,7 +151,8 @@ def generate(
             validation_errors=[],
             evaluation_traces=[],
             error=f"Template not found / Plantilla no encontrada: {e}",
-            duration_ms=int((time.time() - start_time) * 1000)
+            duration_ms=int((time.time() - start_time) * 1000),
+            plugin_fingerprint=fingerprint
         )
 
     except Exception as e:
@@ -122,8 +163,92 @@ def generate(
             validation_errors=[],
             evaluation_traces=[],
             error=str(e),
-            duration_ms=int((time.time() - start_time) * 1000)
+            duration_ms=int((time.time() - start_time) * 1000),
+            plugin_fingerprint=fingerprint
+        )
+
+
+def generate_batch(
+    plugin_id: str,
+    records: List[dict],
+    output_dir: Path = Path("output"),
+    template_path: Optional[Path] = None,
+    should_validate: bool = True,
+    filename_prefix: str = "Carta_Manifestacion",
+    trace_level: str = "compact",
+    trace_store: Optional[TraceStore] = None
+) -> List[GenerationResult]:
+    """
+    Generate one document per input record
+    Generar un documento por cada registro de entrada
+
+    Traces default to "compact" so large batches do not keep a RuleHit per
+    rule and record; CompactTrace.expand() rebuilds them when needed.
+    Output files are named <filename_prefix>_<trace id>.docx. Records are
+    normalized together (see normalize_records), so the date format of
+    each column is detected once for the whole batch.
+
+    Args:
+        plugin_id: ID of the plugin to use
+        records: Input data dictionaries
+        output_dir: Directory for output files
+        template_path: Optional custom template path
+        should_validate: Whether to validate each record before generation
+        filename_prefix: Prefix for output filenames
+        trace_level: "compact" (default), "full" or "off"
+        trace_store: Optional TraceStore where every result is logged (flushed
+            at the end of the batch)
+
+    Returns:
+        One GenerationResult per record, in order
+    """
+    try:
+        normalized = normalize_records(load_plugin(plugin_id), records)
+    except Exception:
+        # Each record reports the error through generate()
+        return _generate_each(plugin_id, records, output_dir, template_path, should_validate,
+                              filename_prefix, trace_level, trace_store)
+
+    results = []
+    for record, data in zip(records, normalized):
+        result = _generate(plugin_id, data, output_dir, template_path, should_validate,
+                           filename_prefix, trace_level, preprocessed=True)
+        if trace_store is not None:
+            # Logged with the raw record, as generate() does
+            trace_store.record(result, record, plugin_id)
+        results.append(result)
+    if trace_store is not None:
+        trace_store.flush()
+    return results
+
+
+def _generate_each(
+    plugin_id: str,
+    records: List[dict],
+    output_dir: Path,
+    template_path: Optional[Path],
+    should_validate: bool,
+    filename_prefix: str,
+    trace_level: str,
+    trace_store: Optional[TraceStore]
+) -> List[GenerationResult]:
+    """One generate() call per record / Una llamada a generate() por registro"""
+    results = [
+        generate(
+            plugin_id=plugin_id,
+            data=record,
+            output_dir=output_dir,
+            template_path=template_path,
+            should_validate=should_validate,
+            filename_prefix=filename_prefix,
+            trace_level=trace_level,
+            trace_store=trace_store
         )
+        for record in records
+    ]
+    if trace_store is not None:
+        trace_store.flush()
+    return results
 
 
 def preprocess_input(data: dict, plugin: PluginPack) -> dict:
@@ -136,69 +261,9 @@ def preprocess_input(data: dict, plugin: PluginPack) -> dict:
         plugin: PluginPack instance
 
     Returns:
-        Preprocessed data dictionary
+        Preprocessed data dictionary (see normalize_record)
     """
-    fields = plugin.fields.get("fields", {})
-    result = dict(data)
-
-    for field_name, spec in fields.items():
-        if field_name not in result:
-            continue
-
-        value = result[field_name]
-        field_type = spec.get("type")
-
-        # Date string conversion
-        if field_type == "date" and isinstance(value, str):
-            parsed = parse_date_value(value)
-            if parsed:
-                result[field_name] = parsed
-
-        # Integer conversion
-        elif field_type == "int" and isinstance(value, str):
-            try:
-                result[field_name] = int(value.replace(",", "").replace(".", ""))
-            except ValueError:
-                pass
-
-        # Currency conversion
-        elif field_type == "currency" and isinstance(value, str):
-            try:
-                clean_value = value.replace(",", "").replace(".", "").replace(" ", "").replace("EUR", "").replace("€", "")
-                result[field_name] = int(clean_value)
-            except ValueError:
-                pass
-
-        # Boolean conversion
-        elif field_type == "bool":
-            if isinstance(value, str):
-                result[field_name] = value.lower() in ('true', 'si', 'yes', '1', 'sí')
-            elif isinstance(value, (int, float)):
-                result[field_name] = bool(value)
-
-    return result
-
-
-def parse_date_value(value: str) -> Optional[date]:
-    """Parse date from string / Parsear fecha desde string"""
-    if not value:
-        return None
-
-    formats = [
-        "%d/%m/%Y",
-        "%Y-%m-%d",
-        "%d-%m-%Y",
-        "%Y/%m/%d",
-        "%d.%m.%Y",
-    ]
-
-    for fmt in formats:
-        try:
-            return datetime.strptime(value, fmt).date()
-        except ValueError:
-            continue
-
-    return None
+    return normalize_record(plugin, data)
 
 
 def generate_from_form(
@@ -206,7 +271,8 @@ def generate_from_form(
     form_data: dict,
     list_data: dict,
     output_dir: Path = Path("output"),
-    template_path: Optional[Path] = None
+    template_path: Optional[Path] = None,
+    trace_store: Optional[TraceStore] = None
 ) -> GenerationResult:
     """
     Generate document from Streamlit form data
@@ -221,6 +287,7 @@ def generate_from_form(
         list_data: List field values (like lista_alto_directores)
         output_dir: Output directory
         template_path: Optional template path
+        trace_store: Optional TraceStore where the result is logged
 
     Returns:
         GenerationResult
@@ -243,5 +310,6 @@ def generate_from_form(
         plugin_id=plugin_id,
         data=data,
         output_dir=output_dir,
-        template_path=template_path
+        template_path=template_path,
+        trace_store=trace_store
     )
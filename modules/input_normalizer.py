@@ -0,0 +1,148 @@
+"""
+Input Normalizer - One-time canonicalization of input records by field type
+Normalizacion unica de registros de entrada segun el tipo de campo
+"""
+
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional
+
+from .formatters import NUMERIC_DATE_FORMATS, parse_date, parse_date_column
+from .plugin_loader import PluginPack
+
+
+# Strings accepted as True for bool fields; anything else is False
+TRUE_WORDS = frozenset({"true", "si", "sí", "yes", "1"})
+
+
+def normalize_record(plugin: PluginPack, data: dict) -> dict:
+    """
+    Canonicalize a record using the field types in fields.yaml
+    Canonicalizar un registro usando los tipos de campo de fields.yaml
+
+    Booleans become bool, dates become date, int/currency strings become
+    int and enum values are matched case-insensitively to their declared
+    spelling. Values that cannot be converted are left unchanged so that
+    validation can report them. Keys not declared as fields are copied as is.
+
+    Args:
+        plugin: PluginPack instance
+        data: Raw input data
+
+    Returns:
+        New dictionary with canonical values
+    """
+    normalizers = plugin.get_artifact("field_normalizers", lambda: _build_normalizers(plugin))
+    result = dict(data)
+    for field_name, value in data.items():
+        normalize = normalizers.get(field_name)
+        if normalize is not None:
+            result[field_name] = normalize(value)
+    return result
+
+
+def normalize_records(plugin: PluginPack, records: List[dict]) -> List[dict]:
+    """
+    Canonicalize many records, parsing each date field as a column
+    Canonicalizar muchos registros, parseando cada campo fecha como columna
+
+    Same result as normalize_record on each record; the date format of a
+    column is detected once and tried first for every record.
+
+    Args:
+        plugin: PluginPack instance
+        records: Raw input records
+
+    Returns:
+        New dictionaries with canonical values, in order
+    """
+    normalizers = plugin.get_artifact("field_normalizers", lambda: _build_normalizers(plugin))
+    results = [dict(record) for record in records]
+    for field_name, normalize in normalizers.items():
+        rows = [row for row in results if field_name in row]
+        if normalize is _normalize_date:
+            rows = [row for row in rows if isinstance(row[field_name], str)]
+            parsed = parse_date_column([row[field_name] for row in rows], NUMERIC_DATE_FORMATS)
+            for row, value in zip(rows, parsed):
+                if value:
+                    row[field_name] = value
+        else:
+            for row in rows:
+                row[field_name] = normalize(row[field_name])
+    return results
+
+
+def _build_normalizers(plugin: PluginPack) -> Dict[str, Callable[[Any], Any]]:
+    """Conversion function per typed field / Funcion de conversion por campo"""
+    normalizers = {}
+    for field_name, spec in plugin.fields.get("fields", {}).items():
+        field_type = spec.get("type")
+        if field_type == "enum":
+            normalizers[field_name] = _enum_normalizer(spec)
+        elif field_type in _TYPE_NORMALIZERS:
+            normalizers[field_name] = _TYPE_NORMALIZERS[field_type]
+    return normalizers
+
+
+def _normalize_bool(value: Any) -> Any:
+    if value.__class__ is bool:
+        return value
+    if isinstance(value, str):
+        return value.strip().lower() in TRUE_WORDS
+    if isinstance(value, (int, float)):
+        return bool(value)
+    return value
+
+
+def _normalize_date(value: Any) -> Any:
+    if isinstance(value, str):
+        parsed = parse_date_value(value)
+        if parsed:
+            return parsed
+    return value
+
+
+def _normalize_int(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return int(value.replace(",", "").replace(".", ""))
+        except ValueError:
+            pass
+    return value
+
+
+def _normalize_currency(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            clean_value = value.replace(",", "").replace(".", "").replace(" ", "").replace("EUR", "").replace("€", "")
+            return int(clean_value)
+        except ValueError:
+            pass
+    return value
+
+
+def _enum_normalizer(spec: dict) -> Callable[[Any], Any]:
+    """Match enum values ignoring case and surrounding spaces"""
+    canonical: Dict[str, Any] = {}
+    for option in spec.get("values", []):
+        value = option.get("value") if isinstance(option, dict) else option
+        if isinstance(value, str):
+            canonical.setdefault(value.strip().lower(), value)
+
+    def normalize(value: Any) -> Any:
+        if isinstance(value, str):
+            return canonical.get(value.strip().lower(), value)
+        return value
+    return normalize
+
+
+_TYPE_NORMALIZERS: Dict[str, Callable[[Any], Any]] = {
+    "bool": _normalize_bool,
+    "date": _normalize_date,
+    "int": _normalize_int,
+    "currency": _normalize_currency,
+}
+
+
+def parse_date_value(value: str) -> Optional[date]:
+    """Parse date from string / Parsear fecha desde string"""
+    return parse_date(value, NUMERIC_DATE_FORMATS)
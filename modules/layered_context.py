@@ -0,0 +1,138 @@
+"""
+Layered Context - Template context as layers over the input data
+Contexto de plantilla en capas sobre los datos de entrada
+
+The context of a letter is a stack of layers searched from the top:
+
+    overrides     values set after the context is built (visibility, ...)
+    conditionals  si/no of the bool fields, computed on first access
+    texts         text blocks library
+    formatted     formatted values, computed on first access
+    derived       derived fields, computed on first access
+    input         the (normalized) input data, never copied or modified
+
+None values read as "" instead of being rewritten by a pass over the
+whole context. A renderer that looks up only the placeholders of its
+template computes only those values.
+"""
+
+from collections import ChainMap
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Mapping
+
+
+@dataclass
+class ContextStats:
+    """Lazy context keys computed and skipped / Claves calculadas y omitidas"""
+    computed: int = 0
+    skipped: int = 0
+
+
+class LazyValueError(Exception):
+    """Error raised while computing a lazy context value"""
+
+
+# Value of a thunk whose key turns out not to be set
+ABSENT = object()
+
+
+class LazyLayer(Mapping):
+    """
+    Mapping whose values are computed on first access and then kept
+    Mapping cuyos valores se calculan en el primer acceso
+
+    Keys are known up front; only the values are deferred. In an optional
+    layer a thunk may return ABSENT, and its key then reads as missing
+    (a ChainMap above falls through to the layers below), so checks such
+    as "is the input value set" are deferred too; iterating an optional
+    layer computes every value to leave those keys out.
+
+    A KeyError raised while computing a value is re-raised as
+    LazyValueError, so that a ChainMap above does not take it for a
+    missing key and silently read the layers below.
+    """
+
+    def __init__(self, thunks: Dict[str, Callable[[], Any]], optional: bool = False):
+        self._thunks = thunks
+        self._values: Dict[str, Any] = {}
+        self._optional = optional
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            value = self._values[key]
+        except KeyError:
+            value = self._compute(key)
+        if value is ABSENT:
+            raise KeyError(key)
+        return value
+
+    def _compute(self, key: str) -> Any:
+        thunk = self._thunks[key]
+        try:
+            value = thunk()
+        except KeyError as e:
+            raise LazyValueError(f"Computing '{key}' failed: KeyError {e}") from e
+        self._values[key] = value
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        if key not in self._thunks:
+            return False
+        if not self._optional:
+            return True
+        value = self._values[key] if key in self._values else self._compute(key)
+        return value is not ABSENT
+
+    def __iter__(self) -> Iterator[str]:
+        if not self._optional:
+            return iter(self._thunks)
+        return (key for key in list(self._thunks) if key in self)
+
+    def __len__(self) -> int:
+        if not self._optional:
+            return len(self._thunks)
+        return sum(1 for key in self._thunks if key in self)
+
+    @property
+    def computed(self) -> int:
+        """Number of values computed so far / Valores calculados"""
+        return len(self._values)
+
+    @property
+    def skipped(self) -> int:
+        """Number of values not computed so far / Valores sin calcular"""
+        return len(self._thunks) - len(self._values)
+
+
+class LayeredContext(ChainMap):
+    """
+    Template context over a stack of layers
+    Contexto de plantilla sobre una pila de capas
+
+    A ChainMap whose lookups return "" for None. Writes go to the first
+    layer, so the layers below (including the input data) are never
+    modified.
+    """
+
+    def __getitem__(self, key: str) -> Any:
+        value = super().__getitem__(key)
+        return "" if value is None else value
+
+    def stats(self) -> ContextStats:
+        """
+        Keys of the lazy layers computed so far and never read
+        Claves de las capas perezosas calculadas y nunca leidas
+        """
+        stats = ContextStats()
+        for layer in self.maps:
+            if isinstance(layer, LazyLayer):
+                stats.computed += layer.computed
+                stats.skipped += layer.skipped
+        return stats
+
+    def add_layer(self, layer: Mapping[str, Any]) -> None:
+        """
+        Add a layer right below the writes, above every other layer
+        Anadir una capa justo debajo de las escrituras
+        """
+        self.maps.insert(1, layer)
@@ -3,11 +3,36 @@ Plugin Loader - Configuration loader with LRU cache
 Cargador de plugins con cache LRU
 """
 
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
 from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable, Iterable, List, Optional, Tuple
+import hashlib
+import io
+import threading
+import time
 import yaml
 
+from .dsl_evaluator import DSLEvaluationError, compile_condition
+from .formatters import compile_list_format, compile_number_format
+from .formula_engine import FormulaError, compile_formula
+
+
+# YAML files that make up a plugin / Archivos YAML que componen un plugin
+PLUGIN_FILES = (
+    "manifest.yaml", "config.yaml", "fields.yaml", "texts.yaml", "tables.yaml",
+    "logic.yaml", "decision_map.yaml", "derived.yaml", "formatting.yaml",
+)
+
+# Loaded plugins shared by every caller / Plugins cargados compartidos
+_PLUGIN_REGISTRY: Dict[str, "PluginPack"] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+class PluginLoadError(Exception):
+    """Exception raised when a plugin cannot be loaded or is invalid"""
+    pass
+
 
 class PluginPack:
     """Lazy-loading configuration container / Contenedor de configuracion con carga perezosa"""
@@ -19,6 +44,10 @@ class PluginPack:
         else:
             self.base_path = Path(__file__).parent.parent / "config" / "yamls" / plugin_id
         self._cache: Dict[str, dict] = {}
+        self._sources: Dict[str, Optional[bytes]] = {}
+        self._template_bytes: Optional[bytes] = None
+        self._fingerprint: Optional[str] = None
+        self._artifacts: Dict[str, Any] = {}
 
     @property
     def manifest(self) -> dict:
@@ -65,11 +94,49 @@ class PluginPack:
         """Formatting rules"""
         return self._load("formatting.yaml")
 
+    @property
+    def fingerprint(self) -> str:
+        """
+        Content hash of all YAML files and the template
+        Hash del contenido de todos los YAML y la plantilla
+
+        Identifies exactly which configuration produced a document, whether or
+        not the manifest version was bumped. It hashes the bytes this pack
+        loaded, not the files on disk, so edits made after loading do not
+        change it until the plugin is reloaded. Computed once per pack.
+        """
+        if self._fingerprint is None:
+            self._fingerprint = self._compute_fingerprint()
+        return self._fingerprint
+
+    def _compute_fingerprint(self) -> str:
+        """Hash the loaded files in a stable order / Hash de archivos cargados en orden estable"""
+        sources = []
+        for filename in PLUGIN_FILES:
+            self._load(filename)
+            sources.append((filename, self._sources[filename]))
+        try:
+            sources.append(("template", self.get_template_bytes()))
+        except FileNotFoundError:
+            sources.append(("template", None))
+
+        digest = hashlib.sha256()
+        for name, content in sources:
+            digest.update(name.encode("utf-8") + b"\0")
+            if content is None:
+                digest.update(b"<missing>\0")
+                continue
+            digest.update(len(content).to_bytes(8, "big"))
+            digest.update(content)
+
+        return digest.hexdigest()
+
     def _load(self, filename: str) -> dict:
-        """Load a YAML file with caching"""
+        """Load a YAML file with caching, keeping the bytes it was parsed from"""
         if filename not in self._cache:
-            file_path = self.base_path / filename
-            self._cache[filename] = load_yaml_file(file_path)
+            content, data = _read_yaml_file(self.base_path / filename)
+            self._sources[filename] = content
+            self._cache[filename] = data
         return self._cache[filename]
 
     def get_template_path(self) -> Path:
@@ -82,6 +149,31 @@ class PluginPack:
         # Default path
         return Path(__file__).parent.parent / "config" / "templates" / self.plugin_id / "template.docx"
 
+    def get_template_bytes(self) -> bytes:
+        """Get the Word template contents, read once / Contenido de la plantilla, leido una vez"""
+        if self._template_bytes is None:
+            self._template_bytes = self.get_template_path().read_bytes()
+        return self._template_bytes
+
+    def get_artifact(self, key: str, builder: Callable[[], Any]) -> Any:
+        """
+        Get a compiled artifact, building it on first use
+        Obtener un artefacto compilado, construyendolo en el primer uso
+
+        Compiled rules, conditions and formulas live on the plugin so they are
+        shared by every engine built from it and replaced with it on reload.
+        """
+        artifact = self._artifacts.get(key)
+        if artifact is None:
+            artifact = self._artifacts.setdefault(key, builder())
+        return artifact
+
+    def preload(self) -> None:
+        """Load every YAML file and the template up front / Cargar todo por adelantado"""
+        for filename in PLUGIN_FILES:
+            self._load(filename)
+        self.get_template_bytes()
+
     def get_oficinas(self) -> dict:
         """Get office configurations"""
         return self.config.get("oficinas", {})
@@ -102,23 +194,136 @@ class PluginPack:
     def clear_cache(self):
         """Clear the internal cache"""
         self._cache.clear()
+        self._sources.clear()
+        self._template_bytes = None
+        self._fingerprint = None
+        self._artifacts.clear()
 
 
-@lru_cache(maxsize=32)
 def load_yaml_file(path: Path) -> dict:
     """Cached YAML file loading / Carga de archivo YAML con cache"""
+    return _read_yaml_file(path)[1]
+
+
+def _read_yaml_file(path: Path) -> Tuple[Optional[bytes], dict]:
+    """Bytes and parsed contents of a YAML file; (None, {}) if missing"""
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f) or {}
+        content = Path(path).read_bytes()
     except FileNotFoundError:
-        return {}
+        return None, {}
+    # The content is the cache key, so an edit that keeps the file's mtime
+    # and size is still picked up; only the parse is cached
+    return content, _parse_yaml_cached(Path(path), content)
+
+
+@lru_cache(maxsize=32)
+def _parse_yaml_cached(path: Path, content: bytes) -> dict:
+    """Parse the contents of a YAML file / Parsear el contenido de un YAML"""
+    try:
+        return yaml.safe_load(content.decode("utf-8")) or {}
     except yaml.YAMLError as e:
         raise ValueError(f"Error parsing YAML file {path}: {e}")
 
 
+def file_signature(plugin: PluginPack) -> Dict[str, Tuple[int, int]]:
+    """
+    Get (mtime_ns, size) for every plugin file and the template
+    Obtener (mtime_ns, tamano) de cada archivo del plugin y de la plantilla
+
+    Args:
+        plugin: PluginPack instance
+
+    Returns:
+        Dictionary mapping file path to its signature (missing files are omitted)
+    """
+    paths = [plugin.base_path / filename for filename in PLUGIN_FILES]
+    paths.append(plugin.get_template_path())
+
+    signature = {}
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        signature[str(path)] = (stat.st_mtime_ns, stat.st_size)
+    return signature
+
+
+def file_hashes(plugin: PluginPack) -> Dict[str, str]:
+    """
+    Get the SHA-256 of every plugin file and the template
+    Obtener el SHA-256 de cada archivo del plugin y de la plantilla
+
+    Catches the edits file_signature misses: a rewrite within the mtime
+    resolution of the file system that keeps the size.
+
+    Args:
+        plugin: PluginPack instance
+
+    Returns:
+        Dictionary mapping file path to its hex digest (missing files are omitted)
+    """
+    paths = [plugin.base_path / filename for filename in PLUGIN_FILES]
+    paths.append(plugin.get_template_path())
+
+    hashes = {}
+    for path in paths:
+        try:
+            content = path.read_bytes()
+        except FileNotFoundError:
+            continue
+        hashes[str(path)] = hashlib.sha256(content).hexdigest()
+    return hashes
+
+
 def load_plugin(plugin_id: str) -> PluginPack:
     """Load a plugin by ID / Cargar un plugin por ID"""
-    return PluginPack(plugin_id)
+    plugin = _PLUGIN_REGISTRY.get(plugin_id)
+    if plugin is None:
+        with _REGISTRY_LOCK:
+            plugin = _PLUGIN_REGISTRY.setdefault(plugin_id, PluginPack(plugin_id))
+    return plugin
+
+
+def register_plugin(plugin: PluginPack) -> None:
+    """
+    Make a plugin instance the one returned by load_plugin()
+    Registrar la instancia que devolvera load_plugin()
+
+    Callers holding the previous instance keep using it until they finish.
+    """
+    with _REGISTRY_LOCK:
+        _PLUGIN_REGISTRY[plugin.plugin_id] = plugin
+
+
+def reload_plugin(plugin_id: str) -> PluginPack:
+    """
+    Rebuild a plugin from disk and swap it into the registry
+    Reconstruir un plugin desde disco y sustituirlo en el registro
+
+    The new instance is fully loaded and validated before the swap, so a
+    broken edit leaves the previous version in service.
+
+    Args:
+        plugin_id: ID of the plugin to reload
+
+    Returns:
+        The newly registered PluginPack
+
+    Raises:
+        PluginLoadError: If the edited plugin fails to load or validate
+    """
+    current = _PLUGIN_REGISTRY.get(plugin_id)
+    base_path = current.base_path if current is not None else None
+    try:
+        plugin, _ = _prewarm_one(plugin_id, base_path)
+    except PluginLoadError:
+        raise
+    except Exception as e:
+        raise PluginLoadError(f"{plugin_id}: {e}") from e
+
+    register_plugin(plugin)
+    return plugin
 
 
 def list_available_plugins() -> list:
@@ -127,3 +332,199 @@ def list_available_plugins() -> list:
     if not plugins_dir.exists():
         return []
     return [d.name for d in plugins_dir.iterdir() if d.is_dir()]
+
+
+def validate_plugin(plugin: PluginPack) -> List[str]:
+    """
+    Check a plugin for configuration errors
+    Comprobar un plugin en busca de errores de configuracion
+
+    Args:
+        plugin: PluginPack instance
+
+    Returns:
+        List of error messages (empty if the plugin is valid)
+    """
+    errors = []
+
+    manifest = plugin.manifest
+    if not manifest:
+        errors.append("manifest.yaml is empty or missing")
+    for key in ("plugin_id", "version", "name"):
+        if manifest and key not in manifest:
+            errors.append(f"Manifest missing required field: {key}")
+
+    template_path = plugin.get_template_path()
+    if not template_path.exists():
+        errors.append(f"Template not found at: {template_path}")
+    else:
+        errors.extend(_check_template(plugin))
+
+    rules = plugin.logic.get("rules") or {}
+    for rule_id, rule in rules.items():
+        if not isinstance(rule, dict):
+            errors.append(f"Rule '{rule_id}' is empty or not a mapping")
+            continue
+        errors.extend(f"Rule '{rule_id}': {e}" for e in _check_condition(rule.get("condition")))
+
+    for decision_id, decision in (plugin.decision_map.get("decisions") or {}).items():
+        if not isinstance(decision, dict):
+            errors.append(f"Decision '{decision_id}' is empty or not a mapping")
+            continue
+        for rule_id in decision.get("rules") or []:
+            if rule_id not in rules:
+                errors.append(f"Decision '{decision_id}' references unknown rule: {rule_id}")
+
+    for field_name, spec in (plugin.fields.get("fields") or {}).items():
+        if not isinstance(spec, dict):
+            errors.append(f"Field '{field_name}' is empty or not a mapping")
+            continue
+        for key in ("condition", "editable_when"):
+            errors.extend(f"Field '{field_name}' {key}: {e}" for e in _check_condition(spec.get(key)))
+
+    # Imported here: the context builder depends on this module
+    from .context_builder import FORMULA_FUNCTIONS, build_derived_graph
+    formula_errors = []
+    for field_name, spec in plugin.derived.get("derived_fields", {}).items():
+        try:
+            compile_formula(spec.get("formula", ""), FORMULA_FUNCTIONS)
+        except FormulaError as e:
+            formula_errors.append(f"Derived field '{field_name}': {e}")
+    if not formula_errors:
+        try:
+            build_derived_graph(plugin)
+        except FormulaError as e:
+            formula_errors.append(str(e))
+    errors.extend(formula_errors)
+
+    for name, spec in (plugin.formatting.get("number_formats") or {}).items():
+        try:
+            compile_number_format(spec)
+        except (TypeError, ValueError) as e:
+            errors.append(f"Number format '{name}': {e}")
+
+    for name, spec in (plugin.tables.get("output_format") or {}).items():
+        try:
+            compile_list_format(spec)
+        except (AttributeError, ValueError) as e:
+            errors.append(f"Output format '{name}': {e}")
+
+    return errors
+
+
+def _check_template(plugin: PluginPack) -> List[str]:
+    """Check that the template opens as a Word document / Comprobar que la plantilla abre"""
+    # Imported here: python-docx is only needed to open templates
+    from docx import Document
+    try:
+        Document(io.BytesIO(plugin.get_template_bytes()))
+    except Exception as e:
+        # python-docx raises zip, XML and package errors alike
+        return [f"Template is not a valid Word document: {plugin.get_template_path()} ({e})"]
+    return []
+
+
+def _check_condition(condition: Optional[dict]) -> List[str]:
+    """Check that a DSL condition compiles / Comprobar que una condicion DSL compila"""
+    try:
+        compile_condition(condition)
+    except DSLEvaluationError as e:
+        return [str(e)]
+    return []
+
+
+def prewarm_plugins(ids: Optional[Iterable[str]] = None, workers: int = 4) -> Dict[str, float]:
+    """
+    Load and validate plugins at service start
+    Cargar y validar plugins al arrancar el servicio
+
+    The YAML files and template of each plugin are read in a thread pool,
+    where the reads overlap. Validation and compilation of rules and
+    conditions are pure Python and would only contend for the GIL in
+    threads (and compiled closures cannot be returned from worker
+    processes), so they run afterwards in the calling thread: startup
+    takes the slowest read plus the sum of the compile times. The first
+    failed read cancels the reads not yet started. The result is
+    registered for load_plugin().
+
+    Args:
+        ids: Plugin IDs to prewarm (all available plugins if None)
+        workers: Maximum number of threads reading files
+
+    Returns:
+        Dictionary mapping plugin ID to load time in milliseconds
+
+    Raises:
+        PluginLoadError: On the first plugin that fails to load or validate
+    """
+    plugin_ids = list(ids) if ids is not None else list_available_plugins()
+    if not plugin_ids:
+        return {}
+
+    timings: Dict[str, float] = {}
+    read: Dict[str, PluginPack] = {}
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(workers, len(plugin_ids))))
+    try:
+        futures = {executor.submit(_read_plugin, pid): pid for pid in plugin_ids}
+        done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+
+        for future in done:
+            error = future.exception()
+            if error is not None:
+                raise PluginLoadError(f"{futures[future]}: {error}") from error
+            plugin, elapsed_ms = future.result()
+            read[plugin.plugin_id] = plugin
+            timings[plugin.plugin_id] = elapsed_ms
+    finally:
+        # On the first failure, reads not yet started are dropped and the
+        # error is raised without waiting for the running ones
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    loaded: Dict[str, PluginPack] = {}
+    for pid in plugin_ids:
+        try:
+            timings[pid] = round(timings[pid] + _compile_plugin(read[pid]), 2)
+        except Exception as error:
+            raise PluginLoadError(f"{pid}: {error}") from error
+        loaded[pid] = read[pid]
+
+    with _REGISTRY_LOCK:
+        _PLUGIN_REGISTRY.update(loaded)
+
+    return {pid: timings[pid] for pid in plugin_ids}
+
+
+def _prewarm_one(plugin_id: str, base_path: Optional[Path] = None) -> Tuple[PluginPack, float]:
+    """Load and validate a single plugin / Cargar y validar un plugin"""
+    plugin, read_ms = _read_plugin(plugin_id, base_path)
+    return plugin, round(read_ms + _compile_plugin(plugin), 2)
+
+
+def _read_plugin(plugin_id: str, base_path: Optional[Path] = None) -> Tuple[PluginPack, float]:
+    """Read the files of a plugin / Leer los ficheros de un plugin"""
+    start_time = time.perf_counter()
+
+    plugin = PluginPack(plugin_id, base_path)
+    if not plugin.base_path.is_dir():
+        raise PluginLoadError(f"Plugin directory not found: {plugin.base_path}")
+    plugin.preload()
+
+    return plugin, (time.perf_counter() - start_time) * 1000
+
+
+def _compile_plugin(plugin: PluginPack) -> float:
+    """Validate a plugin and compile its conditions, in milliseconds / Validar y compilar"""
+    start_time = time.perf_counter()
+
+    errors = validate_plugin(plugin)
+    if errors:
+        raise PluginLoadError("; ".join(errors))
+
+    # Imported here: the engines depend on this module
+    from .rule_engine import RuleEngine, compile_field_conditions
+    RuleEngine(plugin)
+    compile_field_conditions(plugin, "condition")
+    compile_field_conditions(plugin, "editable_when")
+
+    return (time.perf_counter() - start_time) * 1000
@@ -0,0 +1,196 @@
+"""
+Plugin Watcher - Hot reload of plugins and templates in long-running processes
+Recarga en caliente de plugins y plantillas en procesos de larga duracion
+"""
+
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import logging
+import threading
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+    FileSystemEventHandler = object
+
+from .plugin_loader import (
+    PluginLoadError,
+    PluginPack,
+    file_hashes,
+    file_signature,
+    list_available_plugins,
+    load_plugin,
+    reload_plugin,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class PluginWatcher:
+    """
+    Watches plugin YAML files and templates and swaps in new versions
+    Vigila los YAML y plantillas de los plugins y carga las nuevas versiones
+
+    Changes are detected by polling file signatures (mtime, size), which works
+    on every platform; when a signature is unchanged the content hashes are
+    compared too, so a same-size rewrite within the mtime resolution is not
+    missed. When the optional watchdog package is installed, native
+    file system events (inotify and equivalents) trigger a check immediately.
+
+    Reloaded plugins are swapped into the registry atomically: renders that
+    already hold the previous PluginPack finish with it, new ones get the
+    updated version.
+    """
+
+    def __init__(
+        self,
+        plugin_ids: Optional[Iterable[str]] = None,
+        interval: float = 2.0,
+        use_events: bool = True,
+        on_reload: Optional[Callable[[str], None]] = None,
+    ):
+        self.plugin_ids = list(plugin_ids) if plugin_ids is not None else list_available_plugins()
+        self.interval = interval
+        self.use_events = use_events and WATCHDOG_AVAILABLE
+        self.on_reload = on_reload
+        self.last_errors: Dict[str, str] = {}
+        self._signatures: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        self._hashes: Dict[str, Dict[str, str]] = {}
+        for pid in self.plugin_ids:
+            self._remember(pid, load_plugin(pid))
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._observer = None
+
+    def check(self) -> List[str]:
+        """
+        Check every watched plugin once and reload the ones that changed
+        Comprobar cada plugin una vez y recargar los que cambiaron
+
+        Returns:
+            List of plugin IDs that were reloaded
+        """
+        reloaded = []
+        with self._lock:
+            for plugin_id in self.plugin_ids:
+                plugin = load_plugin(plugin_id)
+                if file_signature(plugin) == self._signatures.get(plugin_id):
+                    if file_hashes(plugin) == self._hashes.get(plugin_id):
+                        continue
+
+                # Remember the new files even on failure so a broken
+                # edit is reported once rather than on every poll
+                self._remember(plugin_id, plugin)
+                try:
+                    plugin = reload_plugin(plugin_id)
+                except PluginLoadError as e:
+                    self.last_errors[plugin_id] = str(e)
+                    logger.warning("Plugin reload failed, keeping previous version: %s", e)
+                    continue
+
+                # The template may live outside the plugin directory
+                self._remember(plugin_id, plugin)
+                self.last_errors.pop(plugin_id, None)
+                reloaded.append(plugin_id)
+                logger.info("Plugin reloaded: %s", plugin_id)
+                if self.on_reload:
+                    self.on_reload(plugin_id)
+
+        return reloaded
+
+    def _remember(self, plugin_id: str, plugin: PluginPack) -> None:
+        """Store the signature and hashes of the plugin files on disk"""
+        self._signatures[plugin_id] = file_signature(plugin)
+        self._hashes[plugin_id] = file_hashes(plugin)
+
+    def start(self) -> "PluginWatcher":
+        """Start watching in a background thread / Iniciar vigilancia en segundo plano"""
+        if self._thread is not None:
+            return self
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="plugin-watcher", daemon=True)
+        self._thread.start()
+
+        if self.use_events:
+            self._start_observer()
+
+        return self
+
+    def stop(self) -> None:
+        """Stop watching / Detener la vigilancia"""
+        self._stop_event.set()
+        self._wake_event.set()
+
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        """Polling loop / Bucle de sondeo"""
+        while not self._stop_event.is_set():
+            self._wake_event.wait(self.interval)
+            self._wake_event.clear()
+            if self._stop_event.is_set():
+                break
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Plugin watcher check failed")
+
+    def _start_observer(self) -> None:
+        """Subscribe to native file system events / Suscribirse a eventos del sistema"""
+        directories = set()
+        for plugin_id in self.plugin_ids:
+            plugin = load_plugin(plugin_id)
+            directories.add(plugin.base_path)
+            directories.add(plugin.get_template_path().parent)
+
+        self._observer = Observer()
+        handler = _WakeHandler(self._wake_event)
+        for directory in directories:
+            if Path(directory).is_dir():
+                self._observer.schedule(handler, str(directory), recursive=False)
+        self._observer.start()
+
+
+class _WakeHandler(FileSystemEventHandler):
+    """Wake the polling loop on any file event / Despertar el bucle ante eventos"""
+
+    def __init__(self, wake_event: threading.Event):
+        super().__init__()
+        self._wake_event = wake_event
+
+    def on_any_event(self, event) -> None:
+        self._wake_event.set()
+
+
+def start_plugin_watcher(
+    plugin_ids: Optional[Iterable[str]] = None,
+    interval: float = 2.0,
+    use_events: bool = True,
+) -> PluginWatcher:
+    """
+    Create and start a plugin watcher
+    Crear e iniciar un vigilante de plugins
+
+    Args:
+        plugin_ids: Plugins to watch (all available plugins if None)
+        interval: Polling interval in seconds
+        use_events: Use native file system events when watchdog is installed
+
+    Returns:
+        The running PluginWatcher
+    """
+    return PluginWatcher(plugin_ids, interval=interval, use_events=use_events).start()
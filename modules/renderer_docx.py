@@ -4,17 +4,32 @@ Renderizador de Word con docxtpl
 """
 
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Any, List, Mapping, Tuple, Optional, Union
+import io
 import re
 from copy import deepcopy
+from functools import partial
+from time import perf_counter_ns
 
 from docx import Document
 from docx.shared import Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 
 from .plugin_loader import PluginPack
-from .context_builder import ContextBuilder
-from .rule_engine import RuleEngine, EvaluationTrace
+from .context_builder import ContextBuilder, list_formatters
+from .docx_tables import build_table, list_table_definitions, table_rows
+from .layered_context import ContextStats, LazyLayer
+from .rule_engine import RuleEngine, EvaluationTrace, CompactTrace
+
+
+# {{ var }}, {{ var|int }} and {{ var|int - 1 }}; group 2 is set for "- 1"
+_PLACEHOLDER = re.compile(r'\{\{\s*(?P<name>[^\s{}|]+)\s*(?:\|\s*int\s*(?P<minus_one>-\s*1\s*)?)?\}\}')
+
+# {{lista_alto_directores}} or {{lista_alto_directores: "Nombre": Cargo}}
+_LIST_PLACEHOLDER = re.compile(r'\{\{\s*(\w+)\s*(?::[^}]*)?\}\}')
+
+# Context keys that are not plain placeholder values
+_NOT_REPLACED = frozenset({'lista_alto_directores', 'visibility', 'texts'})
 
 
 class DocxRenderer:
@@ -28,8 +43,16 @@ class DocxRenderer:
         self.context_builder = ContextBuilder(plugin)
         self.rule_engine = RuleEngine(plugin)
         self._template_path: Optional[Path] = None
-
-    def render(self, data: dict, output_path: Path, template_path: Optional[Path] = None) -> Tuple[Path, List[EvaluationTrace]]:
+        # Context keys computed/skipped by the last render
+        self.last_context_stats: Optional[ContextStats] = None
+
+    def render(
+        self,
+        data: dict,
+        output_path: Path,
+        template_path: Optional[Path] = None,
+        trace_level: str = "full"
+    ) -> Tuple[Path, Union[List[EvaluationTrace], CompactTrace]]:
         """
         Render Word document
         Renderizar documento Word
@@ -38,42 +61,54 @@ class DocxRenderer:
             data: Input data dictionary
             output_path: Path for output file
             template_path: Optional custom template path
+            trace_level: "full", "compact" or "off" (see RuleEngine.evaluate_all_rules)
 
         Returns:
             Tuple of (output_path, evaluation_traces)
         """
-        # 1. Load template
+        start = perf_counter_ns()
+
+        # 1. Load template (the plugin's own template is read once and reused)
         if template_path:
             self._template_path = template_path
+            doc = Document(self._template_path)
         else:
             self._template_path = self.plugin.get_template_path()
-
-        doc = Document(self._template_path)
+            doc = Document(io.BytesIO(self.plugin.get_template_bytes()))
 
         # 2. Build context
         context = self.context_builder.build_context(data)
 
-        # 3. Get conditional values (si/no)
+        # 3. Get conditional values (si/no), converted on first access
         conditionals = self.context_builder.get_conditional_values(data)
-        context.update(conditionals)
+        context.add_layer(conditionals)
 
         # 4. Evaluate rules
-        visibility_map, traces = self.rule_engine.evaluate_all_rules(data)
+        visibility_map, traces = self.rule_engine.evaluate_all_rules(data, trace_level)
         context["visibility"] = visibility_map
 
         # 5. Strip conditional blocks
         self._strip_conditional_blocks(doc, conditionals)
 
-        # 6. Replace variables
-        self._process_document(doc, context, conditionals)
+        # 6. Take out list placeholders rendered as tables (tables.yaml)
+        list_tables = self._take_list_tables(doc, data)
+
+        # 7. Replace variables (only the placeholders left after step 5 are computed)
+        self._process_document(doc, context, conditionals, self._list_segments(data))
+        self.last_context_stats = context.stats()
 
-        # 7. Post-process
+        # 8. Post-process
         self._post_process(doc)
 
-        # 8. Save
+        # 9. Insert list tables
+        self._insert_list_tables(doc, list_tables)
+
+        # 10. Save
         output_path.parent.mkdir(parents=True, exist_ok=True)
         doc.save(output_path)
 
+        if self.rule_engine.profiler is not None:
+            self.rule_engine.profiler.record_render(perf_counter_ns() - start)
         return output_path, traces
 
     def _strip_conditional_blocks(self, doc: Document, cond_values: dict) -> None:
@@ -117,13 +152,58 @@ class DocxRenderer:
             if parent is not None:
                 parent.remove(el)
 
-    def _process_document(self, doc: Document, context: dict, conditionals: dict) -> None:
+    def _take_list_tables(self, doc: Document, data: Mapping[str, Any]) -> List[Tuple[Any, Any]]:
+        """
+        Paragraphs holding only a list placeholder with a table definition
+        Parrafos con solo un marcador de lista que tiene definicion de tabla
+
+        Each paragraph is emptied, so that variable replacement and
+        post-processing skip it, and returned with its w:tbl built from
+        the raw list of the input data.
+        """
+        definitions = list_table_definitions(self.plugin)
+        if not definitions:
+            return []
+        pending = []
+        for paragraph in doc.paragraphs:
+            match = _LIST_PLACEHOLDER.fullmatch(paragraph.text.strip())
+            if match is None or match.group(1) not in definitions:
+                continue
+            table_def = definitions[match.group(1)]
+            rows = table_rows(table_def, data.get(match.group(1)))
+            if rows:
+                paragraph.clear()
+                pending.append((paragraph._p, build_table(table_def, rows, self._text_width(doc))))
+        return pending
+
+    @staticmethod
+    def _insert_list_tables(doc: Document, list_tables: List[Tuple[Any, Any]]) -> None:
+        """Replace each emptied paragraph by its table / Sustituir por la tabla"""
+        for p, tbl in list_tables:
+            p.addnext(tbl)
+            p.getparent().remove(p)
+
+    @staticmethod
+    def _text_width(doc: Document) -> Optional[int]:
+        """Text width of the first section in twips / Ancho del texto"""
+        section = doc.sections[0]
+        if not (section.page_width and section.left_margin is not None and section.right_margin is not None):
+            return None
+        return int((section.page_width - section.left_margin - section.right_margin) / 635)
+
+    def _process_document(
+        self,
+        doc: Document,
+        context: Mapping[str, Any],
+        conditionals: Mapping[str, str],
+        lists: Optional[Mapping[str, List[str]]] = None
+    ) -> None:
         """Process all paragraphs and tables / Procesar todos los parrafos y tablas"""
         # Process paragraphs
         for paragraph in doc.paragraphs:
             original_text = paragraph.text
             if original_text.strip():
-                new_text = self._replace_variables(original_text, context, conditionals)
+                new_text = self._replace_variables(original_text, context, conditionals, lists)
                 if new_text != original_text:
                     original_format = self._save_paragraph_format(paragraph)
                     paragraph.clear()
@@ -137,60 +217,106 @@ class DocxRenderer:
                     for paragraph in cell.paragraphs:
                         original_text = paragraph.text
                         if original_text.strip():
-                            new_text = self._replace_variables(original_text, context, conditionals)
+                            new_text = self._replace_variables(original_text, context, conditionals, lists)
                             if new_text != original_text:
                                 paragraph.text = new_text
 
-    def _replace_variables(self, text: str, variables: dict, conditionals: dict) -> str:
-        """Replace variables and process conditionals / Reemplazar variables y procesar condicionales"""
+    def _replace_variables(
+        self,
+        text: str,
+        variables: Mapping[str, Any],
+        conditionals: Mapping[str, str],
+        lists: Optional[Mapping[str, List[str]]] = None
+    ) -> str:
+        """
+        Replace variables and process conditionals / Reemplazar variables y procesar condicionales
+
+        {{campo: ...}} placeholders of list fields with an output format
+        (tables.yaml) take the segments written by _list_segments, when
+        given, into the segments of the paragraph, which is joined once.
+        """
         # Process inline conditionals
         text = self._process_conditionals(text, conditionals)
 
-        # Handle lista_alto_directores special pattern
-        lista_pattern = r'\{\{lista_alto_directores:[^}]+\}\}'
-        lista_matches = list(re.finditer(lista_pattern, text, re.DOTALL))
-
-        for match in reversed(lista_matches):
-            if 'lista_alto_directores' in variables and variables['lista_alto_directores']:
-                text = text[:match.start()] + variables['lista_alto_directores'] + text[match.end():]
-            else:
-                text = text[:match.start()] + text[match.end():]
+        # Splice the list fields and the simple variables into one list of
+        # segments, looking up only the placeholders present
+        segments: List[str] = []
+        append = segments.append
+        position = 0
+        for match in self._segment_pattern().finditer(text):
+            append(text[position:match.start()])
+            list_field = match.group('list_field')
+            if list_field is None:
+                append(self._placeholder_value(match.group(0), match.group('name'), match.group('minus_one'), variables))
+            elif lists is not None and list_field in lists:
+                segments.extend(lists[list_field])
+            elif list_field in variables and variables[list_field]:
+                append(str(variables[list_field]))
+            position = match.end()
+        if segments:
+            append(text[position:])
+            text = ''.join(segments)
+
+        # Clean remaining markers (skipped when absent: the text may hold long lists)
+        if '{{' in text:
+            text = re.sub(r'\[?\{\{[^}]*\}\}\]?', '', text)
+        if '.mark' in text:
+            text = re.sub(r'\[\]\.mark', '', text)
+            text = re.sub(r'\.mark', '', text)
+            text = re.sub(r'\[\.mark\]', '', text)
 
-        # Replace simple variables
-        for var_name, var_value in variables.items():
-            if var_name == 'lista_alto_directores':
-                continue
-            if var_name in ('visibility', 'texts'):
-                continue
-
-            patterns = [
-                rf'\{{\{{\s*{re.escape(var_name)}\s*\}}\}}',
-                rf'\{{\{{\s*{re.escape(var_name)}\s*\|\s*int\s*\}}\}}',
-                rf'\{{\{{\s*{re.escape(var_name)}\s*\|\s*int\s*-\s*1\s*\}}\}}'
-            ]
-
-            for pattern in patterns:
-                if '|int - 1' in pattern and var_value:
-                    try:
-                        replacement = str(int(var_value) - 1)
-                    except (ValueError, TypeError):
-                        replacement = str(var_value) if var_value else ''
-                else:
-                    replacement = str(var_value) if var_value else ''
-
-                text = re.sub(pattern, replacement, text)
+        return text
 
-        # Clean remaining markers
-        text = re.sub(r'\[?\{\{[^}]*\}\}\]?', '', text)
-        text = re.sub(r'\[\]\.mark', '', text)
-        text = re.sub(r'\.mark', '', text)
-        text = re.sub(r'\[\.mark\]', '', text)
+    def _list_segments(self, data: Mapping[str, Any]) -> LazyLayer:
+        """
+        Segments of each list field of the data, written once per render
+        Segmentos de cada campo de lista, escritos una vez por renderizado
+        """
+        thunks = {}
+        for field, formatter in list_formatters(self.plugin).items():
+            items = data.get(field)
+            if isinstance(items, list):
+                thunks[field] = partial(_written, formatter, items)
+        return LazyLayer(thunks)
+
+    def _segment_pattern(self) -> "re.Pattern":
+        """
+        {{campo: ...}} of the list fields (group list_field) or a simple placeholder
+        {{campo: ...}} de los campos de lista o un marcador simple
+        """
+        def build() -> "re.Pattern":
+            fields = "|".join(map(re.escape, sorted(list_formatters(self.plugin), key=len, reverse=True)))
+            return re.compile(r'\{\{(?P<list_field>' + fields + r'):[^}]+\}\}|' + _PLACEHOLDER.pattern)
+
+        return self.plugin.get_artifact("segment_pattern", build)
+
+    @staticmethod
+    def _placeholder_value(placeholder: str, var_name: str, minus_one: Optional[str], variables: Mapping[str, Any]) -> str:
+        """Value of {{ var }}, {{ var|int }} or {{ var|int - 1 }} / Valor de un marcador"""
+        if var_name in _NOT_REPLACED or var_name not in variables:
+            # Left for the cleanup of remaining markers
+            return placeholder
+        var_value = variables[var_name]
+        if minus_one and var_value:
+            try:
+                return str(int(var_value) - 1)
+            except (ValueError, TypeError):
+                pass
+        return str(var_value) if var_value else ''
 
-        return text
+    def _process_conditionals(self, text: str, conditionals: Mapping[str, str]) -> str:
+        """
+        Process conditional blocks / Procesar bloques condicionales
 
-    def _process_conditionals(self, text: str, conditionals: dict) -> str:
-        """Process conditional blocks / Procesar bloques condicionales"""
-        for cond_var, cond_value in conditionals.items():
+        Only the conditionals named in the text are read.
+        """
+        if '{%' not in text:
+            return text
+        named = set(re.findall(r"\{% if (\w+) == 'si' %\}", text))
+        for cond_var in conditionals:
+            if cond_var not in named:
+                continue
+            cond_value = conditionals[cond_var]
             # Pattern with mark
             if_pattern = rf'\[\{{% if {cond_var} == \'si\' %\}}\]\.mark(.*?)\[\{{% endif %\}}\]\.mark'
             if cond_value == 'si':
@@ -324,3 +450,9 @@ class DocxRenderer:
                 letter = chr(ord('a') + sub_number - 1)
                 paragraph.text = f"{letter}. {sub_match.group(1)}"
                 sub_number += 1
+
+
+def _written(formatter: Any, items: List[Any]) -> List[str]:
+    segments: List[str] = []
+    formatter.write(items, segments)
+    return segments
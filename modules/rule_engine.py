@@ -3,21 +3,35 @@ Rule Engine - Rule evaluation and visibility calculation
 Motor de reglas y calculo de visibilidad
 """
 
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple, Any
+from time import perf_counter_ns
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Union, Any
 
-from .dsl_evaluator import evaluate_condition
+from .condition_dag import ConditionDAG, DAGSession, DAGStats
+from .dsl_batch import NUMPY_AVAILABLE, ColumnBatch, evaluate_condition_batch
+from .dsl_evaluator import compile_condition, compile_reader, condition_fields, field_root, normalize_value
 from .plugin_loader import PluginPack
+from .rule_profiler import RuleProfiler, active_profiler
 
+if NUMPY_AVAILABLE:
+    import numpy as np
 
-@dataclass
+
+@dataclass(frozen=True)
 class RuleHit:
-    """Result of evaluating a single rule / Resultado de evaluar una regla"""
+    """
+    Result of evaluating a single rule / Resultado de evaluar una regla
+
+    Immutable, so the same hit can be shared by every trace; for the same
+    reason affected_elements is a tuple (it used to be a list).
+    """
     rule_id: str
     rule_name: str
     condition_met: bool
     action_type: str
-    affected_elements: List[str]
+    affected_elements: Tuple[str, ...]
     text_key: Optional[str] = None
 
 
@@ -30,90 +44,708 @@ class EvaluationTrace:
     outcome: str
 
 
-class RuleEngine:
+# Trace levels: no traces, per-decision bitsets, or RuleHit/EvaluationTrace objects
+TRACE_LEVELS = ("off", "compact", "full")
+
+
+@dataclass
+class CompactTrace:
     """
-    Rule engine for evaluating conditions and computing visibility
-    Motor de reglas para evaluar condiciones y calcular visibilidad
+    Rule hits of one evaluation as one bitset per decision
+    Aciertos de una evaluacion como un bitset por decision
+
+    Bit i of hits[n] is set when rule i of decision n fired. Which rules were
+    evaluated follows from the bits (exclusive decisions stop at the first
+    hit), so expand() rebuilds the same traces as trace_level="full".
     """
+    decision_ids: Tuple[str, ...]
+    hits: List[int]
+
+    @classmethod
+    def from_traces(cls, traces: List[EvaluationTrace]) -> "CompactTrace":
+        """Compact full traces / Compactar trazas completas"""
+        return cls(
+            decision_ids=tuple(trace.decision_id for trace in traces),
+            hits=[
+                sum(1 << i for i, hit in enumerate(trace.rule_hits) if hit.condition_met)
+                for trace in traces
+            ]
+        )
 
-    def __init__(self, plugin: PluginPack):
-        self.plugin = plugin
-        self.logic = plugin.logic
-        self.decision_map = plugin.decision_map
+    def expand(self, plugin: PluginPack) -> List[EvaluationTrace]:
+        """Rebuild full traces / Reconstruir las trazas completas"""
+        decisions = {d.decision_id: d for d in compile_rules(plugin)}
+        return [
+            _expand_decision(decisions[decision_id], bits)
+            for decision_id, bits in zip(self.decision_ids, self.hits)
+        ]
 
-    def evaluate_all_rules(self, data: dict) -> Tuple[Dict[str, Any], List[EvaluationTrace]]:
-        """
-        Evaluate all rules and return visibility map and traces
-        Evaluar todas las reglas y devolver mapa de visibilidad y trazas
 
-        Args:
-            data: Input data dictionary
+@dataclass
+class BatchEvaluation:
+    """
+    Rule outcomes of many records as NumPy arrays
+    Resultados de reglas de muchos registros como arrays de NumPy
 
-        Returns:
-            Tuple of (visibility_map, traces)
+    matrix[r, c] is True when rule c fired for record r; columns follow
+    rule_ids, which lists the rules of every decision in decision order
+    (column_decisions gives the decision of each column). hits holds one
+    bitset array per decision, with the same bits as CompactTrace.hits.
+    """
+    decision_ids: Tuple[str, ...]
+    rule_ids: Tuple[str, ...]
+    column_decisions: Tuple[str, ...]
+    matrix: "np.ndarray"
+    hits: Dict[str, "np.ndarray"]
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def compact_trace(self, index: int) -> CompactTrace:
+        """Trace of one record, as evaluate_all_rules(..., "compact") returns"""
+        return CompactTrace(self.decision_ids, [int(self.hits[d][index]) for d in self.decision_ids])
+
+    def hit_rates(self) -> Dict[str, float]:
+        """Share of records for which each rule fired / Tasa de activacion por regla"""
+        rates = self.matrix.mean(axis=0) if len(self) else np.zeros(len(self.rule_ids))
+        return {rule_id: float(rate) for rule_id, rate in zip(self.rule_ids, rates)}
+
+    def groups(self) -> Dict[Tuple[int, ...], "np.ndarray"]:
         """
-        visibility_map: Dict[str, Any] = {}
-        traces: List[EvaluationTrace] = []
+        Record indices grouped by identical outcome
+        Indices de registros agrupados por resultado identico
 
-        decisions = self.decision_map.get("decisions", {})
-        rules = self.logic.get("rules", {})
+        Returns:
+            Dictionary mapping the tuple of decision bitsets to the indices
+            of the records with that outcome
+        """
+        if not len(self):
+            return {}
+        unique, inverse = np.unique(self.matrix, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        result = {}
+        for group in range(len(unique)):
+            index = np.flatnonzero(inverse == group)
+            result[tuple(int(self.hits[d][index[0]]) for d in self.decision_ids)] = index
+        return result
 
-        for decision_id, decision in decisions.items():
-            rule_hits: List[RuleHit] = []
-            is_exclusive = decision.get("exclusive", False)
-            exclusive_hit = False
 
-            for rule_id in decision.get("rules", []):
-                rule = rules.get(rule_id)
-                if not rule:
-                    continue
+@dataclass
+class CompiledRule:
+    """Rule with its condition compiled / Regla con su condicion compilada"""
+    rule_key: str  # key in logic.yaml, unique unlike rule_id
+    rule_id: str
+    rule_name: str
+    condition: dict
+    predicate: Callable[[dict], bool]
+    action_type: str
+    affected_elements: Tuple[str, ...]
+    text_key: Optional[str] = None
+    node: Optional[int] = None
 
-                # Skip if exclusive decision already has a hit
-                if is_exclusive and exclusive_hit:
-                    continue
 
-                hit = self._evaluate_rule(rule, data)
-                rule_hits.append(hit)
+@dataclass
+class CompiledDecision:
+    """Decision with its rules resolved and compiled / Decision con reglas compiladas"""
+    decision_id: str
+    description: str
+    rules: List[CompiledRule]
+    exclusive: bool = False
+    default: Optional[str] = None
+    dispatch: Optional[Dict[Any, int]] = None
+    dispatch_reader: Optional[Callable[[dict], Any]] = None
+    # Not-met and met RuleHit of every rule, shared by all traces
+    rule_hits: Tuple[Tuple[RuleHit, ...], Tuple[RuleHit, ...]] = ((), ())
 
-                if hit.condition_met:
-                    if is_exclusive:
-                        exclusive_hit = True
 
-                    # Process action
-                    self._process_action(hit, visibility_map)
+def compile_rules(plugin: PluginPack) -> List[CompiledDecision]:
+    """
+    Compile the decisions of a plugin, cached on the plugin
+    Compilar las decisiones de un plugin, con cache en el plugin
 
-            # Apply default if no rules matched in exclusive decision
-            if is_exclusive and not exclusive_hit:
-                default_key = decision.get("default")
-                if default_key:
-                    visibility_map[f"text_{decision_id}"] = default_key
+    Args:
+        plugin: PluginPack instance
 
-            traces.append(EvaluationTrace(
+    Returns:
+        List of compiled decisions in decision_map order
+    """
+    def build() -> List[CompiledDecision]:
+        rules = plugin.logic.get("rules", {})
+        _, nodes = compile_rule_dag(plugin)
+        decisions = []
+        for decision_id, decision in plugin.decision_map.get("decisions", {}).items():
+            compiled_rules = []
+            for rule_id in decision.get("rules", []):
+                rule = rules.get(rule_id)
+                if not rule:
+                    continue
+                condition = rule.get("condition", {})
+                action = rule.get("action", {})
+                compiled_rules.append(CompiledRule(
+                    rule_key=rule_id,
+                    rule_id=rule.get("rule_id", "unknown"),
+                    rule_name=rule.get("name", ""),
+                    condition=condition,
+                    predicate=compile_condition(condition),
+                    action_type=action.get("type", ""),
+                    affected_elements=tuple(action.get("elements") or ()),
+                    text_key=action.get("text_key"),
+                    node=nodes[rule_id]
+                ))
+            exclusive = decision.get("exclusive", False)
+            dispatch = _build_dispatch(compiled_rules) if exclusive else None
+            decisions.append(CompiledDecision(
                 decision_id=decision_id,
                 description=decision.get("description", ""),
-                rule_hits=rule_hits,
-                outcome="exclusive_hit" if exclusive_hit else "evaluated"
+                rules=compiled_rules,
+                exclusive=exclusive,
+                default=decision.get("default"),
+                dispatch=dispatch[1] if dispatch else None,
+                dispatch_reader=compile_reader(dispatch[0]) if dispatch else None,
+                rule_hits=_prebuilt_hits(compiled_rules)
             ))
+        return decisions
 
-        return visibility_map, traces
+    return plugin.get_artifact("compiled_rules", build)
 
-    def _evaluate_rule(self, rule: dict, data: dict) -> RuleHit:
-        """Evaluate a single rule / Evaluar una regla individual"""
-        condition = rule.get("condition", {})
-        action = rule.get("action", {})
 
-        met = evaluate_condition(condition, data)
+def compile_rule_dag(plugin: PluginPack) -> Tuple[ConditionDAG, Dict[str, int]]:
+    """
+    Compile every rule in logic.yaml into one DAG, cached on the plugin
+    Compilar todas las reglas de logic.yaml en un DAG, con cache en el plugin
 
+    Args:
+        plugin: PluginPack instance
+
+    Returns:
+        Tuple of (dag, node id per rule key)
+    """
+    def build() -> Tuple[ConditionDAG, Dict[str, int]]:
+        dag = ConditionDAG()
+        nodes = {
+            rule_key: dag.add(rule.get("condition", {}))
+            for rule_key, rule in plugin.logic.get("rules", {}).items()
+            if rule
+        }
+        return dag, nodes
+
+    return plugin.get_artifact("rule_dag", build)
+
+
+def _expand_decision(decision: CompiledDecision, bits: int) -> EvaluationTrace:
+    """EvaluationTrace of a decision from its hit bitset"""
+    misses, matches = decision.rule_hits
+    if decision.exclusive and bits:
+        # Rules after the first hit were not evaluated
+        first = (bits & -bits).bit_length() - 1
+        rule_hits = [*misses[:first], matches[first]]
+    else:
+        rule_hits = [matches[i] if bits >> i & 1 else miss for i, miss in enumerate(misses)]
+    return EvaluationTrace(
+        decision_id=decision.decision_id,
+        description=decision.description,
+        rule_hits=rule_hits,
+        outcome="exclusive_hit" if decision.exclusive and bits else "evaluated"
+    )
+
+
+def _prebuilt_hits(rules: List[CompiledRule]) -> Tuple[Tuple[RuleHit, ...], Tuple[RuleHit, ...]]:
+    """Not-met and met RuleHit of every rule, shared by all evaluations"""
+    def hit(rule: CompiledRule, met: bool) -> RuleHit:
         return RuleHit(
-            rule_id=rule.get("rule_id", "unknown"),
-            rule_name=rule.get("name", ""),
+            rule_id=rule.rule_id,
+            rule_name=rule.rule_name,
             condition_met=met,
-            action_type=action.get("type", ""),
-            affected_elements=action.get("elements", []),
-            text_key=action.get("text_key")
+            action_type=rule.action_type,
+            affected_elements=rule.affected_elements,
+            text_key=rule.text_key
+        )
+    return tuple(hit(rule, False) for rule in rules), tuple(hit(rule, True) for rule in rules)
+
+
+def _record_dispatch(profiler: RuleProfiler, decision: CompiledDecision, index: Optional[int], elapsed_ns: int) -> None:
+    """Record a dispatch lookup as the rules the sequential loop evaluates"""
+    skipped = decision.rules if index is None else decision.rules[:index]
+    for rule in skipped:
+        profiler.record_rule(rule.rule_id, False, 0)
+    if index is not None:
+        profiler.record_rule(decision.rules[index].rule_id, True, elapsed_ns)
+
+
+def _build_dispatch(rules: List[CompiledRule]) -> Optional[Tuple[str, Dict[Any, int]]]:
+    """
+    Lookup table for an exclusive decision of equality tests on one field
+    Tabla de busqueda para una decision exclusiva de igualdades sobre un campo
+
+    Returns:
+        (field, {normalized value: index of the first rule testing it}), or
+        None when the rules have any other shape
+    """
+    if len(rules) < 2:
+        return None
+
+    fields = {rule.condition.get("field") for rule in rules}
+    if len(fields) != 1 or not all(rule.condition.get("operator") == "equals" for rule in rules):
+        return None
+    field_path = fields.pop()
+    if not field_path:
+        return None
+
+    table: Dict[Any, int] = {}
+    for index, rule in enumerate(rules):
+        value = normalize_value(rule.condition.get("value"))
+        try:
+            hash(value)
+        except TypeError:
+            return None
+        # Values not equal to themselves (NaN) never match a lookup reliably
+        if value != value:
+            return None
+        table.setdefault(value, index)
+    return field_path, table
+
+
+def compile_field_conditions(plugin: PluginPack, key: str = "condition") -> Dict[str, Callable[[dict], bool]]:
+    """
+    Compile a conditional attribute of every field, cached on the plugin
+    Compilar un atributo condicional de cada campo, con cache en el plugin
+
+    Args:
+        plugin: PluginPack instance
+        key: Field attribute holding the condition ("condition", "editable_when")
+
+    Returns:
+        Dictionary mapping field names to compiled predicates (fields without
+        the attribute are omitted)
+    """
+    def build() -> Dict[str, Callable[[dict], bool]]:
+        fields = plugin.fields.get("fields", {})
+        return {
+            name: compile_condition(spec[key])
+            for name, spec in fields.items()
+            if spec.get(key)
+        }
+
+    return plugin.get_artifact(f"field_conditions:{key}", build)
+
+
+@dataclass
+class DependencyIndex:
+    """
+    Field paths read by each condition of a plugin, and the inverse
+    Rutas de campo leidas por cada condicion de un plugin, y el inverso
+
+    Conditions are identified by (kind, name) with kind "rule" (logic.yaml
+    rule key, since rule_id may repeat or be missing),
+    "field" (visibility condition) or "editable" (editable_when). Every
+    rule in logic.yaml is covered, whether or not a decision uses it.
+    """
+    dependencies: Dict[Tuple[str, str], FrozenSet[str]]
+    dependents: Dict[str, Set[Tuple[str, str]]] = field(default_factory=dict)
+
+    def affected(self, changed_keys: Iterable[str]) -> Set[Tuple[str, str]]:
+        """Conditions that read any of the changed keys / Condiciones afectadas"""
+        result: Set[Tuple[str, str]] = set()
+        for key in changed_keys:
+            result |= self.dependents.get(field_root(key), set())
+        return result
+
+
+def build_dependency_index(plugin: PluginPack) -> DependencyIndex:
+    """
+    Extract the field dependencies of every condition, cached on the plugin
+    Extraer las dependencias de cada condicion, con cache en el plugin
+
+    Args:
+        plugin: PluginPack instance
+
+    Returns:
+        DependencyIndex covering rules, field visibility and editable_when
+    """
+    def build() -> DependencyIndex:
+        dependencies: Dict[Tuple[str, str], FrozenSet[str]] = {}
+        for rule_key, rule in plugin.logic.get("rules", {}).items():
+            if rule:
+                dependencies[("rule", rule_key)] = condition_fields(rule.get("condition", {}))
+
+        for name, spec in plugin.fields.get("fields", {}).items():
+            if spec.get("condition"):
+                dependencies[("field", name)] = condition_fields(spec["condition"])
+            if spec.get("editable_when"):
+                dependencies[("editable", name)] = condition_fields(spec["editable_when"])
+
+        dependents: Dict[str, Set[Tuple[str, str]]] = {}
+        for key, paths in dependencies.items():
+            for path in paths:
+                dependents.setdefault(field_root(path), set()).add(key)
+
+        return DependencyIndex(dependencies=dependencies, dependents=dependents)
+
+    return plugin.get_artifact("dependency_index", build)
+
+
+class IncrementalEvaluator:
+    """
+    Keeps condition results and re-evaluates only those affected by an edit
+    Mantiene resultados y reevalua solo las condiciones afectadas por un cambio
+
+    Call evaluate() once with the full data, then update() with the data
+    and the keys that changed since the previous call.
+    """
+
+    def __init__(self, plugin: PluginPack):
+        self.plugin = plugin
+        self.fields = plugin.fields.get("fields", {})
+        self.index = build_dependency_index(plugin)
+        self._predicates: Dict[Tuple[str, str], Callable[[dict], bool]] = {}
+        for rule_key, rule in plugin.logic.get("rules", {}).items():
+            if rule:
+                self._predicates[("rule", rule_key)] = compile_condition(rule.get("condition", {}))
+        for name, predicate in compile_field_conditions(plugin, "condition").items():
+            self._predicates[("field", name)] = predicate
+        for name, predicate in compile_field_conditions(plugin, "editable_when").items():
+            self._predicates[("editable", name)] = predicate
+
+        self.results: Dict[Tuple[str, str], bool] = {}
+        self.evaluations = 0
+
+    def evaluate(self, data: dict) -> Dict[Tuple[str, str], bool]:
+        """
+        Evaluate every condition / Evaluar todas las condiciones
+
+        Returns:
+            Dictionary mapping (kind, name) to the condition result
+        """
+        self.results = {key: predicate(data) for key, predicate in self._predicates.items()}
+        self.evaluations += len(self._predicates)
+        return dict(self.results)
+
+    def update(self, data: dict, changed_keys: Iterable[str]) -> Dict[Tuple[str, str], bool]:
+        """
+        Re-evaluate the conditions that read any of the changed keys
+        Reevaluar las condiciones que leen alguna de las claves cambiadas
+
+        Args:
+            data: Current data dictionary
+            changed_keys: Data keys (or dotted paths) edited since the last call
+
+        Returns:
+            Dictionary with only the results whose value changed
+        """
+        if not self.results:
+            return self.evaluate(data)
+
+        changed: Dict[Tuple[str, str], bool] = {}
+        for key in self.index.affected(changed_keys):
+            value = self._predicates[key](data)
+            self.evaluations += 1
+            if self.results.get(key) != value:
+                self.results[key] = value
+                changed[key] = value
+        return changed
+
+    @property
+    def rule_results(self) -> Dict[str, bool]:
+        """Condition result per logic.yaml rule key / Resultado por regla"""
+        return {name: value for (kind, name), value in self.results.items() if kind == "rule"}
+
+    def field_visibility(self) -> Dict[str, bool]:
+        """Same as RuleEngine.get_field_visibility / Igual que get_field_visibility"""
+        return {name: self.results.get(("field", name), True) for name in self.fields}
+
+    def editable_fields(self) -> Dict[str, bool]:
+        """Whether each field is editable / Si cada campo es editable"""
+        return {name: self.results.get(("editable", name), True) for name in self.fields}
+
+    def required_fields(self) -> List[str]:
+        """Same as RuleEngine.get_required_fields / Igual que get_required_fields"""
+        visibility = self.field_visibility()
+        return [
+            name for name, spec in self.fields.items()
+            if visibility[name] and spec.get("required", False)
+        ]
+
+
+class FieldVisibilityMemo:
+    """
+    Field visibility memoized per data snapshot, shared through the plugin
+    Visibilidad de campos memorizada por instantanea de datos
+
+    The key is the values of the fields that visibility conditions read,
+    so every caller (rule engine, validator, form renderer) that sees the
+    same values reuses one evaluation. Snapshots with unhashable values in
+    those fields are evaluated without memoizing.
+    """
+
+    def __init__(self, plugin: PluginPack, maxsize: int = 64):
+        self.fields = plugin.fields.get("fields", {})
+        self.field_conditions = compile_field_conditions(plugin)
+        index = build_dependency_index(plugin)
+        self.roots = tuple(sorted({
+            field_root(path)
+            for (kind, _), paths in index.dependencies.items() if kind == "field"
+            for path in paths
+        }))
+        self.maxsize = maxsize
+        self._memo: "OrderedDict[tuple, Dict[str, bool]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.evaluations = 0
+
+    def visibility(self, data: dict) -> Dict[str, bool]:
+        """Same as RuleEngine.get_field_visibility / Igual que get_field_visibility"""
+        return dict(self._lookup(data))
+
+    def is_visible(self, field_name: str, data: dict) -> bool:
+        """Whether one field is visible / Si un campo es visible"""
+        return self._lookup(data).get(field_name, True)
+
+    def _lookup(self, data: dict) -> Dict[str, bool]:
+        # The class is part of the key so that True and 1 stay distinct
+        key = tuple((value.__class__, value) for value in map(data.get, self.roots))
+        try:
+            with self._lock:
+                visibility = self._memo.get(key)
+                if visibility is not None:
+                    self._memo.move_to_end(key)
+                    self.hits += 1
+                    return visibility
+        except TypeError:
+            return self._compute(data)
+
+        visibility = self._compute(data)
+        with self._lock:
+            self._memo[key] = visibility
+            if len(self._memo) > self.maxsize:
+                self._memo.popitem(last=False)
+        return visibility
+
+    def _compute(self, data: dict) -> Dict[str, bool]:
+        self.evaluations += len(self.field_conditions)
+        conditions = self.field_conditions
+        return {
+            name: conditions[name](data) if name in conditions else True
+            for name in self.fields
+        }
+
+
+def field_visibility_memo(plugin: PluginPack) -> FieldVisibilityMemo:
+    """
+    Visibility memo of a plugin, created on first use
+    Memo de visibilidad de un plugin, creado en el primer uso
+    """
+    return plugin.get_artifact("visibility_memo", lambda: FieldVisibilityMemo(plugin))
+
+
+class RuleEngine:
+    """
+    Rule engine for evaluating conditions and computing visibility
+    Motor de reglas para evaluar condiciones y calcular visibilidad
+    """
+
+    def __init__(self, plugin: PluginPack, profiler: Optional[RuleProfiler] = None):
+        """
+        Args:
+            plugin: PluginPack instance
+            profiler: Counters to record rule evaluations into; defaults to
+                the process-wide profiler when enabled (enable_profiling)
+        """
+        self.plugin = plugin
+        self.logic = plugin.logic
+        self.decision_map = plugin.decision_map
+        self.decisions = compile_rules(plugin)
+        self.decision_ids = tuple(d.decision_id for d in self.decisions)
+        self.dag, _ = compile_rule_dag(plugin)
+        self.field_conditions = compile_field_conditions(plugin)
+        self.visibility_memo = field_visibility_memo(plugin)
+        self.last_stats: Optional[DAGStats] = None
+        self.profiler = profiler if profiler is not None else active_profiler()
+
+    def evaluate_all_rules(
+        self,
+        data: dict,
+        trace_level: str = "full"
+    ) -> Tuple[Dict[str, Any], Union[List[EvaluationTrace], CompactTrace]]:
+        """
+        Evaluate all rules and return visibility map and traces
+        Evaluar todas las reglas y devolver mapa de visibilidad y trazas
+
+        Args:
+            data: Input data dictionary
+            trace_level: "full" (EvaluationTrace list), "compact" (CompactTrace
+                with one bitset per decision) or "off" (empty list)
+
+        Returns:
+            Tuple of (visibility_map, traces); evaluation counters of the
+            call are left in last_stats
+        """
+        if trace_level not in TRACE_LEVELS:
+            raise ValueError(f"Unknown trace level: {trace_level}")
+        profiler = self.profiler
+        start = perf_counter_ns() if profiler is not None else 0
+
+        # Shared sub-conditions are evaluated once per call
+        session = self.dag.session(data)
+        if profiler is None:
+            visibility_map, hits = self._evaluate_bits(data, session)
+        else:
+            visibility_map, hits = self._evaluate_profiled(data, session, profiler)
+            profiler.record_engine(perf_counter_ns() - start)
+        self.last_stats = session.stats
+
+        if trace_level == "full":
+            return visibility_map, [_expand_decision(d, bits) for d, bits in zip(self.decisions, hits)]
+        if trace_level == "compact":
+            return visibility_map, CompactTrace(self.decision_ids, hits)
+        return visibility_map, []
+
+    def _evaluate_bits(self, data: dict, session: DAGSession) -> Tuple[Dict[str, Any], List[int]]:
+        """
+        Evaluate all rules into one hit bitset per decision
+        Evaluar todas las reglas en un bitset de aciertos por decision
+
+        The unprofiled loop, without timing branches; _evaluate_profiled
+        is the same loop with the profiler calls.
+        """
+        visibility_map: Dict[str, Any] = {}
+        hits: List[int] = []
+
+        for decision in self.decisions:
+            bits = 0
+            if decision.dispatch is not None:
+                index = self._dispatch_index(decision, data)
+                if index is not None:
+                    bits = 1 << index
+                    self._process_action(decision.rules[index], visibility_map)
+            else:
+                for i, rule in enumerate(decision.rules):
+                    if session.value(rule.node) if rule.node is not None else rule.predicate(data):
+                        bits |= 1 << i
+                        self._process_action(rule, visibility_map)
+                        if decision.exclusive:
+                            break
+
+            if decision.exclusive and not bits and decision.default:
+                visibility_map[f"text_{decision.decision_id}"] = decision.default
+            hits.append(bits)
+
+        return visibility_map, hits
+
+    def _evaluate_profiled(
+        self,
+        data: dict,
+        session: DAGSession,
+        profiler: RuleProfiler
+    ) -> Tuple[Dict[str, Any], List[int]]:
+        """
+        _evaluate_bits recording rule and decision times
+        _evaluate_bits registrando tiempos de reglas y decisiones
+
+        A dispatch lookup records the same rules as the sequential loop
+        would: the rules before the match (every rule, without one) as
+        evaluated and not met, with no time, and the lookup time on the
+        matching rule.
+        """
+        visibility_map: Dict[str, Any] = {}
+        hits: List[int] = []
+
+        for decision in self.decisions:
+            decision_start = perf_counter_ns()
+            bits = 0
+            if decision.dispatch is not None:
+                index = self._dispatch_index(decision, data)
+                _record_dispatch(profiler, decision, index, perf_counter_ns() - decision_start)
+                if index is not None:
+                    bits = 1 << index
+                    self._process_action(decision.rules[index], visibility_map)
+            else:
+                for i, rule in enumerate(decision.rules):
+                    rule_start = perf_counter_ns()
+                    met = session.value(rule.node) if rule.node is not None else rule.predicate(data)
+                    profiler.record_rule(rule.rule_id, met, perf_counter_ns() - rule_start)
+                    if met:
+                        bits |= 1 << i
+                        self._process_action(rule, visibility_map)
+                        if decision.exclusive:
+                            break
+
+            if decision.exclusive and not bits and decision.default:
+                visibility_map[f"text_{decision.decision_id}"] = decision.default
+            hits.append(bits)
+            profiler.record_decision(decision.decision_id, bool(bits), perf_counter_ns() - decision_start)
+
+        return visibility_map, hits
+
+    def evaluate_batch(self, records: Any) -> BatchEvaluation:
+        """
+        Evaluate all rules for many records at once with NumPy
+        Evaluar todas las reglas para muchos registros a la vez con NumPy
+
+        Each distinct rule condition is evaluated once over the whole batch
+        with the vectorized DSL; the outcome for each record is the same as
+        evaluate_all_rules.
+
+        Args:
+            records: List of data dictionaries, or columns accepted by
+                ColumnBatch (dict of arrays, pandas DataFrame, ColumnBatch)
+
+        Returns:
+            BatchEvaluation with the records x rules matrix and the
+            per-decision bitsets
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        if isinstance(records, (list, tuple)):
+            names = {name for record in records for name in record}
+            batch = ColumnBatch(
+                {name: [record.get(name) for record in records] for name in names},
+                size=len(records)
+            )
+        else:
+            batch = records if isinstance(records, ColumnBatch) else ColumnBatch(records)
+
+        # Rules with identical conditions share a DAG node, and one evaluation
+        conditions: Dict[Any, "np.ndarray"] = {}
+        columns, rule_ids, column_decisions = [], [], []
+        hits: Dict[str, "np.ndarray"] = {}
+        for decision in self.decisions:
+            taken = np.zeros(batch.size, dtype=bool)
+            # Bitsets of more than 63 rules do not fit in int64
+            bits = np.zeros(batch.size, dtype=np.int64 if len(decision.rules) < 64 else object)
+            for i, rule in enumerate(decision.rules):
+                key = rule.node if rule.node is not None else id(rule)
+                met = conditions.get(key)
+                if met is None:
+                    met = conditions[key] = evaluate_condition_batch(rule.condition, batch)
+                if decision.exclusive:
+                    met = met & ~taken
+                    taken |= met
+                columns.append(met)
+                rule_ids.append(rule.rule_id)
+                column_decisions.append(decision.decision_id)
+                bits = bits + met.astype(bits.dtype) * (1 << i)
+            hits[decision.decision_id] = bits
+
+        matrix = np.stack(columns, axis=1) if columns else np.zeros((batch.size, 0), dtype=bool)
+        return BatchEvaluation(
+            decision_ids=self.decision_ids,
+            rule_ids=tuple(rule_ids),
+            column_decisions=tuple(column_decisions),
+            matrix=matrix,
+            hits=hits
         )
 
-    def _process_action(self, hit: RuleHit, visibility_map: Dict[str, Any]) -> None:
+    def _dispatch_index(self, decision: CompiledDecision, data: dict) -> Optional[int]:
+        """Position of the matching rule, None if no rule matches"""
+        value = decision.dispatch_reader(data)
+        try:
+            return decision.dispatch.get(value)
+        except TypeError:
+            # Unhashable values (lists, dicts) never equal the constants
+            return None
+
+    def _process_action(self, hit: CompiledRule, visibility_map: Dict[str, Any]) -> None:
         """Process a rule action / Procesar una accion de regla"""
         if hit.action_type == "include_block":
             for element in hit.affected_elements:
@@ -142,32 +774,24 @@ class RuleEngine:
         Returns:
             Dictionary mapping field names to visibility (True/False)
         """
-        visibility = {}
-        fields = self.plugin.fields.get("fields", {})
-
-        for field_name, field_spec in fields.items():
-            condition = field_spec.get("condition")
-            if condition:
-                visibility[field_name] = evaluate_condition(condition, data)
-            else:
-                visibility[field_name] = True
-
-        return visibility
+        return self.visibility_memo.visibility(data)
 
-    def get_required_fields(self, data: dict) -> List[str]:
+    def get_required_fields(self, data: dict, visibility: Optional[Dict[str, bool]] = None) -> List[str]:
         """
         Get list of currently required fields based on conditions
         Obtener lista de campos requeridos actuales basado en condiciones
 
         Args:
             data: Current form data
+            visibility: Precomputed field visibility (e.g. from IncrementalEvaluator)
 
         Returns:
             List of required field names
         """
         required = []
         fields = self.plugin.fields.get("fields", {})
-        visibility = self.get_field_visibility(data)
+        if visibility is None:
+            visibility = self.get_field_visibility(data)
 
         for field_name, field_spec in fields.items():
             if not visibility.get(field_name, True):
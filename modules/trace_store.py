@@ -0,0 +1,237 @@
+"""
+Trace Store - Append-only SQLite log of generated documents
+Registro SQLite de solo anadido de documentos generados
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple
+
+from .input_normalizer import parse_date_value
+from .rule_engine import CompactTrace
+
+if TYPE_CHECKING:
+    from .generate import GenerationResult
+
+
+DEFAULT_TRACE_DB = Path(__file__).parent.parent / "output" / "traces.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS traces (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    trace_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    plugin_id TEXT NOT NULL,
+    plugin_fingerprint TEXT,
+    input_hash TEXT NOT NULL,
+    output_path TEXT,
+    client_name TEXT,
+    document_date TEXT,
+    success INTEGER NOT NULL,
+    decision_ids TEXT,
+    rule_hits TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_traces_trace_id ON traces (trace_id);
+CREATE INDEX IF NOT EXISTS idx_traces_client_date ON traces (client_name, document_date);
+"""
+
+_COLUMNS = (
+    "trace_id", "created_at", "plugin_id", "plugin_fingerprint", "input_hash", "output_path",
+    "client_name", "document_date", "success", "decision_ids", "rule_hits",
+)
+
+
+@dataclass
+class TraceRecord:
+    """One stored generation / Una generacion almacenada"""
+    trace_id: str
+    created_at: str
+    plugin_id: str
+    plugin_fingerprint: Optional[str]
+    input_hash: str
+    output_path: Optional[str]
+    client_name: Optional[str]
+    document_date: Optional[str]
+    success: bool
+    compact_trace: Optional[CompactTrace]
+
+
+class TraceStore:
+    """
+    Append-only trace log backed by SQLite
+    Registro de trazas de solo anadido sobre SQLite
+
+    Rows are buffered and written in one transaction per batch_size rows
+    (and on flush/close), so logging large batches stays cheap. Queries
+    flush pending rows first. Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_TRACE_DB,
+        batch_size: int = 500,
+        client_field: str = "Nombre_Cliente",
+        date_field: str = "Fecha_de_hoy"
+    ):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.client_field = client_field
+        self.date_field = date_field
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._pending: List[Tuple[Any, ...]] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "TraceStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def record(self, result: "GenerationResult", data: dict, plugin_id: str) -> None:
+        """
+        Queue a generation result for storage
+        Encolar un resultado de generacion para guardarlo
+
+        Args:
+            result: Result returned by generate()
+            data: Input data the document was generated from
+            plugin_id: ID of the plugin used
+        """
+        compact = result.compact_trace
+        if compact is None and result.evaluation_traces:
+            compact = CompactTrace.from_traces(result.evaluation_traces)
+
+        row = (
+            result.trace_id,
+            datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            plugin_id,
+            result.plugin_fingerprint,
+            input_hash(data),
+            str(result.output_path) if result.output_path else None,
+            _text(data.get(self.client_field)),
+            _iso_date(data.get(self.date_field)),
+            int(result.success),
+            json.dumps(list(compact.decision_ids)) if compact else None,
+            json.dumps(compact.hits) if compact else None,
+        )
+        with self._lock:
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """Write queued rows in one transaction / Escribir filas en una transaccion"""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        """Flush and close the database / Volcar y cerrar la base de datos"""
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+
+    def get(self, trace_id: str) -> Optional[TraceRecord]:
+        """
+        Look up a trace by id / Buscar una traza por id
+
+        Returns:
+            Latest record with that trace_id, or None
+        """
+        rows = self._query("WHERE trace_id = ? ORDER BY id DESC LIMIT 1", (trace_id,))
+        return rows[0] if rows else None
+
+    def find(
+        self,
+        client_name: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        limit: int = 100
+    ) -> List[TraceRecord]:
+        """
+        Search traces by client name and document date (ISO, inclusive)
+        Buscar trazas por nombre de cliente y fecha del documento
+
+        Returns:
+            Matching records, newest first
+        """
+        clauses, params = [], []
+        if client_name is not None:
+            clauses.append("client_name = ?")
+            params.append(client_name)
+        if date_from is not None:
+            clauses.append("document_date >= ?")
+            params.append(date_from)
+        if date_to is not None:
+            clauses.append("document_date <= ?")
+            params.append(date_to)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        return self._query(f"{where}ORDER BY id DESC LIMIT ?", (*params, limit))
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        with self._conn:
+            self._conn.executemany(
+                f"INSERT INTO traces ({', '.join(_COLUMNS)}) VALUES ({placeholders})",
+                self._pending
+            )
+        self._pending = []
+
+    def _query(self, clause: str, params: tuple) -> List[TraceRecord]:
+        with self._lock:
+            self._flush_locked()
+            rows = self._conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM traces {clause}", params).fetchall()
+        return [_to_record(row) for row in rows]
+
+
+def input_hash(data: dict) -> str:
+    """SHA-256 of the input data in canonical JSON / SHA-256 de los datos de entrada"""
+    if not isinstance(data, dict):
+        # Any other mapping (e.g. a ChainMap) is hashed by its items
+        data = dict(data)
+    payload = json.dumps(data, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _to_record(row: tuple) -> TraceRecord:
+    values = dict(zip(_COLUMNS, row))
+    compact = None
+    if values["decision_ids"] is not None:
+        compact = CompactTrace(tuple(json.loads(values["decision_ids"])), json.loads(values["rule_hits"]))
+    return TraceRecord(
+        trace_id=values["trace_id"],
+        created_at=values["created_at"],
+        plugin_id=values["plugin_id"],
+        plugin_fingerprint=values["plugin_fingerprint"],
+        input_hash=values["input_hash"],
+        output_path=values["output_path"],
+        client_name=values["client_name"],
+        document_date=values["document_date"],
+        success=bool(values["success"]),
+        compact_trace=compact
+    )
+
+
+def _text(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _iso_date(value: Any) -> Optional[str]:
+    """Document date as YYYY-MM-DD when it can be parsed"""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, str):
+        parsed = parse_date_value(value)
+        return parsed.isoformat() if parsed else value or None
+    return None
@@ -0,0 +1,670 @@
+#!/usr/bin/env python3
+"""
+CLI script for performance benchmarks
+Script CLI para pruebas de rendimiento
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from modules.plugin_loader import load_plugin
+
+
+PLUGIN_ID = "carta_manifestacion"
+BOOL_VALUES = [True, False, "si", "no", "sí", ""]
+
+
+def timed(func: Callable[[], object], repeat: int = 3) -> float:
+    """Best wall time of several runs, in milliseconds / Mejor tiempo en ms"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def report(name: str, baseline_ms: float, optimized_ms: float) -> None:
+    """Print a comparison line / Imprimir una linea de comparacion"""
+    speedup = baseline_ms / optimized_ms if optimized_ms else float("inf")
+    print(f"  {name:<48} {baseline_ms:10.2f} ms -> {optimized_ms:10.2f} ms  (x{speedup:.1f})")
+
+
+def random_records(size: int, seed: int = 1) -> list:
+    """Random input records for the shipped plugin / Registros aleatorios"""
+    plugin = load_plugin(PLUGIN_ID)
+    rng = random.Random(seed)
+    fields = plugin.fields.get("fields", {})
+    records = []
+    for _ in range(size):
+        record = {}
+        for name, spec in fields.items():
+            if spec.get("type") == "bool":
+                record[name] = rng.choice(BOOL_VALUES)
+            elif spec.get("type") == "enum":
+                record[name] = rng.choice([v["value"] for v in spec.get("values", [])])
+        records.append(record)
+    return records
+
+
+def bench_dsl_batch(size: int) -> None:
+    """Scalar vs vectorized evaluation of every rule / Escalar vs vectorizado"""
+    import numpy as np
+    from modules.dsl_evaluator import compile_condition
+    from modules.dsl_batch import ColumnBatch, evaluate_condition_batch
+
+    plugin = load_plugin(PLUGIN_ID)
+    conditions = [rule.get("condition", {}) for rule in plugin.logic.get("rules", {}).values()]
+    records = random_records(size)
+    names = sorted({key for record in records for key in record})
+    columns = {name: [record.get(name) for record in records] for name in names}
+
+    predicates = [compile_condition(c) for c in conditions]
+
+    def scalar():
+        return [[p(record) for record in records] for p in predicates]
+
+    def vectorized():
+        batch = ColumnBatch(columns)
+        return [evaluate_condition_batch(c, batch) for c in conditions]
+
+    typed_columns = {
+        name: np.array([str(v) for v in values]) for name, values in columns.items()
+    }
+    typed_records = [{name: str(v) for name, v in record.items()} for record in records]
+
+    def scalar_typed():
+        return [[p(record) for record in typed_records] for p in predicates]
+
+    def vectorized_typed():
+        batch = ColumnBatch(typed_columns)
+        return [evaluate_condition_batch(c, batch) for c in conditions]
+
+    print(f"[dsl_batch] {len(conditions)} rules x {size} records")
+    report("object columns: scalar -> batch", timed(scalar), timed(vectorized))
+    report("string columns: scalar -> batch", timed(scalar_typed), timed(vectorized_typed))
+
+
+def bench_normalize(size: int) -> None:
+    """Rule evaluation on raw vs normalized records / Registros crudos vs normalizados"""
+    from modules.dsl_evaluator import compile_condition
+    from modules.input_normalizer import normalize_record
+
+    plugin = load_plugin(PLUGIN_ID)
+    conditions = [rule.get("condition", {}) for rule in plugin.logic.get("rules", {}).values()]
+    predicates = [compile_condition(c) for c in conditions]
+    rng = random.Random(2)
+    raw_records = [
+        {name: (rng.choice(["si", "no", "sí", "No"]) if isinstance(value, (bool, str)) and name != "organo" else value)
+         for name, value in record.items()}
+        for record in random_records(size)
+    ]
+    normalized = [normalize_record(plugin, record) for record in raw_records]
+
+    def evaluate(records):
+        return lambda: [[p(record) for p in predicates] for record in records]
+
+    count = size * len(predicates)
+    raw_ms = timed(evaluate(raw_records))
+    typed_ms = timed(evaluate(normalized))
+    print(f"[normalize] {len(predicates)} rules x {size} records")
+    report("raw strings -> normalized records", raw_ms, typed_ms)
+    print(f"  per condition: {raw_ms * 1e6 / count:.0f} ns -> {typed_ms * 1e6 / count:.0f} ns")
+    print(f"  normalize_record: {timed(lambda: [normalize_record(plugin, r) for r in raw_records], 1) * 1e6 / size:.0f} ns/record")
+
+
+def _split_lookup(data: dict, path: str) -> object:
+    """Split-per-call lookup (previous get_nested_value) / Busqueda sin cache"""
+    if not path or not data:
+        return None
+    value = data
+    for key in path.split("."):
+        if isinstance(value, dict):
+            value = value.get(key)
+        elif isinstance(value, list):
+            try:
+                index = int(key)
+                value = value[index] if 0 <= index < len(value) else None
+            except ValueError:
+                return None
+        else:
+            return None
+        if value is None:
+            return None
+    return value
+
+
+def bench_paths(size: int) -> None:
+    """Split-per-call vs compiled path accessors / Rutas sin cache vs compiladas"""
+    from modules.dsl_evaluator import get_nested_value, compile_path
+
+    data = {"comision": True, "servicio": {"enabled": "si", "items": [{"nombre": "x"}]}}
+    paths = ["comision", "servicio.enabled", "servicio.items.0.nombre"]
+
+    print(f"[paths] {size} lookups per path")
+    for path in paths:
+        get = compile_path(path)
+        report(
+            f"{path}: split -> get_nested_value",
+            timed(lambda: [_split_lookup(data, path) for _ in range(size)]),
+            timed(lambda: [get_nested_value(data, path) for _ in range(size)])
+        )
+        report(
+            f"{path}: split -> compile_path",
+            timed(lambda: [_split_lookup(data, path) for _ in range(size)]),
+            timed(lambda: [get(data) for _ in range(size)])
+        )
+
+
+def bench_dispatch(size: int) -> None:
+    """Sequential vs hash dispatch of exclusive decisions / Secuencial vs tabla hash"""
+    import dataclasses
+    from modules.plugin_loader import PluginPack
+    from modules.rule_engine import RuleEngine
+
+    # Synthetic exclusive decision with one equality rule per branch
+    branches = 50
+    plugin = PluginPack("bench", PROJECT_ROOT / "config" / "yamls" / PLUGIN_ID)
+    rules = {
+        f"b{i}": {
+            "rule_id": f"b{i}",
+            "condition": {"operator": "equals", "field": "tipo", "value": f"tipo_{i}"},
+            "action": {"type": "set_text", "elements": ["texto"], "text_key": f"texto_{i}"},
+        }
+        for i in range(branches)
+    }
+    plugin._cache["logic.yaml"] = {"rules": rules}
+    plugin._cache["decision_map.yaml"] = {"decisions": {"tipo_text": {
+        "rules": list(rules), "exclusive": True, "default": "texto_0"
+    }}}
+
+    engine = RuleEngine(plugin)
+    sequential = RuleEngine(plugin)
+    sequential.decisions = [dataclasses.replace(d, dispatch=None) for d in engine.decisions]
+    rng = random.Random(4)
+    records = [{"tipo": f"tipo_{rng.randrange(branches + 5)}"} for _ in range(size // 10)]
+
+    print(f"[dispatch] exclusive decision with {branches} branches x {len(records)} records")
+    report(
+        "sequential -> dispatch table",
+        timed(lambda: [sequential.evaluate_all_rules(r) for r in records]),
+        timed(lambda: [engine.evaluate_all_rules(r) for r in records])
+    )
+
+
+def bench_dag(size: int) -> None:
+    """Independent predicates vs shared condition DAG / Predicados vs DAG compartido"""
+    from modules.condition_dag import ConditionDAG
+    from modules.dsl_evaluator import compile_condition
+    from modules.rule_engine import RuleEngine
+
+    # Synthetic rule set: 200 rules, each a shared group of leaf tests plus one leaf
+    rng = random.Random(6)
+    leaves = [{"operator": "equals", "field": f"f{i}", "value": True} for i in range(10)]
+    groups = [
+        {"operator": rng.choice(["and", "or"]), "conditions": rng.sample(leaves, 4)}
+        for _ in range(20)
+    ]
+    conditions = [
+        {"operator": "and", "conditions": [rng.choice(groups), rng.choice(leaves)]}
+        for _ in range(200)
+    ]
+    predicates = [compile_condition(c) for c in conditions]
+    dag = ConditionDAG()
+    nodes = [dag.add(c) for c in conditions]
+    records = [{f"f{i}": rng.choice(BOOL_VALUES) for i in range(10)} for _ in range(size // 100)]
+
+    def shared():
+        for record in records:
+            session = dag.session(record)
+            [session.value(node) for node in nodes]
+
+    print(f"[dag] 200 rules over 20 shared groups x {len(records)} records")
+    report(
+        "independent predicates -> DAG",
+        timed(lambda: [[p(record) for p in predicates] for record in records]),
+        timed(shared)
+    )
+    session = dag.session(records[0])
+    [session.value(node) for node in nodes]
+    print(f"  per record: {session.stats}")
+
+    engine = RuleEngine(load_plugin(PLUGIN_ID))
+    engine.evaluate_all_rules(random_records(1)[0])
+    print(f"  shipped rules per render: {engine.last_stats}")
+
+
+def bench_trace(size: int) -> None:
+    """Rule evaluation per trace level: time and retained memory / Tiempo y memoria"""
+    import tracemalloc
+    from modules.rule_engine import RuleEngine
+
+    engine = RuleEngine(load_plugin(PLUGIN_ID))
+    records = random_records(size // 10)
+
+    def run(level):
+        return lambda: [engine.evaluate_all_rules(record, level)[1] for record in records]
+
+    print(f"[trace] {len(records)} records")
+    full_ms = timed(run("full"))
+    for level in ("compact", "off"):
+        report(f"full -> {level}", full_ms, timed(run(level)))
+
+    for level in ("full", "compact", "off"):
+        tracemalloc.start()
+        traces = run(level)()
+        retained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del traces
+        print(f"  {level:<8} traces retained: {retained / 1024 / 1024:8.2f} MiB")
+
+
+def bench_trace_store(size: int) -> None:
+    """Trace logging cost: one commit per row vs batched / Coste del registro de trazas"""
+    import tempfile
+    from modules.generate import GenerationResult
+    from modules.rule_engine import RuleEngine
+    from modules.trace_store import TraceStore
+
+    engine = RuleEngine(load_plugin(PLUGIN_ID))
+    records = random_records(size // 10)
+    for i, record in enumerate(records):
+        record["Nombre_Cliente"] = f"Cliente {i % 100}"
+        record["Fecha_de_hoy"] = "31/12/2025"
+    results = [
+        GenerationResult(
+            success=True, output_path=None, trace_id=f"trace-{i}",
+            compact_trace=engine.evaluate_all_rules(record, "compact")[1]
+        )
+        for i, record in enumerate(records)
+    ]
+
+    def log(batch_size):
+        def run():
+            with tempfile.TemporaryDirectory() as tmp:
+                with TraceStore(Path(tmp) / "traces.sqlite3", batch_size=batch_size) as store:
+                    for result, record in zip(results, records):
+                        store.record(result, record, PLUGIN_ID)
+        return run
+
+    print(f"[trace_store] {len(records)} traces")
+    per_row = timed(log(1), 1)
+    batched = timed(log(500), 1)
+    report("commit per row -> batched (500)", per_row, batched)
+    print(f"  batched: {batched * 1000 / len(records):.1f} us per trace")
+
+
+def bench_profiler(size: int) -> None:
+    """Overhead of rule profiling / Coste del perfilado de reglas"""
+    from modules.rule_engine import RuleEngine
+    from modules.rule_profiler import RuleProfiler
+
+    plugin = load_plugin(PLUGIN_ID)
+    plain = RuleEngine(plugin)
+    profiled = RuleEngine(plugin, profiler=RuleProfiler())
+    records = random_records(size // 10)
+
+    def run(engine, level):
+        return lambda: [engine.evaluate_all_rules(record, level) for record in records]
+
+    print(f"[profiler] {len(records)} records (x<1 is the profiling overhead)")
+    for level in ("full", "compact"):
+        report(f"{level}: plain -> profiled", timed(run(plain, level)), timed(run(profiled, level)))
+
+
+def bench_visibility(size: int) -> None:
+    """Field visibility evaluated per call vs memoized / Visibilidad de campos"""
+    from modules.rule_engine import RuleEngine, compile_field_conditions
+
+    plugin = load_plugin(PLUGIN_ID)
+    engine = RuleEngine(plugin)
+    conditions = compile_field_conditions(plugin)
+    fields = plugin.fields["fields"]
+    records = random_records(size // 10)
+
+    def evaluate_each_time():
+        for record in records:
+            for _ in range(3):
+                {name: conditions[name](record) if name in conditions else True for name in fields}
+
+    print(f"[visibility] {len(records)} records, 3 visibility passes each")
+    baseline = timed(evaluate_each_time)
+    memo = timed(lambda: [
+        (engine.get_field_visibility(r), engine.get_field_visibility(r), engine.get_field_visibility(r))
+        for r in records
+    ])
+    report("3 evaluations -> 3 memo lookups", baseline, memo)
+
+
+def bench_rule_batch(size: int) -> None:
+    """Rule outcomes for a portfolio: per record vs evaluate_batch / Lote de reglas"""
+    from modules.rule_engine import RuleEngine
+
+    engine = RuleEngine(load_plugin(PLUGIN_ID))
+    records = random_records(size)
+
+    print(f"[rule_batch] {size} records")
+    per_record = timed(lambda: [engine.evaluate_all_rules(record, "compact") for record in records], 1)
+    batched = timed(lambda: engine.evaluate_batch(records))
+    report("evaluate_all_rules loop -> evaluate_batch", per_record, batched)
+    batch = engine.evaluate_batch(records)
+    print(f"  {len(batch.groups())} distinct outcomes")
+
+
+def bench_dates(size: int) -> None:
+    """Date parsing: strptime loop vs compiled formats / Analisis de fechas"""
+    from datetime import datetime
+    from modules import formatters
+
+    rng = random.Random(3)
+    values = [
+        rng.choice([
+            f"{rng.randint(1, 28)}/{rng.randint(1, 12)}/{rng.randint(2000, 2030)}",
+            f"{rng.randint(2000, 2030)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            f"{rng.randint(1, 28)} de {rng.choice(formatters.SPANISH_MONTHS)} de {rng.randint(2000, 2030)}",
+        ])
+        for _ in range(size // 10)
+    ]
+    numeric = tuple(fmt for fmt in formatters.DATE_FORMATS if "%B" not in fmt)
+
+    def strptime_loop():
+        for value in values:
+            for fmt in numeric:
+                try:
+                    datetime.strptime(value, fmt)
+                    break
+                except ValueError:
+                    continue
+
+    def uncached():
+        parse = formatters._parse_cached.__wrapped__
+        for value in values:
+            parse(value, formatters.DATE_FORMATS)
+
+    print(f"[dates] {len(values)} values (a third Spanish month names)")
+    baseline = timed(strptime_loop, 1)
+    report("strptime loop -> compiled formats", baseline, timed(uncached))
+    report("strptime loop -> parse_date (LRU cache)", baseline, timed(lambda: [formatters.parse_date(v) for v in values]))
+
+    # A real column holds one format; parse_date_column detects it once
+    column = [f"{rng.randint(2000, 2030)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}" for _ in values]
+    formatters._parse_cached.cache_clear()
+    report("one-format column: parse_date -> parse_date_column",
+           timed(lambda: [formatters._parse_cached.__wrapped__(v, formatters.DATE_FORMATS) for v in column]),
+           timed(lambda: formatters.parse_date_column(column)))
+
+
+def bench_numbers(size: int) -> None:
+    """Number formatting: str.replace vs compiled formats / Formateo numerico"""
+    from modules.context_builder import number_formatters
+    from modules.dsl_batch import NUMPY_AVAILABLE
+
+    rng = random.Random(4)
+    values = [round(rng.uniform(0, 1e8), 2) for _ in range(size * 10)]
+    currency = number_formatters(load_plugin(PLUGIN_ID))["currency"]
+
+    def replace_chain(value):
+        # format_currency_eur before number_formats were compiled, with decimals
+        if value is None:
+            return ""
+        try:
+            if isinstance(value, str):
+                value = float(value.replace(",", ".").replace(" ", ""))
+            return f"{value:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".") + " EUR"
+        except (ValueError, TypeError):
+            return str(value)
+
+    print(f"[numbers] {len(values)} currency values")
+    baseline = timed(lambda: [replace_chain(v) for v in values])
+    report("str.replace chain -> compiled format", baseline, timed(lambda: [currency.format_value(v) for v in values]))
+    report("str.replace chain -> column", baseline, timed(lambda: currency.column(values)))
+    if NUMPY_AVAILABLE:
+        import numpy as np
+        array = np.array(values)
+        report("str.replace chain -> column (numpy array)", baseline, timed(lambda: currency.column(array)))
+
+
+def bench_context(size: int) -> None:
+    """Template context: dict copies and full passes vs layers / Contexto en capas"""
+    import tracemalloc
+    from modules.context_builder import ContextBuilder
+
+    builder = ContextBuilder(load_plugin(PLUGIN_ID))
+    texts = builder.plugin.texts.get("text_blocks", {})
+    rng = random.Random(5)
+    letters = []
+    for record in random_records(max(size // 1000, 10)):
+        lists = {f"anexo_{n}": [{"concepto": f"c{i}", "importe": i} for i in range(2000)] for n in range(10)}
+        lists["lista_alto_directores"] = [
+            {"nombre": f"Director {i}", "cargo": rng.choice(["CEO", "CFO", "COO"])} for i in range(2000)
+        ]
+        letters.append((record, lists))
+
+    def copied(form, lists):
+        # generate_from_form, build_context and its passes before the layers
+        data = dict(form)
+        data.update(lists)
+        context = builder.calculate_derived_fields(data)
+        context.update(builder._formatted_layer(context))
+        context["texts"] = texts
+        for key, value in context.items():
+            if value is None:
+                context[key] = ""
+        return context
+
+    def layered(form, lists):
+        # generate_from_form still combines the form values and lists in one dict
+        data = dict(form)
+        data.update(lists)
+        return builder.build_context(data)
+
+    def read_scalars(context):
+        return [context[key] for key in letters[0][0]]
+
+    def peak_kib(build):
+        tracemalloc.start()
+        contexts = [build(form, lists) for form, lists in letters]
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        del contexts
+        return peak / 1024
+
+    print(f"[context] {len(letters)} letters, 11 lists of 2000 items each")
+    report("build: copies -> layers",
+           timed(lambda: [copied(f, l) for f, l in letters]), timed(lambda: [layered(f, l) for f, l in letters]))
+    report("build + read input fields: copies -> layers",
+           timed(lambda: [read_scalars(copied(f, l)) for f, l in letters]),
+           timed(lambda: [read_scalars(layered(f, l)) for f, l in letters]))
+    print(f"  peak memory of all contexts: {peak_kib(copied):.0f} KiB -> {peak_kib(layered):.0f} KiB")
+
+
+def bench_placeholders(size: int) -> None:
+    """Variable replacement: every context key vs placeholders present / Marcadores"""
+    import io
+    import re
+    from docx import Document
+    from modules.generate import preprocess_input
+    from modules.renderer_docx import DocxRenderer
+
+    plugin = load_plugin(PLUGIN_ID)
+    renderer = DocxRenderer(plugin)
+    doc = Document(io.BytesIO(plugin.get_template_bytes()))
+    texts = [p.text for p in doc.paragraphs if p.text.strip()]
+    records = [preprocess_input(r, plugin) for r in random_records(max(size // 10000, 5))]
+
+    def every_key(text, variables):
+        # _replace_variables before the placeholder lookup: 3 patterns per key
+        for var_name, var_value in variables.items():
+            if var_name in ('lista_alto_directores', 'visibility', 'texts'):
+                continue
+            for pattern in (rf'\{{\{{\s*{re.escape(var_name)}\s*\}}\}}',
+                            rf'\{{\{{\s*{re.escape(var_name)}\s*\|\s*int\s*\}}\}}',
+                            rf'\{{\{{\s*{re.escape(var_name)}\s*\|\s*int\s*-\s*1\s*\}}\}}'):
+                text = re.sub(pattern, str(var_value) if var_value else '', text)
+        return text
+
+    def render_texts(replace):
+        for record in records:
+            context = renderer.context_builder.build_context(record)
+            for text in texts:
+                replace(text, context)
+
+    print(f"[placeholders] {len(records)} letters x {len(texts)} template paragraphs")
+    report("all context keys -> placeholders present",
+           timed(lambda: render_texts(every_key), 1),
+           timed(lambda: render_texts(lambda text, context: renderer._replace_variables(text, context, {}))))
+
+
+def bench_tables(size: int) -> None:
+    """List table of 1000 rows: add_row per row vs cloned prototype rows / Tablas"""
+    from docx import Document
+    from modules.docx_tables import build_table, list_table_definitions, table_rows
+
+    table_def = list_table_definitions(load_plugin(PLUGIN_ID))["lista_alto_directores"]
+    items = [{"nombre": f"Director {i}", "cargo": "Consejero"} for i in range(1000)]
+
+    def add_rows():
+        doc = Document()
+        table = doc.add_table(rows=1, cols=len(table_def["columns"]))
+        for cell, column in zip(table.rows[0].cells, table_def["columns"]):
+            cell.text = column["label"]
+        for item in items:
+            cells = table.add_row().cells
+            for cell, column in zip(cells, table_def["columns"]):
+                cell.text = item[column["name"]]
+
+    def cloned_rows():
+        doc = Document()
+        doc.element.body.append(build_table(table_def, table_rows(table_def, items), 9000))
+
+    print(f"[tables] {len(items)} rows")
+    report("table.add_row() -> cloned prototype rows", timed(add_rows), timed(cloned_rows))
+
+
+def bench_aggregates(size: int) -> None:
+    """Five aggregates of one list: a walk per formula vs shared column / Agregados"""
+    from modules.formula_engine import _number, compile_formula
+
+    lineas = [{"importe": str(i % 97), "tipo": {"iva": 21}} for i in range(size)]
+    context = {"lineas": lineas}
+    names = ("sum", "count", "min", "max", "avg")
+    formulas = [compile_formula(f"{name}(lineas.importe)", {}) for name in names]
+
+    def walk_per_formula():
+        for name in names:
+            values = [item.get("importe") for item in context["lineas"]]
+            present = [value for value in values if value is not None]
+            numbers = [n for n in map(_number, present) if n is not None]
+            if name == "count":
+                len(present)
+            elif name == "avg":
+                sum(numbers) / len(numbers)
+            else:
+                {"sum": sum, "min": min, "max": max}[name](numbers)
+
+    def shared_column():
+        # One columns dict per context build: one walk of the list
+        columns = {}
+        for formula in formulas:
+            formula(context, columns)
+
+    print(f"[aggregates] {len(names)} aggregates of {size} items")
+    report("walk per formula -> shared column", timed(walk_per_formula), timed(shared_column))
+
+
+def bench_list_text(size: int) -> None:
+    """5000 directors spliced 20 times: slicing per match vs one join / Listas"""
+    from modules.renderer_docx import _PLACEHOLDER, DocxRenderer
+
+    plugin = load_plugin(PLUGIN_ID)
+    renderer = DocxRenderer(plugin)
+    directors = [{"nombre": f"Director {i}", "cargo": "Consejero"} for i in range(5000)]
+    text = " ".join(['{{lista_alto_directores: "Nombre": Cargo}} {{ Nombre_Cliente }}'] * 20)
+    variables = {"Nombre_Cliente": "ACME"}
+
+    def sliced():
+        lines = []
+        for director in directors:
+            if director.get("nombre") and director.get("cargo"):
+                lines.append(f"{' ' * 34} D. {director['nombre']} - {director['cargo']}")
+        value = "\n".join(lines)
+        result = text
+        for match in reversed(list(re.finditer(r'\{\{lista_alto_directores:[^}]+\}\}', result))):
+            result = result[:match.start()] + value + result[match.end():]
+        result = _PLACEHOLDER.sub(lambda match: variables.get(match.group(1), ""), result)
+        for pattern in (r'\[?\{\{[^}]*\}\}\]?', r'\[\]\.mark', r'\.mark', r'\[\.mark\]'):
+            result = re.sub(pattern, '', result)
+
+    def one_join():
+        renderer._replace_variables(text, variables, {}, renderer._list_segments({"lista_alto_directores": directors}))
+
+    print(f"[list_text] {len(directors)} items, 20 occurrences")
+    report("slice per match -> segments + one join", timed(sliced), timed(one_join))
+
+
+BENCHMARKS: Dict[str, Callable[[int], None]] = {
+    "dsl_batch": bench_dsl_batch,
+    "normalize": bench_normalize,
+    "paths": bench_paths,
+    "dispatch": bench_dispatch,
+    "dag": bench_dag,
+    "trace": bench_trace,
+    "trace_store": bench_trace_store,
+    "profiler": bench_profiler,
+    "visibility": bench_visibility,
+    "rule_batch": bench_rule_batch,
+    "dates": bench_dates,
+    "numbers": bench_numbers,
+    "context": bench_context,
+    "placeholders": bench_placeholders,
+    "tables": bench_tables,
+    "aggregates": bench_aggregates,
+    "list_text": bench_list_text,
+}
+
+
+def main():
+    """Main CLI entry point / Punto de entrada CLI principal"""
+    parser = argparse.ArgumentParser(
+        description="Run performance benchmarks"
+    )
+
+    parser.add_argument(
+        "benchmarks",
+        nargs="*",
+        help=f"Benchmarks to run (default: all). Available: {', '.join(BENCHMARKS)}"
+    )
+
+    parser.add_argument(
+        "--size",
+        "-n",
+        type=int,
+        default=100_000,
+        help="Number of records/items (default: 100000)"
+    )
+
+    args = parser.parse_args()
+
+    selected = args.benchmarks or list(BENCHMARKS)
+    for name in selected:
+        if name not in BENCHMARKS:
+            print(f"Error: Unknown benchmark: {name}")
+            return 1
+
+    for name in selected:
+        BENCHMARKS[name](args.size)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,6 +15,8 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 from modules.generate import generate
 from modules.plugin_loader import load_plugin, list_available_plugins
+from modules.rule_profiler import enable_profiling
+from modules.trace_store import TraceStore
 
 
 def main():
@@ -62,6 +64,16 @@ def main():
         help="List available plugins and exit"
     )
 
+    parser.add_argument(
+        "--trace-db",
+        help="Log the trace to this SQLite trace store (see trace_lookup.py)"
+    )
+
+    parser.add_argument(
+        "--rule-profile",
+        help="Write rule evaluation counters to this file (.csv or .json)"
+    )
+
     args = parser.parse_args()
 
     # List plugins if requested
@@ -97,17 +109,29 @@ def main():
     print(f"Input data: {data_path}")
     print(f"Output directory: {output_dir}")
 
+    profiler = enable_profiling() if args.rule_profile else None
+    trace_store = TraceStore(Path(args.trace_db)) if args.trace_db else None
     result = generate(
         plugin_id=args.plugin,
         data=data,
         output_dir=output_dir,
         template_path=template_path,
-        should_validate=not args.no_validate
+        should_validate=not args.no_validate,
+        trace_store=trace_store
     )
+    if trace_store is not None:
+        trace_store.close()
+    if profiler is not None:
+        profile_path = Path(args.rule_profile)
+        if profile_path.suffix.lower() == ".csv":
+            profiler.to_csv(profile_path)
+        else:
+            profiler.to_json(profile_path)
 
     if result.success:
         print(f"\nSuccess! Document generated: {result.output_path}")
         print(f"Trace ID: {result.trace_id}")
+        print(f"Plugin fingerprint: {result.plugin_fingerprint}")
         print(f"Duration: {result.duration_ms}ms")
         return 0
     else:
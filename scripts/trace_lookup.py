@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+CLI script to query the trace store
+Script CLI para consultar el registro de trazas
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from modules.plugin_loader import load_plugin
+from modules.trace_store import DEFAULT_TRACE_DB, TraceRecord, TraceStore
+
+
+def print_record(record: TraceRecord, expand: bool = False) -> None:
+    """
+    Print one stored trace / Imprimir una traza almacenada
+
+    The bits are only expanded into rules with the plugin configuration
+    the trace was recorded with: when the current fingerprint differs,
+    bit i may name another rule, so the raw bits are printed instead.
+    """
+    print(f"\n{'='*60}")
+    print(f"Trace ID: {record.trace_id}")
+    print(f"{'='*60}")
+    print(f"  Created:     {record.created_at}")
+    print(f"  Plugin:      {record.plugin_id} ({record.plugin_fingerprint})")
+    print(f"  Client:      {record.client_name}")
+    print(f"  Date:        {record.document_date}")
+    print(f"  Success:     {record.success}")
+    print(f"  Output:      {record.output_path}")
+    print(f"  Input hash:  {record.input_hash}")
+
+    if record.compact_trace is None:
+        return
+
+    plugin = load_plugin(record.plugin_id) if expand else None
+    if plugin is not None and plugin.fingerprint != record.plugin_fingerprint:
+        print(f"  Warning: plugin changed since this trace was stored (now {plugin.fingerprint}), not expanding")
+        plugin = None
+
+    if plugin is None:
+        for decision_id, bits in zip(record.compact_trace.decision_ids, record.compact_trace.hits):
+            print(f"  {decision_id}: {bits:#b}")
+        return
+
+    for trace in record.compact_trace.expand(plugin):
+        print(f"  [{trace.decision_id}] {trace.outcome}")
+        for hit in trace.rule_hits:
+            print(f"    {'x' if hit.condition_met else ' '} {hit.rule_id}")
+
+
+def main():
+    """Main CLI entry point / Punto de entrada CLI principal"""
+    parser = argparse.ArgumentParser(
+        description="Look up generated documents in the trace store"
+    )
+
+    parser.add_argument(
+        "trace_id",
+        nargs="?",
+        help="Trace ID to look up"
+    )
+
+    parser.add_argument(
+        "--client",
+        "-c",
+        help="Filter by client name"
+    )
+
+    parser.add_argument(
+        "--from",
+        dest="date_from",
+        help="Earliest document date (YYYY-MM-DD)"
+    )
+
+    parser.add_argument(
+        "--to",
+        dest="date_to",
+        help="Latest document date (YYYY-MM-DD)"
+    )
+
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=20,
+        help="Maximum number of results (default: 20)"
+    )
+
+    parser.add_argument(
+        "--expand",
+        "-e",
+        action="store_true",
+        help="Show individual rule hits (only if the plugin is unchanged since the trace)"
+    )
+
+    parser.add_argument(
+        "--db",
+        default=str(DEFAULT_TRACE_DB),
+        help=f"Trace store path (default: {DEFAULT_TRACE_DB})"
+    )
+
+    args = parser.parse_args()
+
+    db_path = Path(args.db)
+    if not db_path.exists():
+        print(f"Error: Trace store not found: {db_path}")
+        return 1
+
+    with TraceStore(db_path) as store:
+        if args.trace_id:
+            record = store.get(args.trace_id)
+            if record is None:
+                print(f"Error: Trace not found: {args.trace_id}")
+                return 1
+            records = [record]
+        else:
+            records = store.find(args.client, args.date_from, args.date_to, args.limit)
+
+    if not records:
+        print("No traces found")
+        return 0
+
+    for record in records:
+        print_record(record, args.expand)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+"""
+Shared helpers for the test suite
+Utilidades compartidas por los tests
+"""
+
+import random
+
+from modules.dsl_evaluator import ALLOWED_OPERATORS
+
+
+# Pools for fuzzed conditions and records
+FUZZ_FIELDS = ["a", "b", "c.d", "lst.0", "missing"]
+FUZZ_VALUES = [True, False, "si", "No", "YES", "true", "x", "", 0, 1, 2.5, "3", "-1", None, "abc", [1, "x"], {}]
+COMPARISON_OPERATORS = sorted(ALLOWED_OPERATORS - {"and", "or", "not"})
+
+
+def random_condition(rng: random.Random, depth: int = 0) -> dict:
+    """Build a random valid condition / Construir una condicion valida aleatoria"""
+    if depth < 3 and rng.random() < 0.3:
+        operator = rng.choice(["and", "or", "not"])
+        if operator == "not":
+            return {"operator": "not", "condition": random_condition(rng, depth + 1)}
+        count = rng.randint(0, 3)
+        return {"operator": operator, "conditions": [random_condition(rng, depth + 1) for _ in range(count)]}
+
+    operator = rng.choice(COMPARISON_OPERATORS)
+    condition = {"operator": operator, "field": rng.choice(FUZZ_FIELDS)}
+    if operator in ("in", "not_in"):
+        condition["values"] = rng.sample([v for v in FUZZ_VALUES if not isinstance(v, (list, dict))], 3)
+    else:
+        condition["value"] = rng.choice(FUZZ_VALUES)
+    return condition
+
+
+def random_record(rng: random.Random) -> dict:
+    """Build a random record / Construir un registro aleatorio"""
+    return {
+        "a": rng.choice(FUZZ_VALUES),
+        "b": rng.choice(FUZZ_VALUES),
+        "c": {"d": rng.choice(FUZZ_VALUES)},
+        "lst": [rng.choice(FUZZ_VALUES)],
+    }
@@ -0,0 +1,68 @@
+"""
+Tests for the condition DAG
+Tests para el DAG de condiciones
+"""
+
+import pytest
+import random
+import sys
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from modules.condition_dag import ConditionDAG
+from modules.dsl_evaluator import compile_condition, DSLEvaluationError
+from modules.plugin_loader import load_plugin
+from modules.rule_engine import RuleEngine
+from tests.helpers import random_condition, random_record
+
+
+def test_fuzzed_conditions_match_compiled():
+    rng = random.Random(8)
+    dag = ConditionDAG()
+    conditions = [random_condition(rng) for _ in range(300)]
+    # Reuse sub-conditions so the DAG actually shares nodes
+    conditions += [{"operator": "and", "conditions": rng.sample(conditions, 2)} for _ in range(100)]
+    nodes = [dag.add(c) for c in conditions]
+
+    for _ in range(50):
+        record = random_record(rng)
+        session = dag.session(record)
+        for condition, node in zip(conditions, nodes):
+            assert session.value(node) == compile_condition(condition)(record), condition
+
+
+def test_identical_subconditions_are_shared():
+    dag = ConditionDAG()
+    leaf = {"operator": "equals", "field": "incorreccion", "value": True}
+    first = dag.add(leaf)
+    second = dag.add({"operator": "and", "conditions": [
+        dict(leaf), {"operator": "equals", "field": "limitacion_alcance", "value": True}
+    ]})
+    assert len(dag) == 3
+    assert dag.add({"value": True, "operator": "equals", "field": "incorreccion"}) == first
+
+    session = dag.session({"incorreccion": True, "limitacion_alcance": False})
+    assert session.value(first) is True
+    assert session.value(second) is False
+    stats = session.stats
+    assert (stats.nodes, stats.evaluated, stats.reused) == (3, 3, 1)
+
+
+def test_invalid_condition_is_rejected():
+    with pytest.raises(DSLEvaluationError):
+        ConditionDAG().add({"operator": "not", "condition": {"operator": "exec"}})
+
+
+def test_rule_engine_reports_saved_evaluations():
+    engine = RuleEngine(load_plugin("carta_manifestacion"))
+    engine.evaluate_all_rules({"incorreccion": True, "limitacion_alcance": True, "organo": "consejo"})
+    # r005_limitacion reuses the incorreccion leaf evaluated for r004
+    assert engine.last_stats.reused >= 1
+    assert engine.last_stats.evaluated <= engine.last_stats.nodes
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,91 @@
+"""
+Tests for list fields rendered as Word tables
+Tests para campos de lista renderizados como tablas de Word
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from docx import Document
+from docx.oxml.ns import qn
+from docx.table import Table
+
+from modules.docx_tables import _column_shares, build_table, list_table_definitions, table_rows
+from modules.generate import generate
+from modules.plugin_loader import PluginPack, load_plugin
+
+
+DIRECTORES = {
+    "columns": [
+        {"name": "nombre", "label": "Nombre", "width": "60%"},
+        {"name": "cargo", "label": "Cargo", "width": "40%"},
+    ],
+    "source_field": "lista_alto_directores",
+}
+
+
+class TestTableRows:
+    """Cell texts and widths / Textos de celda y anchos"""
+
+    def test_rows_from_dicts_and_strings(self):
+        items = [{"nombre": "Ana", "cargo": "CEO"}, {"nombre": "Luis"}, {}, "D. Eva - CFO", None]
+        assert table_rows(DIRECTORES, items) == [("Ana", "CEO"), ("Luis", ""), ("D. Eva - CFO", "")]
+        assert table_rows(DIRECTORES, "texto") == []
+
+    def test_column_shares(self):
+        assert _column_shares(DIRECTORES["columns"]) == [0.6, 0.4]
+        assert _column_shares([{"name": "a", "width": "50%"}, {"name": "b"}, {"name": "c"}]) == [0.5, 0.25, 0.25]
+        assert _column_shares([{"name": "a"}, {"name": "b"}]) == [0.5, 0.5]
+
+    def test_shipped_definition(self):
+        assert set(list_table_definitions(load_plugin("carta_manifestacion"))) == {"lista_alto_directores"}
+
+
+class TestBuildTable:
+    """w:tbl built from a prototype row / w:tbl desde una fila prototipo"""
+
+    def test_header_and_rows(self):
+        rows = [(f"Director {i}", "CFO" if i % 2 else "CEO") for i in range(1000)]
+        table = Table(build_table(DIRECTORES, rows, 9000), None)
+        assert len(table.rows) == 1001
+        assert [c.text for c in table.rows[0].cells] == ["Nombre", "Cargo"]
+        assert [c.text for c in table.rows[1000].cells] == ["Director 999", "CFO"]
+        assert [int(col.get(qn("w:w"))) for col in table._tbl.tblGrid] == [5400, 3600]
+
+    def test_special_characters_are_kept(self):
+        table = Table(build_table(DIRECTORES, [("Peña & <Hijos>", "  CEO ")]), None)
+        assert [c.text for c in table.rows[1].cells] == ["Peña & <Hijos>", "  CEO "]
+
+
+class TestRender:
+    """Generated letters / Cartas generadas"""
+
+    DATA = {"Nombre_Cliente": "ACME", "FF_Ejecicio": "31/12/2025",
+            "lista_alto_directores": [{"nombre": f"Director {i}", "cargo": "CEO"} for i in range(150)]}
+
+    def test_list_placeholder_becomes_table(self, tmp_path):
+        result = generate("carta_manifestacion", self.DATA, output_dir=tmp_path, should_validate=False)
+        assert result.success, result.error
+        doc = Document(result.output_path)
+        tables = [t for t in doc.tables if t.rows[0].cells[0].text == "Nombre"]
+        assert len(tables) == 1 and len(tables[0].rows) == 151
+        assert not any("Director 0" in p.text or "lista_alto_directores" in p.text for p in doc.paragraphs)
+
+    def test_render_text_keeps_indented_list(self, tmp_path):
+        (tmp_path / "tables.yaml").write_text(
+            "tables:\n"
+            "  directores:\n"
+            "    source_field: lista_alto_directores\n"
+            "    render: text\n"
+            "    columns: [{name: nombre}, {name: cargo}]\n"
+        )
+        assert list_table_definitions(PluginPack("text_lists", base_path=tmp_path)) == {}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
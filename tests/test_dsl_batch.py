@@ -0,0 +1,110 @@
+"""
+Tests for vectorized DSL evaluation
+Tests para la evaluacion vectorizada del DSL
+"""
+
+import pytest
+import random
+import sys
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+np = pytest.importorskip("numpy")
+
+from modules.dsl_evaluator import evaluate_condition
+from modules.dsl_batch import ColumnBatch, evaluate_condition_batch
+from modules.plugin_loader import load_plugin
+from tests.helpers import random_condition, random_record
+
+
+def records_to_columns(records):
+    """Turn row dicts into object columns / Convertir filas en columnas"""
+    names = sorted({key for record in records for key in record})
+    return {name: [record.get(name) for record in records] for name in names}
+
+
+def assert_matches_scalar(condition, records, columns):
+    mask = evaluate_condition_batch(condition, columns)
+    expected = [evaluate_condition(condition, record) for record in records]
+    assert mask.dtype == bool
+    assert mask.tolist() == expected, condition
+
+
+class TestEvaluateConditionBatch:
+    """Row-for-row comparison with evaluate_condition"""
+
+    def test_fuzzed_conditions_on_object_columns(self):
+        rng = random.Random(3)
+        records = [random_record(rng) for _ in range(300)]
+        batch = ColumnBatch(records_to_columns(records))
+        for _ in range(300):
+            assert_matches_scalar(random_condition(rng), records, batch)
+
+    def test_typed_numpy_columns(self):
+        rng = random.Random(5)
+        size = 200
+        columns = {
+            "a": np.array([rng.randint(-2, 3) for _ in range(size)]),
+            "b": np.array([rng.choice([0.5, 1.0, float("nan"), 3.0]) for _ in range(size)]),
+            "c": np.array([rng.choice([True, False]) for _ in range(size)]),
+            "d": np.array([rng.choice(["si", "No", "x", "", "3", "abc"]) for _ in range(size)]),
+        }
+        records = [{name: column[i].item() for name, column in columns.items()} for i in range(size)]
+        batch = ColumnBatch(columns)
+
+        fields = ["a", "b", "c", "d", "missing"]
+        values = [True, False, "si", "x", "", 0, 1, 2.5, "3", None, "ab"]
+        for operator in ["equals", "not_equals", "gt", "gte", "lt", "lte", "exists", "not_exists",
+                         "is_empty", "not_empty", "contains", "not_contains"]:
+            for field in fields:
+                for value in values:
+                    condition = {"operator": operator, "field": field, "value": value}
+                    assert_matches_scalar(condition, records, batch)
+        for field in fields:
+            for members in ([1, "x"], [True, None], ["si", "abc", 0.5]):
+                for operator in ("in", "not_in"):
+                    condition = {"operator": operator, "field": field, "values": members}
+                    assert_matches_scalar(condition, records, batch)
+
+    def test_shipped_rules(self):
+        plugin = load_plugin("carta_manifestacion")
+        rng = random.Random(11)
+        bool_values = [True, False, "si", "no", "Yes", "", None]
+        fields = {
+            rule["condition"].get("field")
+            for rule in plugin.logic["rules"].values()
+            if rule["condition"].get("field")
+        } | {"limitacion_alcance"}
+        records = []
+        for _ in range(500):
+            record = {field: rng.choice(bool_values) for field in fields}
+            record["organo"] = rng.choice(["consejo", "administrador_unico", "administradores", None])
+            records.append(record)
+
+        batch = ColumnBatch(records_to_columns(records))
+        for rule in plugin.logic["rules"].values():
+            assert_matches_scalar(rule["condition"], records, batch)
+
+    def test_dataframe_input(self):
+        pd = pytest.importorskip("pandas")
+        df = pd.DataFrame({"organo": ["consejo", "administradores", None], "count": [1, 5, 10]})
+        condition = {
+            "operator": "and",
+            "conditions": [
+                {"operator": "in", "field": "organo", "values": ["consejo", "administradores"]},
+                {"operator": "gte", "field": "count", "value": "2"},
+            ],
+        }
+        assert evaluate_condition_batch(condition, df).tolist() == [False, True, False]
+
+    def test_dotted_column_name(self):
+        columns = {"servicio.enabled": ["si", "no", None]}
+        condition = {"operator": "equals", "field": "servicio.enabled", "value": True}
+        assert evaluate_condition_batch(condition, columns).tolist() == [True, False, False]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -4,6 +4,7 @@ Tests para el evaluador DSL
 """
 
 import pytest
+import random
 import sys
 from pathlib import Path
 
@@ -11,7 +12,12 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from modules.dsl_evaluator import evaluate_condition, get_nested_value, DSLEvaluationError
+from modules.dsl_evaluator import (
+    evaluate_condition, get_nested_value, set_nested_value, compile_path, compile_setter, DSLEvaluationError,
+    compile_condition, condition_key, condition_fields, field_root,
+)
+from modules.plugin_loader import load_plugin
+from tests.helpers import random_condition, random_record
 
 
 class TestGetNestedValue:
@@ -150,5 +156,166 @@ class TestEvaluateCondition:
         assert evaluate_condition(condition, data) is True
 
 
+class TestCompileCondition:
+    """Differential tests: compile_condition vs evaluate_condition"""
+
+    def test_shipped_conditions(self):
+        plugin = load_plugin("carta_manifestacion")
+        conditions = [rule.get("condition") for rule in plugin.logic["rules"].values()]
+        for spec in plugin.fields["fields"].values():
+            conditions.extend(spec[key] for key in ("condition", "editable_when") if key in spec)
+
+        rng = random.Random(7)
+        bool_values = [True, False, "si", "no", "sí", "true", "", None]
+        records = [
+            {
+                "incorreccion": rng.choice(bool_values),
+                "limitacion_alcance": rng.choice(bool_values),
+                "experto": rng.choice(bool_values),
+                "comision": rng.choice(bool_values),
+                "organo": rng.choice(["consejo", "administrador_unico", "administradores", "otro", None]),
+                "Oficina_Seleccionada": rng.choice(["BARCELONA", "PERSONALIZADA", ""]),
+            }
+            for _ in range(200)
+        ]
+
+        for condition in conditions:
+            predicate = compile_condition(condition)
+            for record in records:
+                assert predicate(record) == evaluate_condition(condition, record), (condition, record)
+
+    def test_fuzzed_conditions(self):
+        rng = random.Random(42)
+        for _ in range(500):
+            condition = random_condition(rng)
+            predicate = compile_condition(condition)
+            for _ in range(20):
+                record = random_record(rng)
+                assert predicate(record) == evaluate_condition(condition, record), (condition, record)
+
+    def test_memoized_by_structure(self):
+        first = compile_condition({"operator": "equals", "field": "a", "value": 1})
+        second = compile_condition({"value": 1, "field": "a", "operator": "equals"})
+        assert first is second
+
+    def test_key_keeps_scalar_types(self):
+        assert condition_key({"value": 1}) != condition_key({"value": True})
+
+    def test_invalid_operator_fails_at_compile_time(self):
+        with pytest.raises(DSLEvaluationError):
+            compile_condition({"operator": "or", "conditions": [{"operator": "exec", "field": "a"}]})
+
+    def test_empty_condition(self):
+        assert compile_condition({})({}) is True
+        assert compile_condition(None)({}) is True
+
+
+class TestConditionFields:
+    """Tests for static field dependency extraction"""
+
+    def test_nested_condition(self):
+        condition = {
+            "operator": "and",
+            "conditions": [
+                {"operator": "equals", "field": "a", "value": True},
+                {"operator": "not", "condition": {"operator": "in", "field": "c.d", "values": [1]}},
+                {"operator": "or", "conditions": []},
+            ]
+        }
+        assert condition_fields(condition) == {"a", "c.d"}
+
+    def test_empty_condition(self):
+        assert condition_fields({}) == frozenset()
+        assert condition_fields(None) == frozenset()
+
+    def test_fuzzed_fields_outside_dependencies_do_not_matter(self):
+        rng = random.Random(11)
+        for _ in range(300):
+            condition = random_condition(rng)
+            roots = {field_root(f) for f in condition_fields(condition)}
+            record = random_record(rng)
+            other = random_record(rng)
+            # Keep dependencies, change everything else
+            mixed = {k: (record[k] if k in roots else other[k]) for k in record}
+            assert evaluate_condition(condition, mixed) == evaluate_condition(condition, record), condition
+
+
+def reference_get(data, path):
+    """Split-per-call lookup kept as the reference / Referencia sin cache"""
+    if not path or not data:
+        return None
+    value = data
+    for key in path.split("."):
+        if isinstance(value, dict):
+            value = value.get(key)
+        elif isinstance(value, list):
+            try:
+                index = int(key)
+                value = value[index] if 0 <= index < len(value) else None
+            except ValueError:
+                return None
+        else:
+            return None
+        if value is None:
+            return None
+    return value
+
+
+def reference_set(data, path, value):
+    if not path:
+        return
+    keys = path.split(".")
+    current = data
+    for key in keys[:-1]:
+        if key not in current:
+            current[key] = {}
+        current = current[key]
+    current[keys[-1]] = value
+
+
+class TestCompiledPaths:
+    """Property tests: compiled accessors vs split-per-call lookup"""
+
+    SEGMENTS = ["a", "b", "0", "1", "-1", "x", ""]
+
+    def random_tree(self, rng, depth=0):
+        if depth > 2 or rng.random() < 0.3:
+            return rng.choice([None, 0, "", "v", False, 3])
+        if rng.random() < 0.5:
+            return [self.random_tree(rng, depth + 1) for _ in range(rng.randint(0, 2))]
+        return {k: self.random_tree(rng, depth + 1) for k in rng.sample(self.SEGMENTS, 3)}
+
+    def random_path(self, rng):
+        return ".".join(rng.choice(self.SEGMENTS) for _ in range(rng.randint(1, 3)))
+
+    def test_get_matches_reference(self):
+        rng = random.Random(21)
+        for _ in range(3000):
+            data = self.random_tree(rng)
+            path = self.random_path(rng)
+            assert get_nested_value(data, path) == reference_get(data, path), (data, path)
+            if data:
+                assert compile_path(path)(data) == reference_get(data, path), (data, path)
+
+    def test_set_matches_reference(self):
+        rng = random.Random(22)
+        for _ in range(1000):
+            paths = [".".join(rng.choice(["a", "b", "c"]) for _ in range(rng.randint(1, 3))) for _ in range(3)]
+            expected, actual = {}, {}
+            for i, path in enumerate(paths):
+                try:
+                    reference_set(expected, path, i)
+                except TypeError as e:
+                    with pytest.raises(type(e)):
+                        set_nested_value(actual, path, i)
+                    break
+                set_nested_value(actual, path, i)
+            assert actual == expected, paths
+
+    def test_accessors_are_cached(self):
+        assert compile_path("a.b") is compile_path("a.b")
+        assert compile_setter("a.b") is compile_setter("a.b")
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,299 @@
+"""
+Tests for shared date parsing and formatting
+Tests para el analisis de fechas y formateo compartidos
+"""
+
+import pytest
+import random
+import re
+import sys
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from modules.formatters import (
+    DATE_FORMATS, DEFAULT_NUMBER_FORMATS, MONTH_NAMES, NUMERIC_DATE_FORMATS, SPANISH_MONTHS,
+    compile_list_format, compile_number_format, format_date, format_long_date, parse_date, parse_date_column,
+)
+from modules.context_builder import ContextBuilder, format_currency_eur, format_percentage, list_formatters
+from modules.plugin_loader import PluginPack, load_plugin
+
+
+def strptime_loop(value, formats):
+    """Sequential strptime loop the parser replaces, for numeric formats"""
+    for fmt in formats:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def legacy_spanish(value):
+    """Regex the validator used for '31 de diciembre de 2025'"""
+    match = re.match(r"(\d{1,2})\s+de\s+(\w+)\s+de\s+(\d{4})", value.lower().strip())
+    if match and match.group(2) in SPANISH_MONTHS:
+        try:
+            return date(int(match.group(3)), SPANISH_MONTHS.index(match.group(2)) + 1, int(match.group(1)))
+        except ValueError:
+            pass
+    return None
+
+
+def random_date_string(rng):
+    pieces = [
+        str(rng.randint(0, 40)), f"{rng.randint(0, 13):02d}", str(rng.randint(1, 12)),
+        str(rng.randint(1900, 2100)), f" {rng.randint(1, 9)}", "", "2025", "0029",
+    ]
+    separator = rng.choice(["/", "-", ".", " ", "/"])
+    return separator.join(rng.choice(pieces) for _ in range(3)) + rng.choice(["", "", " ", "x"])
+
+
+class TestParseDate:
+    """Cross-check against strptime / Comprobacion contra strptime"""
+
+    def test_matches_strptime_on_numeric_formats(self):
+        numeric = tuple(fmt for fmt in DATE_FORMATS if "%B" not in fmt)
+        rng = random.Random(12)
+        for _ in range(5000):
+            value = random_date_string(rng)
+            assert parse_date(value, numeric) == strptime_loop(value, numeric), value
+            assert parse_date(value, NUMERIC_DATE_FORMATS) == strptime_loop(value, NUMERIC_DATE_FORMATS), value
+
+    @pytest.mark.parametrize("value", [
+        "31/12/2025", "2025-12-31", "1/2/2025", " 1/2/2025", "31/02/2025", "12/31/2025",
+        "2025.12.31", "0/1/2025", "1/1/25", "31-12-2025 ", "",
+    ])
+    def test_edge_cases_match_strptime(self, value):
+        numeric = tuple(fmt for fmt in DATE_FORMATS if "%B" not in fmt)
+        assert parse_date(value, numeric) == strptime_loop(value, numeric)
+
+    @pytest.mark.parametrize("value", [
+        "31 de diciembre de 2025", "1 de Enero de 2024", "31 DE MARZO DE 2026", "30 de febrero de 2025",
+        "31 de december de 2025", "5  de  mayo  de  2020",
+    ])
+    def test_spanish_month_names(self, value):
+        assert parse_date(value) == legacy_spanish(value)
+
+    def test_date_objects_and_other_types(self):
+        assert parse_date(date(2025, 1, 2)) == date(2025, 1, 2)
+        assert parse_date(datetime(2025, 1, 2, 10, 30)) == date(2025, 1, 2)
+        assert parse_date(None) is None
+        assert parse_date(20250102) is None
+
+    def test_column_matches_per_value_parsing(self):
+        rng = random.Random(13)
+        values = [f"{rng.randint(1, 28)}/{rng.randint(1, 12)}/2025" for _ in range(200)]
+        values += ["2025-03-04", None, "", "no es fecha", date(2020, 1, 1), "31 de enero de 2024"]
+        rng.shuffle(values)
+        assert parse_date_column(values) == [parse_date(v) for v in values]
+        assert parse_date_column(values, NUMERIC_DATE_FORMATS) == [parse_date(v, NUMERIC_DATE_FORMATS) for v in values]
+
+
+class TestFormatDate:
+    """Locale-free month names / Nombres de meses sin locale"""
+
+    @pytest.mark.parametrize("language, expected", [
+        ("es", "1 de abril de 2025"),
+        ("ca", "1 d'abril de 2025"),
+        ("gl", "1 de abril de 2025"),
+        ("eu", "2025(e)ko apirilaren 1(a)"),
+    ])
+    def test_long_date_per_language(self, language, expected):
+        assert format_long_date(date(2025, 4, 1), language) == expected
+
+    def test_catalan_elision_only_before_vowels(self):
+        assert format_long_date(date(2025, 10, 5), "ca") == "5 d'octubre de 2025"
+        assert format_long_date(date(2025, 3, 5), "ca") == "5 de març de 2025"
+
+    def test_format_date_directives(self):
+        value = datetime(2025, 3, 5, 10, 30)
+        assert format_date(value) == "05 de marzo de 2025"
+        assert format_date(value, "%-d/%m/%Y 100%%") == "5/03/2025 100%"
+        with pytest.raises(ValueError):
+            format_date(value, "%H:%M")
+
+    def test_round_trip_and_no_locale_dependency(self):
+        # Every month of es/ca/gl parses back whatever LC_TIME is
+        for language in ("es", "ca", "gl"):
+            for month in range(1, 13):
+                value = date(2024, month, 28)
+                assert parse_date(format_long_date(value, language)) == value, (language, month)
+        assert len(MONTH_NAMES["eu"]) == 12
+
+    def test_month_names_from_formatting_yaml(self, tmp_path):
+        months = [f"mes{n}" for n in range(1, 13)]
+        (tmp_path / "formatting.yaml").write_text(
+            "fields:\n"
+            "  fecha: {type: date, format: spanish}\n"
+            "  data: {type: date, format: catalan}\n"
+            f"spanish_months: {months}\n"
+        )
+        builder = ContextBuilder(PluginPack("months", base_path=tmp_path))
+        context = builder.build_context({"fecha": date(2025, 2, 3), "data": "01/08/2025"})
+        assert context["fecha"] == "3 de mes2 de 2025"
+        assert context["data"] == "1 d'agost de 2025"
+
+
+def legacy_number(value, places):
+    """The str.replace formatting the compiled formats replace"""
+    return f"{value:,.{places}f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+class TestNumberFormats:
+    """Compiled number_formats / Formatos numericos compilados"""
+
+    def test_matches_legacy_replacements(self):
+        currency = compile_number_format(DEFAULT_NUMBER_FORMATS["currency"])
+        integer = compile_number_format(DEFAULT_NUMBER_FORMATS["integer"])
+        rng = random.Random(14)
+        for _ in range(2000):
+            value = rng.choice([rng.uniform(-1e9, 1e9), rng.randint(-10**7, 10**7), rng.random()])
+            assert currency(value) == f"{legacy_number(value, 2)} EUR"
+            assert integer(value) == legacy_number(value, 0)
+
+    def test_public_helpers(self):
+        assert format_currency_eur(1500000) == "1.500.000 EUR"
+        assert format_currency_eur("2500,4") == "2.500 EUR"
+        assert format_currency_eur("abc") == "abc"
+        assert format_currency_eur(None) == ""
+        assert format_percentage(15) == "15,00 %"
+        assert format_percentage("1234,5") == "1234,50 %"
+
+    def test_currency_helper_truncates(self):
+        assert format_currency_eur(1499.6) == "1.499 EUR"
+        assert format_currency_eur(-0.6) == "0 EUR"
+        assert format_currency_eur(Decimal("1234.5")) == "1.234 EUR"
+
+    def test_rounds_like_format(self):
+        integer = compile_number_format(DEFAULT_NUMBER_FORMATS["integer"])
+        assert integer(1234.6) == "1.235"
+        assert integer(2.5) == "2"
+        assert format_percentage(0.125) == "0,12 %"
+
+    def test_no_negative_zero(self):
+        integer = compile_number_format(DEFAULT_NUMBER_FORMATS["integer"])
+        assert integer(-0.4) == "0"
+        assert integer(-0.0) == "0"
+        assert integer(Decimal("-0.2")) == "0"
+        assert integer(-0.6) == "-1"
+        assert format_percentage(-0.004) == "0,00 %"
+
+    @pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf"), Decimal("NaN")])
+    def test_non_finite_values_are_returned_as_text(self, value):
+        assert format_currency_eur(value) == str(value)
+        currency = compile_number_format(DEFAULT_NUMBER_FORMATS["currency"])
+        assert currency.column([1.5, value]) == ["1,50 EUR", str(value)]
+
+    def test_custom_spec(self):
+        formatter = compile_number_format({"decimal_separator": ".", "thousands_separator": " ",
+                                           "decimal_places": 1, "pattern": "USD {value}"})
+        assert formatter(1234567.25) == "USD 1 234 567.2"
+
+    @pytest.mark.parametrize("spec", [{"pattern": "EUR"}, {"decimal_places": -1}, {"decimal_places": "dos"}, "currency"])
+    def test_invalid_specs(self, spec):
+        with pytest.raises(ValueError):
+            compile_number_format(spec)
+
+    def test_column_matches_per_value(self):
+        currency = compile_number_format(DEFAULT_NUMBER_FORMATS["currency"])
+        rng = random.Random(15)
+        numbers = [rng.uniform(-1e6, 1e6) for _ in range(500)] + [0, 7, True]
+        assert currency.column(numbers) == [currency(v) for v in numbers]
+        mixed = numbers + [None, "12,5", "texto"]
+        assert currency.column(mixed) == [currency(v) for v in mixed]
+        assert currency.column([]) == []
+
+    def test_column_accepts_numpy_arrays(self):
+        np = pytest.importorskip("numpy")
+        integer = compile_number_format(DEFAULT_NUMBER_FORMATS["integer"])
+        assert integer.column(np.array([1234, 5])) == ["1.234", "5"]
+
+    @pytest.mark.parametrize("spec", [
+        DEFAULT_NUMBER_FORMATS["currency"],
+        DEFAULT_NUMBER_FORMATS["percentage"],
+        DEFAULT_NUMBER_FORMATS["integer"],
+        {"decimal_separator": "_", "thousands_separator": "\u00a0", "decimal_places": 3, "pattern": "€ {value} ."},
+    ])
+    def test_vectorized_column_matches_per_value(self, spec):
+        np = pytest.importorskip("numpy")
+        formatter = compile_number_format(spec)
+        rng = random.Random(16)
+        numbers = [rng.choice([rng.uniform(-1e8, 1e8), rng.uniform(-1, 1), rng.randint(-10**6, 10**6) / 8])
+                   for _ in range(3000)] + [0.0, -0.0, -0.0004, 0.5, 1.5, 2.5, 0.125, 999.9996]
+        expected = [formatter(v) for v in numbers]
+        assert formatter._format_array(np.array(numbers)) == expected
+        assert formatter.column(numbers) == expected
+        # Too large for the array arithmetic: formatted value by value
+        assert formatter._format_array(np.array(numbers + [1e15])) is None
+        assert formatter.column(numbers + [1e15]) == expected + [formatter(1e15)]
+
+    def test_formatting_fields_use_plugin_number_formats(self, tmp_path):
+        (tmp_path / "formatting.yaml").write_text(
+            "fields:\n"
+            "  importe: {type: currency}\n"
+            "  acciones: {type: integer}\n"
+            "number_formats:\n"
+            "  currency: {decimal_separator: ',', thousands_separator: '.', decimal_places: 0, pattern: '{value} €'}\n"
+        )
+        builder = ContextBuilder(PluginPack("numbers", base_path=tmp_path))
+        context = builder.build_context({"importe": 1234.6, "acciones": 20000})
+        assert context["importe_formatted"] == "1.235 €"
+        assert context["acciones_formatted"] == "20.000"
+
+
+class TestListFormats:
+    """Compiled output_format of tables.yaml / Formatos de lista compilados"""
+
+    def test_item_format_with_constants(self):
+        formatter = compile_list_format({"item_format": "{indent}- {nombre} ({cargo})", "separator": "; "},
+                                        {"indent": ">"})
+        items = [{"nombre": "Ana", "cargo": "CEO"}, {"nombre": "Luis"}, "Sin cargo", 7, {"nombre": "Eva", "cargo": 2}]
+        assert formatter(items) == ">- Ana (CEO); Sin cargo; >- Eva (2)"
+        assert formatter([]) == ""
+        assert formatter(None) == ""
+        assert formatter("texto") == "texto"
+
+    def test_write_appends_segments(self):
+        formatter = compile_list_format({"item_format": "{nombre}"})
+        segments = ["Inicio: "]
+        formatter.write([{"nombre": "A"}, {"nombre": "B"}], segments)
+        assert "".join(segments) == "Inicio: A\nB"
+
+    @pytest.mark.parametrize("spec", [{}, {"item_format": "{nombre:>10}"}, {"item_format": "{}"}, {"item_format": "{nombre"}])
+    def test_invalid_specs(self, spec):
+        with pytest.raises(ValueError):
+            compile_list_format(spec)
+
+    def test_shipped_plugin_directors_list(self):
+        formatter = list_formatters(load_plugin("carta_manifestacion"))["lista_alto_directores"]
+        directors = [{"nombre": "Ana", "cargo": "CEO"}, {"nombre": "Luis", "cargo": ""}, {"nombre": "Eva", "cargo": "CFO"}]
+        expected = " " * 34 + " D. Ana - CEO\n" + " " * 34 + " D. Eva - CFO"
+        assert formatter(directors) == expected
+        assert ContextBuilder._format_directors_list(directors) == expected
+
+    def test_output_format_of_plugin_tables(self, tmp_path):
+        (tmp_path / "tables.yaml").write_text(
+            "tables:\n"
+            "  socios:\n"
+            "    source_field: socios\n"
+            "    render: text\n"
+            "    columns: [{name: nombre}]\n"
+            "    formatting: {prefix: '* '}\n"
+            "output_format:\n"
+            "  lista_socios:\n"
+            "    source_field: socios\n"
+            "    item_format: '{prefix}{nombre}'\n"
+            "    separator: ', '\n"
+        )
+        builder = ContextBuilder(PluginPack("lists", base_path=tmp_path))
+        context = builder.build_context({"socios": [{"nombre": "A"}, {"nombre": "B"}]})
+        assert context["socios"] == "* A, * B"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,98 @@
+"""
+Tests for input normalization
+Tests para la normalizacion de entrada
+"""
+
+import importlib
+import pytest
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from modules.dsl_evaluator import evaluate_condition
+from modules.input_normalizer import normalize_record, normalize_records
+from modules.plugin_loader import load_plugin
+from modules.rule_engine import RuleEngine
+
+# The package re-exports generate(), which shadows the module attribute
+generate_module = importlib.import_module("modules.generate")
+
+
+@pytest.fixture
+def plugin():
+    return load_plugin("carta_manifestacion")
+
+
+def test_booleans(plugin):
+    data = normalize_record(plugin, {
+        "comision": "sí", "junta": "No", "comite": "yes", "experto": 1, "dudas": "x"
+    })
+    assert data["comision"] is True
+    assert data["junta"] is False
+    assert data["comite"] is True
+    assert data["experto"] is True
+    assert data["dudas"] is False
+
+
+def test_dates_and_enums(plugin):
+    data = normalize_record(plugin, {
+        "Fecha_de_hoy": "31/12/2025",
+        "organo": " Consejo ",
+        "Oficina_Seleccionada": "barcelona",
+    })
+    assert data["Fecha_de_hoy"] == date(2025, 12, 31)
+    assert data["organo"] == "consejo"
+    assert data["Oficina_Seleccionada"] == "BARCELONA"
+
+
+def test_unknown_values_are_kept(plugin):
+    data = normalize_record(plugin, {"Fecha_de_hoy": "mañana", "organo": "otro", "extra": "si"})
+    assert data == {"Fecha_de_hoy": "mañana", "organo": "otro", "extra": "si"}
+
+
+def test_rules_agree_on_raw_and_normalized_records(plugin):
+    engine = RuleEngine(plugin)
+    raw = {"comision": "sí", "junta": "no", "incorreccion": "SI", "organo": "consejo"}
+    raw_map, _ = engine.evaluate_all_rules(raw)
+    normalized_map, _ = engine.evaluate_all_rules(normalize_record(plugin, raw))
+    assert raw_map == normalized_map
+
+
+def test_normalize_records_matches_per_record(plugin):
+    records = [
+        {"FF_Ejecicio": "31/12/2025", "Fecha_de_hoy": "2026-01-15", "comision": "si", "organo": "CONSEJO"},
+        {"FF_Ejecicio": "2025-06-30", "Fecha_de_hoy": date(2026, 1, 1), "comision": False},
+        {"FF_Ejecicio": "no es fecha", "junta": "No"},
+        {},
+    ]
+    assert normalize_records(plugin, records) == [normalize_record(plugin, r) for r in records]
+
+
+def test_generate_batch_normalizes_records_once(plugin, tmp_path, monkeypatch):
+    calls = []
+
+    def spy(plugin, records):
+        calls.append(len(records))
+        return normalize_records(plugin, records)
+
+    monkeypatch.setattr(generate_module, "normalize_records", spy)
+    monkeypatch.setattr(generate_module, "normalize_record", lambda *args: pytest.fail("per-record normalization"))
+    records = [{"Nombre_Cliente": f"Cliente {i}", "FF_Ejecicio": f"{i + 1:02d}/12/2025", "comision": "si"}
+               for i in range(3)]
+    results = generate_module.generate_batch("carta_manifestacion", records, output_dir=tmp_path,
+                                             should_validate=False)
+    assert calls == [3]
+    assert all(result.success for result in results), [result.error for result in results]
+
+
+def test_accented_si_in_conditions():
+    condition = {"operator": "equals", "field": "comision", "value": True}
+    assert evaluate_condition(condition, {"comision": "sí"}) is True
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
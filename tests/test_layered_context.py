@@ -0,0 +1,200 @@
+"""
+Tests for the layered template context
+Tests para el contexto de plantilla en capas
+"""
+
+import pytest
+import sys
+from collections import ChainMap
+from datetime import date
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from modules.context_builder import ContextBuilder
+from modules.generate import generate
+from modules.layered_context import ContextStats, LayeredContext, LazyLayer, LazyValueError
+from modules.plugin_loader import PluginPack, load_plugin
+from modules.renderer_docx import DocxRenderer
+from modules.trace_store import input_hash
+
+
+class TestLayers:
+    """LazyLayer and LayeredContext / Capas"""
+
+    def test_lazy_layer_computes_each_value_once(self):
+        calls = []
+        layer = LazyLayer({"a": lambda: calls.append("a") or 1, "b": lambda: calls.append("b") or 2})
+        assert list(layer) == ["a", "b"] and "a" in layer and "c" not in layer
+        assert layer.computed == 0
+        assert layer["a"] == 1 and layer["a"] == 1
+        assert calls == ["a"]
+        with pytest.raises(KeyError):
+            layer["c"]
+
+    def test_key_error_in_a_value_is_not_a_missing_key(self):
+        layer = LazyLayer({"a": lambda: {}["falta"]})
+        context = LayeredContext({}, layer, {"a": "input"})
+        with pytest.raises(LazyValueError, match="'a'"):
+            context["a"]
+        with pytest.raises(LazyValueError):
+            context.get("a")
+
+    def test_none_reads_as_empty_string(self):
+        context = LayeredContext({}, {"a": None}, {"a": 1, "b": None, "c": 0})
+        assert context["a"] == ""
+        assert context.get("b") == ""
+        assert context["c"] == 0
+        assert context.get("missing", "x") == "x"
+        assert dict(context) == {"a": "", "b": "", "c": 0}
+
+    def test_writes_do_not_reach_the_input(self):
+        data = {"a": 1}
+        context = LayeredContext({}, data)
+        context["a"] = 2
+        context.update({"b": 3})
+        assert context["a"] == 2 and context["b"] == 3
+        assert data == {"a": 1}
+
+
+class TestBuildContext:
+    """Context of the shipped plugin / Contexto del plugin"""
+
+    @pytest.fixture
+    def builder(self):
+        return ContextBuilder(load_plugin("carta_manifestacion"))
+
+    def test_input_is_not_copied_or_modified(self, builder):
+        data = {"FF_Ejecicio": date(2025, 12, 31), "Nombre_Cliente": None,
+                "lista_alto_directores": [{"nombre": "Ana", "cargo": "CEO"}]}
+        snapshot = {**data, "lista_alto_directores": list(data["lista_alto_directores"])}
+        context = builder.build_context(data)
+
+        assert context.maps[-1] is data
+        assert context["FF_Ejecicio"] == "31 de diciembre de 2025"
+        assert context["FF_Ejecicio_formatted"] == "31 de diciembre de 2025"
+        assert context["anyo_anterior"] == 2024
+        assert context["Nombre_Cliente"] == ""
+        assert "Ana" in context["lista_alto_directores"]
+        assert "texts" in context
+        assert data == snapshot
+
+    def test_formatting_runs_on_first_access(self, builder):
+        context = builder.build_context({"FF_Ejecicio": "31/12/2025", "Fecha_cierre": "31 de marzo de 2026"})
+        formatted = context.maps[2]
+        assert isinstance(formatted, LazyLayer)
+        assert formatted.computed == 0
+        assert context["FF_Ejecicio_formatted"] == "31 de diciembre de 2025"
+        assert formatted.computed == 2
+        # Only the keys whose input value is set (and is a date) are in the layer
+        assert set(formatted) == {"FF_Ejecicio", "FF_Ejecicio_formatted", "Fecha_cierre_formatted"}
+        assert context["Fecha_cierre"] == "31 de marzo de 2026"
+
+    def test_unread_formatted_fields_check_nothing(self, builder):
+        context = builder.build_context({"FF_Ejecicio": "31/12/2025", "Nombre_Cliente": "ACME"})
+        assert context["Nombre_Cliente"] == "ACME"
+        assert "Fecha_de_hoy_formatted" not in context
+        assert context.stats().computed == 1
+
+    def test_key_order_matches_input_then_added_keys(self, builder):
+        context = builder.build_context({"Fecha_de_hoy": "01/02/2026", "comision": True, "FF_Ejecicio": "31/12/2025"})
+        context["comision"] = "si"
+        context["visibility"] = {}
+        assert list(context) == [
+            "Fecha_de_hoy", "comision", "FF_Ejecicio", "anyo_ejercicio", "anyo_anterior", "comision_sn",
+            "Fecha_de_hoy_formatted", "FF_Ejecicio_formatted", "texts", "visibility",
+        ]
+
+
+class TestRenderLookups:
+    """Only placeholders in the text are computed / Solo se calculan los marcadores"""
+
+    def test_derived_fields_are_computed_on_first_access(self):
+        builder = ContextBuilder(load_plugin("carta_manifestacion"))
+        context = builder.build_context({"FF_Ejecicio": "31/12/2025", "comision": True, "junta": None})
+        formatted, derived = context.maps[2], context.maps[3]
+        assert context.stats() == ContextStats(computed=0, skipped=formatted.skipped + derived.skipped)
+        assert context["anyo_anterior"] == 2024
+        assert context.stats().computed == 1
+        # The dependency check runs with the formula
+        assert "junta_sn" not in derived
+        assert context.stats().computed == 2
+
+    def test_conditionals_convert_on_first_access(self):
+        renderer = DocxRenderer(load_plugin("carta_manifestacion"))
+        data = {"comision": True, "junta": False}
+        context = renderer.context_builder.build_context(data)
+        conditionals = renderer.context_builder.get_conditional_values(data)
+        context.add_layer(conditionals)
+        assert context.stats().computed == 0
+        text = renderer._process_conditionals("{% if comision == 'si' %}A{% endif %}{% if junta == 'si' %}B{% endif %}", conditionals)
+        assert text == "A"
+        assert conditionals.computed == 2
+        assert context["comite"] == "no"
+        assert context.stats() == ContextStats(computed=3, skipped=conditionals.skipped + context.maps[3].skipped + context.maps[4].skipped)
+
+    def test_replace_variables_looks_up_placeholders_only(self):
+        renderer = DocxRenderer(load_plugin("carta_manifestacion"))
+        context = renderer.context_builder.build_context({"Nombre_Cliente": "ACME", "FF_Ejecicio": "31/12/2025"})
+        text = renderer._replace_variables(
+            "{{ Nombre_Cliente }}: {{anyo_ejercicio|int - 1}} {{ anyo_ejercicio | int }}{{ desconocido }}[{{ texts }}]",
+            context, {},
+        )
+        assert text == "ACME: 2024 2025"
+        assert context.stats().computed == 1
+
+    def test_replace_variables_splices_directors_list(self):
+        renderer = DocxRenderer(load_plugin("carta_manifestacion"))
+        directors = [{"nombre": f"Director {i}", "cargo": "CEO"} for i in range(3)]
+        context = renderer.context_builder.build_context({"Nombre_Cliente": "ACME", "lista_alto_directores": directors})
+        text = renderer._replace_variables(
+            '{{ Nombre_Cliente }}:\n{{lista_alto_directores: "Nombre": Cargo}}\n{{lista_alto_directores}}.', context, {},
+        )
+        assert text == "ACME:\n" + context["lista_alto_directores"] + "\n."
+        assert text.count("D. Director") == 3
+
+    def test_replace_variables_writes_raw_lists_into_the_paragraph(self):
+        renderer = DocxRenderer(load_plugin("carta_manifestacion"))
+        directors = [{"nombre": "Ana", "cargo": "CEO"}]
+        context = renderer.context_builder.build_context({"lista_alto_directores": directors})
+        lists = renderer._list_segments({"lista_alto_directores": directors})
+        text = renderer._replace_variables("{{lista_alto_directores: x}} {{lista_alto_directores: y}}", context, {}, lists)
+        assert text == " " * 34 + " D. Ana - CEO " + " " * 34 + " D. Ana - CEO"
+        # Written once from the raw list; the joined context value is never computed
+        assert lists.computed == 1
+        assert context.stats().computed == 0
+
+    def test_replace_variables_splices_any_list_field(self, tmp_path):
+        (tmp_path / "tables.yaml").write_text(
+            "output_format:\n"
+            "  lista_socios:\n"
+            "    source_field: socios\n"
+            "    item_format: '- {nombre}'\n"
+        )
+        renderer = DocxRenderer(PluginPack("lists", base_path=tmp_path))
+        socios = [{"nombre": "A"}, {"nombre": "B"}]
+        context = renderer.context_builder.build_context({"socios": socios})
+        template = "Socios:\n{{socios: Nombre}}"
+        lists = renderer._list_segments({"socios": socios})
+        assert renderer._replace_variables(template, context, {}, lists) == "Socios:\n- A\n- B"
+        assert renderer._replace_variables(template, context, {}) == "Socios:\n- A\n- B"
+
+    def test_generation_reports_context_stats(self, tmp_path):
+        data = {"Nombre_Cliente": "ACME", "FF_Ejecicio": "31/12/2025", "comision": True,
+                "lista_alto_directores": [{"nombre": "Ana", "cargo": "CEO"}]}
+        result = generate("carta_manifestacion", data, output_dir=tmp_path, should_validate=False)
+        assert result.success, result.error
+        assert result.context_stats.computed > 0
+        assert result.context_stats.skipped > 0
+
+
+def test_input_hash_of_layered_input():
+    form = {"Nombre_Cliente": "ACME", "comision": True}
+    lists = {"lista_alto_directores": [{"nombre": "Ana"}]}
+    assert input_hash(ChainMap(lists, form)) == input_hash({**form, **lists})
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
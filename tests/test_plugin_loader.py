@@ -5,13 +5,19 @@ Tests para el cargador de plugins
 
 import pytest
 import sys
+import threading
+import time
 from pathlib import Path
 
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from modules.plugin_loader import load_plugin, PluginPack, list_available_plugins
+import modules.plugin_loader as plugin_loader
+from modules.plugin_loader import (
+    load_plugin, PluginPack, list_available_plugins,
+    prewarm_plugins, validate_plugin, PluginLoadError,
+)
 
 
 def test_load_plugin():
@@ -75,5 +81,143 @@ def test_get_sections():
     assert len(sections) > 0
 
 
+def test_prewarm_plugins():
+    """Test concurrent plugin prewarm / Probar precarga concurrente de plugins"""
+    timings = prewarm_plugins(workers=2)
+
+    assert "carta_manifestacion" in timings
+    assert timings["carta_manifestacion"] >= 0
+    plugin = load_plugin("carta_manifestacion")
+    assert plugin._template_bytes is not None
+    assert "logic.yaml" in plugin._cache
+
+
+def test_prewarm_unknown_plugin_fails_fast():
+    """Test prewarm of a missing plugin / Probar precarga de plugin inexistente"""
+    with pytest.raises(PluginLoadError):
+        prewarm_plugins(["carta_manifestacion", "does_not_exist"])
+
+
+def test_prewarm_does_not_wait_for_pending_reads(monkeypatch):
+    """Test prewarm fails fast / Probar que la precarga falla sin esperar"""
+    release = threading.Event()
+    read_plugin = plugin_loader._read_plugin
+
+    def fake_read(plugin_id, base_path=None):
+        if plugin_id == "slow":
+            release.wait(5)
+        return read_plugin(plugin_id, base_path)
+
+    monkeypatch.setattr(plugin_loader, "_read_plugin", fake_read)
+    start = time.perf_counter()
+    try:
+        with pytest.raises(PluginLoadError, match="does_not_exist"):
+            prewarm_plugins(["slow", "does_not_exist"], workers=2)
+        assert time.perf_counter() - start < 2
+    finally:
+        release.set()
+
+
+def test_validate_plugin_reports_empty_entries(tmp_path):
+    """Test validation of empty YAML entries / Probar entradas YAML vacias"""
+    (tmp_path / "manifest.yaml").write_text("plugin_id: broken\nversion: '1'\nname: Broken\n")
+    (tmp_path / "logic.yaml").write_text("rules:\n  r1:\n")
+    (tmp_path / "decision_map.yaml").write_text("decisions:\n  d1:\n")
+    errors = validate_plugin(PluginPack("broken", base_path=tmp_path))
+    assert "Rule 'r1' is empty or not a mapping" in errors
+    assert "Decision 'd1' is empty or not a mapping" in errors
+
+
+def test_validate_plugin_opens_template(tmp_path):
+    """Test validation of a corrupt template / Probar plantilla corrupta"""
+    (tmp_path / "template.docx").write_bytes(b"not a zip file")
+    (tmp_path / "manifest.yaml").write_text(
+        f"plugin_id: broken\nversion: '1'\nname: Broken\ntemplate: {{path: '{tmp_path / 'template.docx'}'}}\n"
+    )
+    errors = validate_plugin(PluginPack("broken", base_path=tmp_path))
+    assert any(e.startswith("Template is not a valid Word document") for e in errors)
+
+
+def test_validate_plugin_reports_bad_operator(tmp_path):
+    """Test validation of an invalid rule / Probar validacion de regla invalida"""
+    (tmp_path / "manifest.yaml").write_text("plugin_id: broken\nversion: '1'\nname: Broken\n")
+    (tmp_path / "logic.yaml").write_text(
+        "rules:\n  r1:\n    condition:\n      operator: eval\n      field: a\n"
+    )
+    plugin = PluginPack("broken", base_path=tmp_path)
+
+    errors = validate_plugin(plugin)
+    assert any("Operator not allowed: eval" in e for e in errors)
+
+
+def test_validate_plugin_reports_derived_cycle(tmp_path):
+    """Test validation of cyclic derived fields / Probar ciclo en campos derivados"""
+    (tmp_path / "manifest.yaml").write_text("plugin_id: broken\nversion: '1'\nname: Broken\n")
+    (tmp_path / "derived.yaml").write_text(
+        "derived_fields:\n"
+        "  a: {formula: 'b + 1', dependencies: [b]}\n"
+        "  b: {formula: 'a + 1', dependencies: [a]}\n"
+        "  c: {formula: 'unknown_fn(a)'}\n"
+    )
+    errors = validate_plugin(PluginPack("broken", base_path=tmp_path))
+    assert any("Unknown function: unknown_fn" in e for e in errors)
+
+    (tmp_path / "derived.yaml").write_text(
+        "derived_fields:\n"
+        "  a: {formula: 'b + 1', dependencies: [b]}\n"
+        "  b: {formula: 'a + 1', dependencies: [a]}\n"
+    )
+    errors = validate_plugin(PluginPack("broken", base_path=tmp_path))
+    assert any("Cycle in derived fields: a -> b -> a" in e for e in errors)
+
+
+def test_validate_plugin_reports_number_formats(tmp_path):
+    """Test validation of number_formats / Probar formatos numericos"""
+    (tmp_path / "manifest.yaml").write_text("plugin_id: broken\nversion: '1'\nname: Broken\n")
+    (tmp_path / "formatting.yaml").write_text(
+        "number_formats:\n"
+        "  currency: {pattern: 'EUR'}\n"
+    )
+    errors = validate_plugin(PluginPack("broken", base_path=tmp_path))
+    assert any(e.startswith("Number format 'currency'") for e in errors)
+
+
+def test_validate_plugin_reports_output_formats(tmp_path):
+    """Test validation of tables.yaml output_format / Probar formatos de lista"""
+    (tmp_path / "manifest.yaml").write_text("plugin_id: broken\nversion: '1'\nname: Broken\n")
+    (tmp_path / "tables.yaml").write_text(
+        "output_format:\n"
+        "  lista: {item_format: '{nombre'}\n"
+    )
+    errors = validate_plugin(PluginPack("broken", base_path=tmp_path))
+    assert any(e.startswith("Output format 'lista'") for e in errors)
+
+
+def test_fingerprint_is_stable():
+    """Test fingerprint stability / Probar estabilidad de la huella"""
+    plugin = load_plugin("carta_manifestacion")
+    fingerprint = plugin.fingerprint
+
+    assert len(fingerprint) == 64
+    assert fingerprint == PluginPack("carta_manifestacion").fingerprint
+
+
+def test_fingerprint_hashes_loaded_files(tmp_path):
+    """Test fingerprint follows the loaded files / Probar que la huella sigue lo cargado"""
+    (tmp_path / "logic.yaml").write_text("rules: {}\n")
+    plugin = PluginPack("tmp", base_path=tmp_path)
+    before = plugin.fingerprint
+
+    # Edits on disk do not change the configuration this pack uses
+    (tmp_path / "logic.yaml").write_text("rules: {r1: {}}\n")
+    assert plugin.logic == {"rules": {}}
+    assert plugin.fingerprint == before
+
+    reloaded = PluginPack("tmp", base_path=tmp_path)
+    assert reloaded.fingerprint != before
+    plugin.clear_cache()
+    assert plugin.fingerprint == reloaded.fingerprint
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
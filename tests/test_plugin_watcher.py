@@ -0,0 +1,99 @@
+"""
+Tests for plugin watcher
+Tests para el vigilante de plugins
+"""
+
+import os
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from docx import Document
+
+from modules.plugin_loader import _PLUGIN_REGISTRY, PluginPack, load_plugin, register_plugin
+from modules.plugin_watcher import PluginWatcher
+
+
+@pytest.fixture
+def tmp_plugin(tmp_path):
+    """Register a minimal plugin in a temporary directory"""
+    template = tmp_path / "template.docx"
+    Document().save(template)
+    (tmp_path / "manifest.yaml").write_text(
+        f"plugin_id: tmp_plugin\nversion: '1'\nname: Tmp\ntemplate:\n  path: '{template}'\n"
+    )
+    (tmp_path / "logic.yaml").write_text("rules: {}\n")
+    previous = _PLUGIN_REGISTRY.get("tmp_plugin")
+    register_plugin(PluginPack("tmp_plugin", base_path=tmp_path))
+    yield tmp_path
+    # Restore the registry for the tests that follow
+    if previous is None:
+        _PLUGIN_REGISTRY.pop("tmp_plugin", None)
+    else:
+        _PLUGIN_REGISTRY["tmp_plugin"] = previous
+
+
+def test_check_without_changes(tmp_plugin):
+    watcher = PluginWatcher(["tmp_plugin"], use_events=False)
+    assert watcher.check() == []
+
+
+def test_reload_swaps_plugin(tmp_plugin):
+    old_plugin = load_plugin("tmp_plugin")
+    old_plugin.preload()
+    watcher = PluginWatcher(["tmp_plugin"], use_events=False)
+
+    (tmp_plugin / "logic.yaml").write_text(
+        "rules:\n  r1:\n    condition:\n      operator: equals\n      field: a\n      value: 1\n"
+    )
+    assert watcher.check() == ["tmp_plugin"]
+
+    new_plugin = load_plugin("tmp_plugin")
+    assert new_plugin is not old_plugin
+    assert "r1" in new_plugin.logic["rules"]
+    # In-flight users of the old instance keep the old version
+    assert old_plugin.logic["rules"] == {}
+
+
+def test_same_size_edit_with_same_mtime_is_reloaded(tmp_plugin):
+    logic = tmp_plugin / "logic.yaml"
+    logic.write_text("rules:\n  r1: {condition: {operator: equals, field: a, value: 1}}\n")
+    stat = logic.stat()
+    watcher = PluginWatcher(["tmp_plugin"], use_events=False)
+    load_plugin("tmp_plugin").preload()
+
+    logic.write_text("rules:\n  r2: {condition: {operator: equals, field: a, value: 1}}\n")
+    os.utime(logic, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert logic.stat().st_size == stat.st_size
+    assert watcher.check() == ["tmp_plugin"]
+    assert set(load_plugin("tmp_plugin").logic["rules"]) == {"r2"}
+
+
+def test_template_change_is_reloaded(tmp_plugin):
+    watcher = PluginWatcher(["tmp_plugin"], use_events=False)
+
+    document = Document()
+    document.add_paragraph("version 2")
+    document.save(tmp_plugin / "template.docx")
+    assert watcher.check() == ["tmp_plugin"]
+    assert load_plugin("tmp_plugin").get_template_bytes() == (tmp_plugin / "template.docx").read_bytes()
+
+
+def test_broken_edit_keeps_previous_version(tmp_plugin):
+    old_plugin = load_plugin("tmp_plugin")
+    watcher = PluginWatcher(["tmp_plugin"], use_events=False)
+
+    (tmp_plugin / "logic.yaml").write_text(
+        "rules:\n  r1:\n    condition:\n      operator: exec\n      field: a\n"
+    )
+    assert watcher.check() == []
+    assert load_plugin("tmp_plugin") is old_plugin
+    assert "tmp_plugin" in watcher.last_errors
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
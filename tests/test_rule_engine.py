@@ -0,0 +1,312 @@
+"""
+Tests for rule engine
+Tests para el motor de reglas
+"""
+
+import dataclasses
+import pytest
+import random
+import sys
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from modules.plugin_loader import PluginPack, load_plugin
+from modules.rule_engine import (
+    RuleEngine, IncrementalEvaluator, CompactTrace, FieldVisibilityMemo, build_dependency_index,
+    compile_field_conditions, compile_rules, field_visibility_memo,
+)
+from modules.contract_validator import ContractValidator
+from modules.rule_profiler import RuleProfiler
+
+
+BOOL_VALUES = [True, False, "si", "no", "", None]
+
+
+def random_edit(rng: random.Random, plugin) -> dict:
+    """Random values for a few fields / Valores aleatorios para algunos campos"""
+    fields = plugin.fields["fields"]
+    edit = {}
+    for name in rng.sample(sorted(fields), 3):
+        spec = fields[name]
+        if spec.get("type") == "enum":
+            edit[name] = rng.choice([v["value"] for v in spec.get("values", [])] + [None])
+        elif name == "Oficina_Seleccionada":
+            edit[name] = rng.choice(["BARCELONA", "PERSONALIZADA", ""])
+        else:
+            edit[name] = rng.choice(BOOL_VALUES)
+    return edit
+
+
+def test_dependency_index():
+    plugin = load_plugin("carta_manifestacion")
+    index = build_dependency_index(plugin)
+    assert index.dependencies[("editable", "Direccion_Oficina")] == {"Oficina_Seleccionada"}
+    assert ("editable", "Direccion_Oficina") in index.affected(["Oficina_Seleccionada"])
+    assert ("rule", "r004_incorreccion") in index.affected(["incorreccion"])
+    assert index.affected(["campo_inexistente"]) == set()
+
+
+def test_incremental_matches_full_evaluation():
+    plugin = load_plugin("carta_manifestacion")
+    engine = RuleEngine(plugin)
+    evaluator = IncrementalEvaluator(plugin)
+    rng = random.Random(2)
+
+    data: dict = {}
+    evaluator.evaluate(data)
+    for _ in range(200):
+        edit = random_edit(rng, plugin)
+        data.update(edit)
+        evaluator.update(data, edit.keys())
+
+        full = IncrementalEvaluator(plugin)
+        full.evaluate(data)
+        assert evaluator.results == full.results
+        assert evaluator.field_visibility() == engine.get_field_visibility(data)
+        assert evaluator.required_fields() == engine.get_required_fields(data)
+
+
+def test_update_skips_unaffected_conditions():
+    plugin = load_plugin("carta_manifestacion")
+    evaluator = IncrementalEvaluator(plugin)
+    evaluator.evaluate({})
+    total = evaluator.evaluations
+
+    changed = evaluator.update({"incorreccion": True}, ["incorreccion"])
+    assert 0 < evaluator.evaluations - total < total
+    assert changed[("rule", "r004_incorreccion")] is True
+
+
+def test_incremental_keys_rules_by_logic_key(tmp_path):
+    # Neither rule declares a rule_id, so both default to "unknown"
+    (tmp_path / "logic.yaml").write_text(
+        "rules:\n"
+        "  r_a:\n"
+        "    condition: {operator: equals, field: a, value: true}\n"
+        "    action: {type: include_block, elements: [bloque_a]}\n"
+        "  r_b:\n"
+        "    condition: {operator: equals, field: b, value: true}\n"
+        "    action: {type: include_block, elements: [bloque_b]}\n"
+    )
+    (tmp_path / "decision_map.yaml").write_text("decisions:\n  d1:\n    rules: [r_a, r_b]\n")
+    plugin = PluginPack("anonymous_rules", base_path=tmp_path)
+
+    assert build_dependency_index(plugin).affected(["b"]) == {("rule", "r_b")}
+    evaluator = IncrementalEvaluator(plugin)
+    evaluator.evaluate({"a": True, "b": False})
+    assert evaluator.rule_results == {"r_a": True, "r_b": False}
+    assert evaluator.update({"a": True, "b": True}, ["b"]) == {("rule", "r_b"): True}
+    assert evaluator.rule_results == {"r_a": True, "r_b": True}
+
+
+def test_incremental_covers_rules_outside_decisions(tmp_path):
+    (tmp_path / "logic.yaml").write_text(
+        "rules:\n"
+        "  r_a:\n"
+        "    condition: {operator: equals, field: a, value: true}\n"
+        "  r_unused:\n"
+        "    condition: {operator: equals, field: c, value: true}\n"
+    )
+    (tmp_path / "decision_map.yaml").write_text("decisions:\n  d1:\n    rules: [r_a]\n")
+    plugin = PluginPack("unused_rules", base_path=tmp_path)
+
+    assert build_dependency_index(plugin).affected(["c"]) == {("rule", "r_unused")}
+    evaluator = IncrementalEvaluator(plugin)
+    evaluator.evaluate({})
+    assert evaluator.update({"c": True}, ["c"]) == {("rule", "r_unused"): True}
+
+
+def test_exclusive_equality_decision_uses_dispatch():
+    plugin = load_plugin("carta_manifestacion")
+    decisions = {d.decision_id: d for d in compile_rules(plugin)}
+    assert decisions["organo_text"].dispatch == {"consejo": 0, "administrador_unico": 1, "administradores": 2}
+    assert decisions["doc_sections"].dispatch is None
+
+
+@pytest.mark.parametrize("organo", [
+    "consejo", "administrador_unico", "administradores", "Consejo", "otro", None, True, 1, ["consejo"], {}
+])
+def test_dispatch_traces_match_sequential(organo):
+    plugin = load_plugin("carta_manifestacion")
+    engine = RuleEngine(plugin)
+    sequential = RuleEngine(plugin)
+    sequential.decisions = [dataclasses.replace(d, dispatch=None) for d in engine.decisions]
+
+    data = {"organo": organo, "comision": True}
+    assert engine.evaluate_all_rules(data) == sequential.evaluate_all_rules(data)
+
+
+@pytest.mark.parametrize("organo", ["consejo", "administrador_unico", "administradores", "otro", None])
+def test_dispatch_profiles_like_sequential(organo):
+    plugin = load_plugin("carta_manifestacion")
+    engine = RuleEngine(plugin, profiler=RuleProfiler())
+    sequential = RuleEngine(plugin, profiler=RuleProfiler())
+    sequential.decisions = [dataclasses.replace(d, dispatch=None) for d in engine.decisions]
+
+    data = {"organo": organo}
+    engine.evaluate_all_rules(data)
+    sequential.evaluate_all_rules(data)
+
+    def counts(profiler):
+        return {k: (c["evaluations"], c["hits"]) for k, c in profiler.snapshot()["rules"].items()}
+    assert counts(engine.profiler) == counts(sequential.profiler)
+
+
+def test_traces_do_not_share_mutable_state():
+    engine = RuleEngine(load_plugin("carta_manifestacion"))
+    _, first = engine.evaluate_all_rules({"organo": "administradores"})
+    _, second = engine.evaluate_all_rules({"organo": "administradores"})
+    trace = next(t for t in first if t.decision_id == "organo_text")
+    hit = trace.rule_hits[-1]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        hit.condition_met = False
+    assert isinstance(hit.affected_elements, tuple)
+
+    trace.rule_hits.clear()
+    assert next(t for t in second if t.decision_id == "organo_text").rule_hits
+
+def test_compact_traces_expand_to_full_traces():
+    plugin = load_plugin("carta_manifestacion")
+    engine = RuleEngine(plugin)
+    rng = random.Random(9)
+    data: dict = {}
+    for _ in range(100):
+        data.update(random_edit(rng, plugin))
+        full_map, full = engine.evaluate_all_rules(data)
+        compact_map, compact = engine.evaluate_all_rules(data, trace_level="compact")
+        off_map, off = engine.evaluate_all_rules(data, trace_level="off")
+
+        assert isinstance(compact, CompactTrace)
+        assert len(compact.hits) == len(full)
+        assert compact.expand(plugin) == full
+        assert compact_map == full_map == off_map
+        assert off == []
+
+
+def test_unknown_trace_level():
+    with pytest.raises(ValueError):
+        RuleEngine(load_plugin("carta_manifestacion")).evaluate_all_rules({}, trace_level="verbose")
+
+
+def test_visibility_memo_matches_conditions():
+    plugin = load_plugin("carta_manifestacion")
+    memo = FieldVisibilityMemo(plugin)
+    conditions = compile_field_conditions(plugin)
+    rng = random.Random(5)
+    data: dict = {}
+    for _ in range(200):
+        data.update(random_edit(rng, plugin))
+        expected = {
+            name: conditions[name](data) if name in conditions else True
+            for name in plugin.fields["fields"]
+        }
+        assert memo.visibility(data) == expected
+    assert memo.hits > 0
+
+
+def test_visibility_memo_shared_by_engine_and_validator():
+    plugin = load_plugin("carta_manifestacion")
+    memo = field_visibility_memo(plugin)
+    data = {"Oficina_Seleccionada": "PERSONALIZADA", "incorreccion": True, "unrelated": ["x"]}
+    engine = RuleEngine(plugin)
+
+    before = memo.evaluations
+    engine.get_required_fields(data)
+    ContractValidator(plugin).validate(data)
+    assert memo.evaluations - before <= len(compile_field_conditions(plugin))
+
+
+def test_visibility_memo_keeps_true_and_one_apart():
+    plugin = load_plugin("carta_manifestacion")
+    memo = FieldVisibilityMemo(plugin)
+    for value in (True, 1, "si", None):
+        data = {root: value for root in memo.roots}
+        conditions = compile_field_conditions(plugin)
+        assert memo.visibility(data) == {
+            name: conditions[name](data) if name in conditions else True
+            for name in plugin.fields["fields"]
+        }
+
+
+def test_evaluate_batch_matches_per_record_evaluation():
+    pytest.importorskip("numpy")
+    plugin = load_plugin("carta_manifestacion")
+    engine = RuleEngine(plugin)
+    rng = random.Random(6)
+    records, data = [], {}
+    for _ in range(300):
+        data = {**data, **random_edit(rng, plugin)}
+        records.append(data)
+    records.append({"organo": ["consejo"], "comision": {"nested": True}})
+
+    batch = engine.evaluate_batch(records)
+    assert batch.matrix.shape == (len(records), len(batch.rule_ids))
+    for i, record in enumerate(records):
+        assert batch.compact_trace(i) == engine.evaluate_all_rules(record, "compact")[1]
+
+    groups = batch.groups()
+    assert sum(len(indices) for indices in groups.values()) == len(records)
+    for outcome, indices in groups.items():
+        assert all(tuple(batch.compact_trace(i).hits) == outcome for i in indices)
+
+    rates = batch.hit_rates()
+    column = batch.rule_ids.index("r004_incorreccion")
+    assert rates["r004_incorreccion"] == pytest.approx(batch.matrix[:, column].mean())
+
+
+def test_evaluate_batch_empty():
+    pytest.importorskip("numpy")
+    batch = RuleEngine(load_plugin("carta_manifestacion")).evaluate_batch([])
+    assert len(batch) == 0
+    assert batch.groups() == {}
+    assert set(batch.hit_rates().values()) == {0.0}
+
+
+def test_profiled_engine_gives_same_results():
+    plugin = load_plugin("carta_manifestacion")
+    engine = RuleEngine(plugin)
+    profiled = RuleEngine(plugin, profiler=RuleProfiler())
+    rng = random.Random(4)
+    data: dict = {}
+    for _ in range(50):
+        data.update(random_edit(rng, plugin))
+        for level in ("full", "compact", "off"):
+            assert profiled.evaluate_all_rules(data, level) == engine.evaluate_all_rules(data, level)
+
+
+def test_profiler_counts_rules_and_decisions(tmp_path):
+    plugin = load_plugin("carta_manifestacion")
+    profiler = RuleProfiler()
+    engine = RuleEngine(plugin, profiler=profiler)
+    engine.evaluate_all_rules({"organo": "administradores", "incorreccion": True})
+    engine.evaluate_all_rules({"organo": "consejo"})
+
+    snapshot = profiler.snapshot()
+    assert snapshot["engine"]["evaluations"] == 2
+    assert snapshot["decisions"]["organo_text"] == {
+        "evaluations": 2, "hits": 2, "total_ns": snapshot["decisions"]["organo_text"]["total_ns"]
+    }
+    assert snapshot["rules"]["r004_incorreccion"]["evaluations"] == 2
+    assert snapshot["rules"]["r004_incorreccion"]["hits"] == 1
+    assert snapshot["engine_share"] is None
+
+    rule_ids = [r.rule_id for d in compile_rules(plugin) for r in d.rules]
+    dead = profiler.dead_rules(rule_ids)
+    assert "r004_incorreccion" not in dead
+    assert set(dead) < set(rule_ids)
+
+    assert '"r004_incorreccion"' in profiler.to_json(tmp_path / "rules.json")
+    profiler.to_csv(tmp_path / "rules.csv")
+    rows = (tmp_path / "rules.csv").read_text(encoding="utf-8")
+    assert rows.splitlines()[0] == "kind,id,evaluations,hits,total_ms,mean_us"
+    assert any(line.startswith("rule,r004_incorreccion,2,1,") for line in rows.splitlines())
+
+    profiler.reset()
+    assert profiler.snapshot()["rules"] == {}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,75 @@
+"""
+Tests for the trace store
+Tests para el registro de trazas
+"""
+
+import pytest
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from modules.generate import GenerationResult
+from modules.plugin_loader import load_plugin
+from modules.rule_engine import RuleEngine
+from modules.trace_store import TraceStore, input_hash
+
+
+def make_result(trace_id: str, data: dict, trace_level: str = "compact") -> GenerationResult:
+    engine = RuleEngine(load_plugin("carta_manifestacion"))
+    _, traces = engine.evaluate_all_rules(data, trace_level)
+    return GenerationResult(
+        success=True,
+        output_path=Path(f"output/{trace_id}.docx"),
+        trace_id=trace_id,
+        evaluation_traces=traces if trace_level == "full" else [],
+        plugin_fingerprint="abc",
+        compact_trace=traces if trace_level == "compact" else None
+    )
+
+
+def test_record_and_get(tmp_path):
+    data = {"Nombre_Cliente": "ACME", "Fecha_de_hoy": "31/12/2025", "comision": True, "organo": "consejo"}
+    with TraceStore(tmp_path / "traces.sqlite3") as store:
+        store.record(make_result("t-1", data), data, "carta_manifestacion")
+        record = store.get("t-1")
+
+    assert record.client_name == "ACME"
+    assert record.document_date == "2025-12-31"
+    assert record.input_hash == input_hash(data)
+    assert record.plugin_fingerprint == "abc"
+    assert record.success is True
+
+    plugin = load_plugin("carta_manifestacion")
+    _, full = RuleEngine(plugin).evaluate_all_rules(data)
+    assert record.compact_trace.expand(plugin) == full
+
+
+def test_full_traces_are_stored_compact(tmp_path):
+    data = {"Nombre_Cliente": "ACME", "incorreccion": True}
+    with TraceStore(tmp_path / "traces.sqlite3") as store:
+        store.record(make_result("t-full", data, "full"), data, "carta_manifestacion")
+        compact = store.get("t-full").compact_trace
+    _, expected = RuleEngine(load_plugin("carta_manifestacion")).evaluate_all_rules(data, "compact")
+    assert compact == expected
+
+
+def test_find_by_client_and_date(tmp_path):
+    path = tmp_path / "traces.sqlite3"
+    with TraceStore(path, batch_size=2) as store:
+        for i, (client, day) in enumerate([("A", date(2025, 1, 5)), ("B", date(2025, 2, 1)), ("A", date(2025, 3, 1))]):
+            data = {"Nombre_Cliente": client, "Fecha_de_hoy": day}
+            store.record(make_result(f"t-{i}", data), data, "carta_manifestacion")
+
+    # Rows persist across connections
+    with TraceStore(path) as store:
+        assert [r.trace_id for r in store.find(client_name="A")] == ["t-2", "t-0"]
+        assert [r.trace_id for r in store.find(date_from="2025-01-10", date_to="2025-02-28")] == ["t-1"]
+        assert store.get("missing") is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
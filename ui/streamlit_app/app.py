@@ -16,8 +16,10 @@ from docx import Document
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from modules.plugin_loader import load_plugin
+from modules.plugin_loader import load_plugin, prewarm_plugins
+from modules.plugin_watcher import start_plugin_watcher
 from modules.generate import generate_from_form
+from modules.trace_store import TraceStore
 from modules.context_builder import format_spanish_date, parse_date_string
 
 from ui.streamlit_app.state_store import (
@@ -157,6 +159,21 @@ def export_to_excel(data: dict) -> bytes:
     return output.getvalue()
 
 
+@st.cache_resource
+def prewarm() -> dict:
+    """Load all plugins once per server process / Cargar plugins una vez por proceso"""
+    timings = prewarm_plugins()
+    # Pick up edits to YAML files and templates without restarting the server
+    start_plugin_watcher()
+    return timings
+
+
+@st.cache_resource
+def get_trace_store() -> TraceStore:
+    """Trace log shared by all sessions / Registro de trazas compartido"""
+    return TraceStore(PROJECT_ROOT / "output" / "traces.sqlite3")
+
+
 def main():
     """Main application entry point / Punto de entrada principal"""
 
@@ -172,6 +189,7 @@ def main():
 
     # Load plugin
     try:
+        prewarm()
         plugin = load_plugin(PLUGIN_ID)
     except Exception as e:
         st.error(f"Error loading plugin: {e}")
@@ -625,13 +643,16 @@ def main():
                     all_data = {**var_values, **cond_values}
 
                     # Generate document
+                    trace_store = get_trace_store()
                     result = generate_from_form(
                         plugin_id=PLUGIN_ID,
                         form_data=all_data,
                         list_data={},
                         output_dir=PROJECT_ROOT / "output",
-                        template_path=template_path
+                        template_path=template_path,
+                        trace_store=trace_store
                     )
+                    trace_store.flush()
 
                     if result.success and result.output_path:
                         st.success("✅ Carta generada exitosamente!")
@@ -640,6 +661,7 @@ def main():
                         st.markdown("### 🔖 Código de Traza")
                         st.code(result.trace_id, language=None)
                         st.caption("Este código identifica de forma única este documento generado. Guárdelo para referencia futura.")
+                        st.caption(f"Huella de configuración: {result.plugin_fingerprint}")
 
                         # Display generation info
                         st.info(f"⏱️ Tiempo de generación: {result.duration_ms}ms")
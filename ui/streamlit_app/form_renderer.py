@@ -13,7 +13,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from modules.plugin_loader import PluginPack
-from modules.dsl_evaluator import evaluate_condition
+from modules.rule_engine import compile_field_conditions, field_visibility_memo
 from modules.context_builder import format_spanish_date, parse_date_string
 
 from .state_store import (
@@ -36,6 +36,8 @@ class FormRenderer:
         self.plugin = plugin
         self.fields = plugin.fields.get("fields", {})
         self.oficinas = plugin.get_oficinas()
+        self.visibility_memo = field_visibility_memo(plugin)
+        self.editable_conditions = compile_field_conditions(plugin, "editable_when")
 
     def render_form(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -67,7 +69,7 @@ class FormRenderer:
                     field_spec = self.fields.get(field_name, {})
 
                     # Check visibility condition
-                    if not self._should_show_field(field_spec, result):
+                    if not self._should_show_field(field_name, result):
                         continue
 
                     # Render field
@@ -94,7 +96,7 @@ class FormRenderer:
         for field_name in section_fields:
             field_spec = self.fields.get(field_name, {})
 
-            if not self._should_show_field(field_spec, result):
+            if not self._should_show_field(field_name, result):
                 continue
 
             value = self._render_field(field_name, field_spec, result)
@@ -109,12 +111,9 @@ class FormRenderer:
             if spec.get("section") == section_id
         ]
 
-    def _should_show_field(self, field_spec: dict, data: dict) -> bool:
+    def _should_show_field(self, field_name: str, data: dict) -> bool:
         """Check if field should be visible / Verificar si campo debe ser visible"""
-        condition = field_spec.get("condition")
-        if not condition:
-            return True
-        return evaluate_condition(condition, data)
+        return self.visibility_memo.is_visible(field_name, data)
 
     def _render_field(self, field_name: str, field_spec: dict, data: dict) -> Any:
         """
@@ -143,9 +142,9 @@ class FormRenderer:
 
         # Check if field is disabled
         disabled = False
-        editable_when = field_spec.get("editable_when")
+        editable_when = self.editable_conditions.get(field_name)
         if editable_when:
-            disabled = not evaluate_condition(editable_when, data)
+            disabled = not editable_when(data)
 
         # Render based on type
         if field_type == "text":